@@ -0,0 +1,56 @@
+"""Time the parser on adversarial input of growing size.
+
+Each case builds an address around a run of n hostile characters. If parsing
+is linear, doubling n should roughly double the time taken.
+
+Run it from the root of the repository with:
+
+    PYTHONPATH=src python benchmarks/adversarial.py
+
+"""
+import sys
+import timeit
+
+from pyisemail.validators import ParserValidator
+
+CASES = {
+    "deep comments": lambda n: "test" + "(" * n + "@example.com",
+    "long FWS": lambda n: "test" + " " * n + "@example.com",
+    "folded FWS": lambda n: "test" + "\r\n " * (n // 3) + "@example.com",
+    "long quoted string": lambda n: '"' + "a" * n + '"@example.com',
+    "many comments": lambda n: "test@" + "(x)" * (n // 3) + "example.com",
+    "huge literal": lambda n: "test@[" + "a" * n + "]",
+    "huge IPv6 literal": lambda n: "test@[IPv6:" + "1:" * (n // 2) + "1]",
+}
+SIZES = (10000, 20000, 40000, 80000, 160000)
+
+
+def main(sizes=SIZES):
+    for engine in ParserValidator.ENGINES:
+        validator = ParserValidator(engine=engine)
+
+        print("%s engine" % engine)
+        print("%-20s" % "" + "".join("%10d" % n for n in sizes))
+
+        for name, build in CASES.items():
+            timings = []
+
+            for n in sizes:
+                address = build(n)
+                timings.append(
+                    min(
+                        timeit.repeat(
+                            lambda: validator.is_email(address, True),
+                            number=1,
+                            repeat=3,
+                        )
+                    )
+                )
+
+            print("%-20s" % name + "".join("%9.3fs" % t for t in timings))
+
+        print()
+
+
+if __name__ == "__main__":
+    main(tuple(int(n) for n in sys.argv[1:]) or SIZES)
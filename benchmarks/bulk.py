@@ -0,0 +1,57 @@
+"""Measure the throughput of BulkValidator as the number of workers grows.
+
+Throughput should grow close to linearly with the number of workers, up to
+the number of cores. A single core can't show the scaling at all. Each
+number of workers is measured with both transports.
+
+Run it from the root of the repository with:
+
+    PYTHONPATH=src python benchmarks/bulk.py [ADDRESSES]
+
+"""
+import os
+import sys
+import time
+
+from pyisemail import BulkValidator, is_email_many
+
+LOCAL_PARTS = ["test", "first.last", '"quoted string"', "comment(here)", "a..b"]
+DOMAINS = ["example.com", "mail.example.org", "[192.0.2.1]", "example"]
+
+
+def addresses(count):
+    for i in range(count):
+        local_part = LOCAL_PARTS[i % len(LOCAL_PARTS)]
+        domain = DOMAINS[i % len(DOMAINS)]
+        yield "%s%d@%s" % (local_part, i, domain)
+
+
+def main(count=200000):
+    start = time.perf_counter()
+    is_email_many(addresses(count), diagnose=True)
+    elapsed = time.perf_counter() - start
+    print("%-28s%12d addresses/s" % ("in process", count / elapsed))
+
+    workers = 1
+
+    while workers <= (os.cpu_count() or 1):
+        for transport in BulkValidator.TRANSPORTS:
+            with BulkValidator(
+                workers, diagnose=True, transport=transport
+            ) as validator:
+                # Start the workers before timing
+                list(validator.validate(["test@example.com"]))
+
+                start = time.perf_counter()
+                for _ in validator.validate(addresses(count)):
+                    pass
+                elapsed = time.perf_counter() - start
+
+            name = "%d workers, %s" % (workers, transport)
+            print("%-28s%12d addresses/s" % (name, count / elapsed))
+
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main(*(int(n) for n in sys.argv[1:]))
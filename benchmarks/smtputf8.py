@@ -0,0 +1,64 @@
+"""Compare the parser's throughput with and without SMTPUTF8.
+
+ASCII addresses should take the same time either way, since the SMTPUTF8 mode
+only sends addresses with non-ASCII characters down a different path. The
+non-ASCII addresses are only there to show what that path costs.
+
+Run it from the root of the repository with:
+
+    PYTHONPATH=src python benchmarks/smtputf8.py
+
+"""
+import sys
+import timeit
+
+from pyisemail.validators import ParserValidator
+
+ADDRESSES = {
+    "ASCII dot-atom": [
+        "test@example.com",
+        "first.last+tag@sub.example-domain.co.uk",
+        "a.b.c.d.e.f@example.org",
+    ],
+    "ASCII other": [
+        '"first last"@example.com',
+        "test(comment)@example.com",
+        "test@[192.0.2.1]",
+        "test..test@example.com",
+    ],
+    "non-ASCII": [
+        "用户@example.com",
+        "jörg.müller@example.com",
+        '"用 户"@example.com',
+    ],
+}
+
+
+def main(number=20000):
+    print("%-16s%-8s%12s%12s" % ("", "", "ASCII only", "SMTPUTF8"))
+
+    for name, addresses in ADDRESSES.items():
+        for engine in ParserValidator.ENGINES:
+            timings = []
+
+            for smtputf8 in (False, True):
+                validator = ParserValidator(engine=engine, smtputf8=smtputf8)
+                timings.append(
+                    min(
+                        timeit.repeat(
+                            lambda: [validator.is_email(a, True) for a in addresses],
+                            number=number,
+                            repeat=5,
+                        )
+                    )
+                    / (number * len(addresses))
+                )
+
+            print(
+                "%-16s%-8s" % (name, engine)
+                + "".join("%10.2fus" % (t * 1e6) for t in timings)
+            )
+
+
+if __name__ == "__main__":
+    main(*(int(n) for n in sys.argv[1:]))
@@ -0,0 +1,60 @@
+"""Measure validate_array against is_email_many on a column of addresses.
+
+The column is validated as an object array, as pandas hands it over, and as
+a fixed-width str array. It is validated again with one long address mixed
+in, which should only widen the block it is in, not the whole column.
+
+Run it from the root of the repository, with NumPy installed, with:
+
+    PYTHONPATH=src python benchmarks/vectorized.py [ADDRESSES]
+
+"""
+import sys
+import time
+
+import numpy as np
+
+from pyisemail import is_email_many
+from pyisemail.vectorized import validate_array
+
+# Mostly plain addresses, as in a real column, with one in twenty for the
+# parser
+LOCAL_PARTS = ["test", "first.last", "first-last", "user+tag"]
+DOMAINS = ["example.com", "mail.example.org", "example-1.net"]
+
+
+def addresses(count):
+    column = []
+
+    for i in range(count):
+        if i % 20:
+            local_part = LOCAL_PARTS[i % len(LOCAL_PARTS)]
+        else:
+            local_part = '"quoted string"'
+
+        column.append("%s%d@%s" % (local_part, i, DOMAINS[i % len(DOMAINS)]))
+
+    return column
+
+
+def timed(name, count, function, *args):
+    start = time.perf_counter()
+    function(*args)
+    elapsed = time.perf_counter() - start
+    print("%-28s%12d addresses/s" % (name, count / elapsed))
+
+
+def main(count=300000):
+    column = addresses(count)
+    timed("is_email_many", count, is_email_many, column)
+    timed("object array", count, validate_array, np.array(column, dtype=object))
+    timed("str array", count, validate_array, np.array(column))
+
+    column[count // 2] = "a" * 300 + "@example.com"
+    timed(
+        "object array, one long", count, validate_array, np.array(column, dtype=object)
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(n) for n in sys.argv[1:]))
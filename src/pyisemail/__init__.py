@@ -1,13 +1,44 @@
 from pyisemail.__about__ import __version__
 from pyisemail.diagnosis import BaseDiagnosis
 from pyisemail.email_validator import EmailValidator
-from pyisemail.reference import Reference
+from pyisemail.listed_address import ListedAddress
+from pyisemail.parsed_address import ParsedAddress
+from pyisemail.pipeline import Pipeline, Stage
+from pyisemail.policy import Policy
+from pyisemail.results import Results
 from pyisemail.validators import DNSValidator, GTLDValidator, ParserValidator
 
-__all__ = ["is_email"]
+__all__ = ["canonicalize", "is_email", "is_email_many", "iter_validate"]
 
+# The Policy for each combination of options is_email has been called with,
+# so that calls only pay for setting one up the first time
+_POLICIES = {}
 
-def is_email(address, check_dns=False, diagnose=False, allow_gtld=True):
+
+def __getattr__(name):
+    # Only needed to look up the references of a diagnosis
+    if name == "Reference":
+        from pyisemail.reference import Reference
+
+        return Reference
+
+    # Only needed for bulk validation, and it imports Policy from here
+    if name == "BulkValidator":
+        from pyisemail.bulk import BulkValidator
+
+        return BulkValidator
+
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def is_email(
+    address,
+    check_dns=False,
+    diagnose=False,
+    allow_gtld=True,
+    as_code=False,
+    smtputf8=False,
+):
     """Validate an email address.
 
     Keyword arguments:
@@ -15,20 +46,109 @@ def is_email(address, check_dns=False, diagnose=False, allow_gtld=True):
     check_dns --- flag for whether to check the DNS status of the domain
     diagnose  --- flag for whether to return True/False or a Diagnosis
     allow_gtld --- flag for whether to prevent gTLDs as the domain
+    as_code   --- flag for whether to return the integer code of the
+                  Diagnosis instead; see pyisemail.diagnosis.CODES
+    smtputf8  --- flag for whether to allow UTF-8 in the local part, as
+                  RFC 6531 does
+
+    """
+
+    options = (check_dns, diagnose, allow_gtld, as_code, smtputf8)
+
+    try:
+        policy = _POLICIES[options]
+    except KeyError:
+        policy = _POLICIES.setdefault(options, Policy(*options))
+
+    return policy.validate(address)
+
+
+def is_email_many(
+    addresses,
+    check_dns=False,
+    diagnose=False,
+    allow_gtld=True,
+    as_code=False,
+    smtputf8=False,
+):
+    """Validate a batch of email addresses, returning a list in order.
+
+    Takes the same options as is_email, and sets up for them once for the
+    whole batch. Repeated addresses are only validated once, and repeated
+    domains only looked up in DNS once.
+
+    Keyword arguments:
+    addresses --- an iterable of email addresses as strings
+    check_dns --- flag for whether to check the DNS status of the domain
+    diagnose  --- flag for whether to return True/False or a Diagnosis
+    allow_gtld --- flag for whether to prevent gTLDs as the domain
+    as_code   --- flag for whether to return the integer code of the
+                  Diagnosis instead; see pyisemail.diagnosis.CODES
+    smtputf8  --- flag for whether to allow UTF-8 in the local part, as
+                  RFC 6531 does
 
     """
 
-    threshold = BaseDiagnosis.CATEGORIES["THRESHOLD"]
-    d = ParserValidator().is_email(address, True)
+    policy = Policy(check_dns, diagnose, allow_gtld, as_code, smtputf8)
+
+    return policy.validate_many(addresses)
+
+
+def iter_validate(
+    addresses,
+    check_dns=False,
+    diagnose=False,
+    allow_gtld=True,
+    as_code=False,
+    smtputf8=False,
+    window=64,
+):
+    """Yield (address, result) for each of a stream of email addresses.
+
+    Takes the same options as is_email. Unlike is_email_many, it takes the
+    addresses as it needs them and keeps no more than window of them at a
+    time, so it suits inputs too big to hold, like the lines of a file.
+
+    Keyword arguments:
+    addresses --- an iterable of email addresses as strings
+    check_dns --- flag for whether to check the DNS status of the domain
+    diagnose  --- flag for whether to return True/False or a Diagnosis
+    allow_gtld --- flag for whether to prevent gTLDs as the domain
+    as_code   --- flag for whether to return the integer code of the
+                  Diagnosis instead; see pyisemail.diagnosis.CODES
+    smtputf8  --- flag for whether to allow UTF-8 in the local part, as
+                  RFC 6531 does
+    window    --- how many addresses to look up in DNS ahead of the one
+                  being yielded, at the same time (default 64)
+
+    """
+
+    policy = Policy(check_dns, diagnose, allow_gtld, as_code, smtputf8)
+
+    return policy.iter_validate(addresses, window)
+
+
+def canonicalize(address, smtputf8=False):
+    """Return a canonical form of an email address, for deduplication.
+
+    Addresses that differ only in their comments, folding white space,
+    needless quoting or the case of their domain have the same canonical
+    form. It falls out of the same parse that validates the address; see
+    ParsedAddress.canonical.
+
+    Keyword arguments:
+    address  --- the email address as a string
+    smtputf8 --- flag for whether to allow UTF-8 in the local part, as
+                 RFC 6531 does
+
+    """
 
-    if d < BaseDiagnosis.CATEGORIES["DNSWARN"]:
-        domain = address.split("@")[1]
+    # Share the parser, and its caches, of the default policy
+    options = (False, False, True, False, smtputf8)
 
-        if check_dns is True or allow_gtld is False:
-            threshold = BaseDiagnosis.CATEGORIES["VALID"]
-        if check_dns is True:
-            d = max(d, DNSValidator().is_valid(domain, True))
-        if allow_gtld is False:
-            d = max(d, GTLDValidator().is_valid(domain, True))
+    try:
+        policy = _POLICIES[options]
+    except KeyError:
+        policy = _POLICIES.setdefault(options, Policy(*options))
 
-    return d if diagnose else d < threshold
+    return policy.parser.parse(address).canonical
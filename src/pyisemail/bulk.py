@@ -0,0 +1,562 @@
+import os
+import sys
+from array import array
+from collections import deque
+from itertools import accumulate, islice
+from operator import attrgetter, not_
+from zlib import crc32
+
+from pyisemail.policy import DOMAIN_MEMO_SIZE, Policy
+
+__all__ = ["BulkValidator"]
+
+# The Policy of each worker process, set up once when the worker starts,
+# and how it turns its results into codes for the shared_memory transport
+_POLICY = None
+_ENCODE = None
+# The size of each offset and each result code in shared memory
+OFFSET = array("Q").itemsize
+CODE = array("H").itemsize
+
+
+class BulkValidator(object):
+
+    """Validate large lists of addresses across a pool of worker processes.
+
+    The parser is pure Python, so a single process can only use one core.
+    The addresses are split into chunks, which the workers validate with a
+    Policy each of them sets up once and keeps, caches and all, for as long
+    as the pool lives. The results come back in the order of the addresses.
+
+    With affinity, each address goes to the worker its domain hashes to, so
+    each domain is only ever looked up in DNS, and kept in a cache, by one
+    worker, rather than by every worker it happens to reach.
+
+    Only a bounded number of chunks are in flight at once, so the input is
+    read as the results are consumed, and a slow chunk holds up no more than
+    that many finished ones waiting to be yielded in order.
+
+    """
+
+    TRANSPORTS = ("pickle", "shared_memory")
+
+    def __init__(
+        self,
+        workers=None,
+        chunk_size=1000,
+        max_pending=None,
+        check_dns=False,
+        diagnose=False,
+        allow_gtld=True,
+        as_code=False,
+        smtputf8=False,
+        transport="pickle",
+        affinity=False,
+    ):
+        """Create a bulk validator; its workers start when first needed.
+
+        Keyword arguments:
+        workers     --- how many worker processes to start (default None,
+                        for one per CPU)
+        chunk_size  --- how many addresses to send to a worker at a time
+                        (default 1000)
+        max_pending --- how many chunks to have in flight at once (default
+                        None, for twice the number of workers)
+        check_dns   --- flag for whether to check the DNS status of the
+                        domain
+        diagnose    --- flag for whether to return True/False or a Diagnosis
+        allow_gtld  --- flag for whether to prevent gTLDs as the domain
+        as_code     --- flag for whether to return the integer code of the
+                        Diagnosis instead; see pyisemail.diagnosis.CODES
+        smtputf8    --- flag for whether to allow UTF-8 in the local part, as
+                        RFC 6531 does
+        transport   --- how to move addresses and results between processes:
+                        "pickle" to send each chunk as a list, or
+                        "shared_memory" to pack them into shared memory
+                        (Python 3.8 or later), where nothing is pickled per
+                        address (default "pickle")
+        affinity    --- flag to send every address at a domain to the same
+                        worker (default False)
+
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        if transport not in self.TRANSPORTS:
+            raise ValueError("Unknown transport: %r" % (transport,))
+        if transport == "shared_memory" and sys.version_info < (3, 8):
+            raise ValueError("The shared_memory transport needs Python 3.8")
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if max_pending is None:
+            max_pending = 2 * workers
+
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending
+        self.options = (check_dns, diagnose, allow_gtld, as_code, smtputf8)
+        self.transport = transport
+        self.affinity = affinity
+        self.executors = None
+
+    def validate(self, addresses):
+        """Yield the result for each address, in order.
+
+        Keyword arguments:
+        addresses --- an iterable of email addresses, as str or bytes
+                      objects
+
+        """
+        if self.transport == "shared_memory":
+            return self._validate_shared(addresses, _decoder(self.options))
+
+        return self._validate_pickled(addresses)
+
+    def collect(self, addresses):
+        """Validate addresses into a Results, which keeps a few bytes each.
+
+        The validator has to have been created with diagnose or as_code,
+        since it is the diagnosis codes that are kept.
+
+        Keyword arguments:
+        addresses --- an iterable of email addresses, as str or bytes
+                      objects
+
+        """
+        from pyisemail.results import Results
+
+        check_dns, diagnose, allow_gtld, as_code, smtputf8 = self.options
+
+        if not (diagnose or as_code):
+            raise ValueError("Collecting results needs diagnose or as_code")
+
+        results = Results()
+        # The addresses in flight, whose codes are yet to come back in order
+        taken = deque()
+
+        def take():
+            for address in addresses:
+                taken.append(address)
+                yield address
+
+        if self.transport == "shared_memory":
+            codes = self._validate_shared(take(), int)
+        else:
+            codes = map(_encoder(self.options), self._validate_pickled(take()))
+
+        for code in codes:
+            results.append(taken.popleft(), code)
+
+        return results
+
+    def _validate_pickled(self, addresses):
+        """Yield the result for each address, sending them as lists.
+
+        Keyword arguments:
+        addresses --- an iterable of email addresses
+
+        """
+        executors = self._start()
+        addresses = iter(addresses)
+        pending = deque()
+
+        if self.affinity:
+            # A chunk for each worker at a time
+            block_size = self.chunk_size * self.workers
+            max_blocks = max(self.max_pending // self.workers, 1)
+        else:
+            block_size = self.chunk_size
+            max_blocks = self.max_pending
+
+        try:
+            while True:
+                while len(pending) < max_blocks:
+                    block = list(islice(addresses, block_size))
+
+                    if not block:
+                        break
+
+                    if not self.affinity:
+                        future = executors[0].submit(_validate_chunk, block)
+                        pending.append((len(block), [(None, future)]))
+                        continue
+
+                    futures = []
+
+                    for shard, positions in enumerate(_partition(block, self.workers)):
+                        if positions:
+                            chunk = [block[i] for i in positions]
+                            future = executors[shard].submit(_validate_chunk, chunk)
+                            futures.append((positions, future))
+
+                    pending.append((len(block), futures))
+
+                if not pending:
+                    break
+
+                count, futures = pending.popleft()
+
+                if futures[0][0] is None:
+                    results = futures[0][1].result()
+                else:
+                    # Put the results of each worker back in order
+                    results = [None] * count
+
+                    for positions, future in futures:
+                        for i, result in zip(positions, future.result()):
+                            results[i] = result
+
+                for result in results:
+                    yield result
+        finally:
+            # The pool outlives this call, so chunks left queued would hold
+            # up the workers for whatever is validated next
+            for _, futures in pending:
+                for _, future in futures:
+                    future.cancel()
+
+    def _validate_shared(self, addresses, decode):
+        """Yield the result for each address, passing them in shared memory.
+
+        The addresses are packed into blocks of max_pending chunks. Each
+        block is one segment of shared memory, laid out as the offsets of
+        the addresses, then a result code for each address for the workers
+        to fill in, then a flag for each address that was a str, then the
+        addresses themselves. Only the name of the segment and the range of
+        each chunk are pickled. One block is packed while the workers
+        validate the one before.
+
+        Keyword arguments:
+        addresses --- an iterable of email addresses
+        decode    --- the function to turn each result code into a result
+
+        """
+        from multiprocessing.shared_memory import SharedMemory
+
+        executors = self._start()
+        addresses = iter(addresses)
+        block_size = self.chunk_size * self.max_pending
+        pending = deque()
+
+        try:
+            while True:
+                while len(pending) < 2:
+                    block = list(islice(addresses, block_size))
+
+                    if not block:
+                        break
+
+                    count = len(block)
+
+                    if self.affinity:
+                        # Pack the addresses of each worker together
+                        shards = _partition(block, self.workers)
+                        order = [i for positions in shards for i in positions]
+                        block = [block[i] for i in order]
+                    else:
+                        shards = [range(count)]
+                        order = None
+
+                    shm = _pack(SharedMemory, block)
+                    futures = []
+                    start = 0
+
+                    for shard, positions in enumerate(shards):
+                        stop = start + len(positions)
+
+                        for i, j in _ranges(start, stop, self.chunk_size):
+                            future = executors[shard].submit(
+                                _validate_block, shm.name, count, i, j
+                            )
+                            futures.append(future)
+
+                        start = stop
+
+                    pending.append((shm, count, order, futures))
+
+                if not pending:
+                    break
+
+                shm, count, order, futures = pending.popleft()
+
+                try:
+                    for future in futures:
+                        future.result()
+
+                    codes = _unpack_codes(shm, count)
+                finally:
+                    shm.close()
+                    shm.unlink()
+
+                if order is not None:
+                    # Put the codes back in the order of the addresses
+                    packed, codes = codes, [0] * count
+
+                    for i, code in zip(order, packed):
+                        codes[i] = code
+
+                for code in codes:
+                    yield decode(code)
+        finally:
+            # Shared memory outlives the process unless it is unlinked
+            for shm, _, _, futures in pending:
+                for future in futures:
+                    future.cancel()
+
+                # Wait for the workers that already started on the block
+                for future in futures:
+                    if not future.cancelled():
+                        future.exception()
+
+                shm.close()
+                shm.unlink()
+
+    def close(self):
+        """Stop the worker processes."""
+        if self.executors is not None:
+            for executor in self.executors:
+                executor.shutdown()
+
+            self.executors = None
+
+    def _start(self):
+        """Return the pools of workers, starting them if need be.
+
+        With affinity, each worker is a pool of its own, so that addresses
+        can be sent to it in particular.
+
+        """
+        if self.executors is None:
+            # Only bulk validation needs these, and they are slow to import
+            from concurrent.futures import ProcessPoolExecutor
+
+            if self.affinity:
+                sizes = [1] * self.workers
+            else:
+                sizes = [self.workers]
+
+            self.executors = [
+                ProcessPoolExecutor(
+                    size, initializer=_init_worker, initargs=(self.options,)
+                )
+                for size in sizes
+            ]
+
+        return self.executors
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _init_worker(options):
+    """Set up the Policy of a worker process.
+
+    Keyword arguments:
+    options --- the arguments to create the Policy with
+
+    """
+    global _POLICY, _ENCODE
+
+    _POLICY = Policy(*options, dns_cache_size=DOMAIN_MEMO_SIZE)
+    _ENCODE = _encoder(options)
+
+
+def _validate_chunk(chunk):
+    """Validate a chunk of addresses in a worker process.
+
+    Keyword arguments:
+    chunk --- a list of email addresses
+
+    """
+    return _POLICY.validate_many(chunk)
+
+
+def _validate_block(name, count, start, stop):
+    """Validate part of a block of addresses in shared memory.
+
+    Keyword arguments:
+    name  --- the name of the shared memory segment
+    count --- how many addresses are in the block
+    start --- the index of the first address to validate
+    stop  --- the index after the last address to validate
+
+    """
+    from multiprocessing.shared_memory import SharedMemory
+
+    shm = SharedMemory(name)
+    offsets, codes, kinds, data = views = _layout(shm.buf, count)
+    validate = _POLICY.validate
+    encode = _ENCODE
+
+    try:
+        for i in range(start, stop):
+            address = bytes(data[offsets[i] : offsets[i + 1]])
+
+            if kinds[i]:
+                address = address.decode("utf-8", "surrogatepass")
+
+            codes[i] = encode(validate(address))
+    finally:
+        # The segment can't be closed while there are views of it
+        for view in views:
+            view.release()
+
+        shm.close()
+
+
+def _pack(shared_memory, block):
+    """Pack a block of addresses into a new shared memory segment.
+
+    Addresses that were str are encoded as UTF-8 and flagged, so that the
+    workers decode them and validate the same address they were given.
+
+    Keyword arguments:
+    shared_memory --- the SharedMemory class
+    block         --- a list of email addresses, as str or bytes objects
+
+    """
+    count = len(block)
+    kinds = bytes(isinstance(address, str) for address in block)
+    data = [
+        a.encode("utf-8", "surrogatepass") if kind else bytes(a)
+        for a, kind in zip(block, kinds)
+    ]
+    offsets = array("Q", [0])
+    offsets.extend(accumulate(len(address) for address in data))
+    data = b"".join(data)
+
+    shm = shared_memory(create=True, size=_data_start(count) + len(data))
+    views = _layout(shm.buf, count)
+
+    try:
+        views[0][:] = offsets
+        views[2][:] = kinds
+        views[3][:] = data
+    finally:
+        for view in views:
+            view.release()
+
+    return shm
+
+
+def _unpack_codes(shm, count):
+    """Return the result codes the workers wrote to a block, as a list.
+
+    Keyword arguments:
+    shm   --- the SharedMemory segment of the block
+    count --- how many addresses are in the block
+
+    """
+    views = _layout(shm.buf, count)
+
+    try:
+        return views[1].tolist()
+    finally:
+        for view in views:
+            view.release()
+
+
+def _layout(buf, count):
+    """Return views of the offsets, codes, kinds and data of a block.
+
+    Keyword arguments:
+    buf   --- the buffer of the block's shared memory segment
+    count --- how many addresses are in the block
+
+    """
+    codes = (count + 1) * OFFSET
+    kinds = codes + count * CODE
+    data = kinds + count
+
+    return (
+        buf[:codes].cast("Q"),
+        buf[codes:kinds].cast("H"),
+        buf[kinds:data],
+        buf[data:],
+    )
+
+
+def _data_start(count):
+    """Return where the addresses start in a block of count addresses."""
+    return (count + 1) * OFFSET + count * CODE + count
+
+
+def _ranges(start, stop, size):
+    """Yield the (start, stop) of each chunk of a range of a block.
+
+    Keyword arguments:
+    start --- the index of the first address in the range
+    stop  --- the index after the last address in the range
+    size  --- the most addresses in a chunk
+
+    """
+    for i in range(start, stop, size):
+        yield i, min(i + size, stop)
+
+
+def _partition(block, shards):
+    """Return the positions of the addresses that go to each shard.
+
+    An address goes to the shard its domain hashes to. The domain is
+    whatever follows the last "@", lowercased, which is all it takes to
+    keep the same domain together, whether or not the address is valid.
+
+    Keyword arguments:
+    block  --- a list of email addresses, as str or bytes objects
+    shards --- how many shards to split them into
+
+    """
+    positions = [[] for _ in range(shards)]
+
+    for i, address in enumerate(block):
+        if isinstance(address, str):
+            domain = address.rpartition("@")[2].strip().lower()
+            domain = domain.encode("utf-8", "surrogatepass")
+        else:
+            domain = bytes(address).rpartition(b"@")[2].strip().lower()
+
+        # crc32 is the same in every process and run, unlike hash
+        positions[crc32(domain) % shards].append(i)
+
+    return positions
+
+
+def _encoder(options):
+    """Return a function that turns a result into a code for shared memory.
+
+    A diagnosis becomes its code, and a verdict 0 for valid and 1 for not.
+
+    Keyword arguments:
+    options --- the options of the Policy whose results to turn into codes
+
+    """
+    check_dns, diagnose, allow_gtld, as_code, smtputf8 = options
+
+    if as_code:
+        return int
+    elif diagnose:
+        return attrgetter("code")
+    else:
+        return not_
+
+
+def _decoder(options):
+    """Return a function that turns a code back into a result.
+
+    Keyword arguments:
+    options --- the options of the Policy whose results the codes are
+
+    """
+    check_dns, diagnose, allow_gtld, as_code, smtputf8 = options
+
+    if as_code:
+        return int
+    elif diagnose:
+        from pyisemail.diagnosis import from_code
+
+        return from_code
+    else:
+        return not_
@@ -9,6 +9,7 @@ from pyisemail.diagnosis.rfc5322_diagnosis import RFC5322Diagnosis
 from pyisemail.diagnosis.valid_diagnosis import ValidDiagnosis
 
 __all__ = [
+    "CODES",
     "BaseDiagnosis",
     "CFWSDiagnosis",
     "DeprecatedDiagnosis",
@@ -17,4 +18,18 @@ __all__ = [
     "RFC5321Diagnosis",
     "RFC5322Diagnosis",
     "ValidDiagnosis",
+    "from_code",
 ]
+
+
+def __getattr__(name):
+    # The table of every code is only built when it is first asked for
+    if name in ("CODES", "from_code"):
+        from pyisemail.diagnosis import codes
+
+        value = getattr(codes, name)
+        globals()[name] = value
+
+        return value
+
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
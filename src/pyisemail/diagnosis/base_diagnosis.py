@@ -1,4 +1,4 @@
-from pyisemail.reference import Reference
+_REGISTRY = {}
 
 
 class BaseDiagnosis(object):
@@ -9,8 +9,21 @@ class BaseDiagnosis(object):
     it does not provide any pertinent information. Always use one of its
     subclasses.
 
+    Diagnoses compare by their code. The validators don't construct them but
+    use the shared, immutable instance for each type from get, so validating
+    an address allocates no diagnoses.
+
     """
 
+    __slots__ = (
+        "diagnosis_type",
+        "description",
+        "message",
+        "code",
+        "_references",
+        "_frozen",
+    )
+
     CATEGORIES = {
         "VALID": 1,
         "DNSWARN": 7,
@@ -30,21 +43,77 @@ class BaseDiagnosis(object):
         self.diagnosis_type = str(diagnosis_type)
         self.description = self.DESCRIPTION
         self.message = self.MESSAGES.get(diagnosis_type, "")
-        self.references = self.get_references(diagnosis_type)
         self.code = self.ERROR_CODES.get(diagnosis_type, -1)
 
+    @classmethod
+    def get(cls, diagnosis_type):
+        """Return the shared instance of a diagnosis.
+
+        The instance is immutable, so it is safe to hand out to every caller.
+
+        Keyword arguments:
+        diagnosis_type -- the type of diagnosis
+
+        """
+        try:
+            return _REGISTRY[cls, diagnosis_type]
+        except KeyError:
+            diagnosis = cls(diagnosis_type)
+            object.__setattr__(diagnosis, "_frozen", True)
+
+            return _REGISTRY.setdefault((cls, diagnosis_type), diagnosis)
+
+    @property
+    def references(self):
+        try:
+            return self._references
+        except AttributeError:
+            # Most diagnoses never have their references read, so only build
+            # them on demand
+            references = self.get_references(self.diagnosis_type)
+            object.__setattr__(self, "_references", references)
+
+            return references
+
+    @references.setter
+    def references(self, references):
+        self._references = references
+
     def get_references(self, diagnosis_type):
+        from pyisemail.reference import Reference
+
         refs = self.REFERENCES.get(diagnosis_type, [])
         return [Reference(ref) for ref in refs]
 
+    def __setattr__(self, name, value):
+        if getattr(self, "_frozen", False):
+            raise AttributeError("%r is immutable" % self)
+
+        object.__setattr__(self, name, value)
+
+    def __reduce__(self):
+        if getattr(self, "_frozen", False):
+            return (self.__class__.get, (self.diagnosis_type,))
+
+        state = {"description": self.description, "message": self.message}
+        state["code"] = self.code
+
+        return (self.__class__, (self.diagnosis_type,), (None, state))
+
     def __repr__(self):
         return "<%s: %s>" % (self.__class__.__name__, self.diagnosis_type)
 
     def __hash__(self):
-        return hash((self.__class__.__name__, self.diagnosis_type))
+        return hash(self.code)
 
     def __eq__(self, other):
-        return repr(self) == repr(other)
+        if not isinstance(other, BaseDiagnosis):
+            return NotImplemented
+        elif self.code == -1:
+            # Unknown types all share a code, so tell them apart by name
+            return repr(self) == repr(other)
+        else:
+            return self.code == other.code
 
     def __lt__(self, other):
         if isinstance(other, BaseDiagnosis):
@@ -5,6 +5,8 @@ class CFWSDiagnosis(BaseDiagnosis):
 
     """A diagnosis indicating a problem with white space in the address."""
 
+    __slots__ = ()
+
     DESCRIPTION = (
         "Address is valid within the message "
         "but cannot be used unmodified for the envelope."
@@ -0,0 +1,47 @@
+from pyisemail.diagnosis.cfws_diagnosis import CFWSDiagnosis
+from pyisemail.diagnosis.deprecated_diagnosis import DeprecatedDiagnosis
+from pyisemail.diagnosis.dns_diagnosis import DNSDiagnosis
+from pyisemail.diagnosis.gtld_diagnosis import GTLDDiagnosis
+from pyisemail.diagnosis.invalid_diagnosis import InvalidDiagnosis
+from pyisemail.diagnosis.rfc5321_diagnosis import RFC5321Diagnosis
+from pyisemail.diagnosis.rfc5322_diagnosis import RFC5322Diagnosis
+from pyisemail.diagnosis.valid_diagnosis import ValidDiagnosis
+
+__all__ = ["CODES", "from_code"]
+
+# Every diagnosis code, mapped to the (class, type, message, references) of
+# its diagnosis. The references are the names of the references, which can
+# be turned into pyisemail.Reference instances when needed.
+CODES = {0: (ValidDiagnosis, "VALID", ValidDiagnosis.MESSAGE, ())}
+
+for diagnosis_class in (
+    DNSDiagnosis,
+    GTLDDiagnosis,
+    RFC5321Diagnosis,
+    CFWSDiagnosis,
+    DeprecatedDiagnosis,
+    RFC5322Diagnosis,
+    InvalidDiagnosis,
+):
+    for diagnosis_type, code in diagnosis_class.ERROR_CODES.items():
+        CODES[code] = (
+            diagnosis_class,
+            diagnosis_type,
+            diagnosis_class.MESSAGES.get(diagnosis_type, ""),
+            tuple(diagnosis_class.REFERENCES.get(diagnosis_type, ())),
+        )
+
+
+def from_code(code):
+    """Return the shared diagnosis for a diagnosis code.
+
+    Keyword arguments:
+    code -- the integer code of the diagnosis
+
+    """
+    try:
+        diagnosis_class, diagnosis_type = CODES[code][:2]
+    except KeyError:
+        raise ValueError("Unknown diagnosis code: %r" % (code,))
+
+    return diagnosis_class.get(diagnosis_type)
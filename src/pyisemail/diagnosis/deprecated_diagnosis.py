@@ -5,6 +5,8 @@ class DeprecatedDiagnosis(BaseDiagnosis):
 
     """A diagnosis indicating the presence of deprecated address features."""
 
+    __slots__ = ()
+
     DESCRIPTION = (
         "Address contains deprecated elements "
         "but may still be valid in restricted contexts."
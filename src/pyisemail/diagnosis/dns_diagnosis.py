@@ -5,6 +5,8 @@ class DNSDiagnosis(BaseDiagnosis):
 
     """A diagnosis indicating a lack of a DNS record for a domain."""
 
+    __slots__ = ()
+
     DESCRIPTION = "Address is valid but a DNS check was not successful."
 
     ERROR_CODES = {
@@ -5,6 +5,8 @@ class GTLDDiagnosis(BaseDiagnosis):
 
     """A diagnosis indicating that a domain is a disallowed gTLD."""
 
+    __slots__ = ()
+
     DESCRIPTION = "Address uses a gTLD as its domain."
 
     ERROR_CODES = {"GTLD": 2}
@@ -5,6 +5,8 @@ class InvalidDiagnosis(BaseDiagnosis):
 
     """A diagnosis indicating the presence of an invalid address component."""
 
+    __slots__ = ()
+
     DESCRIPTION = "Address is invalid for any purpose"
 
     ERROR_CODES = {
@@ -31,6 +33,8 @@ class InvalidDiagnosis(BaseDiagnosis):
         "FWS_CRLF_END": 149,
         "CR_NO_LF": 150,
         "BAD_PARSE": 151,
+        "INPUT_TOOLONG": 152,
+        "NESTING_TOODEEP": 153,
     }
 
     MESSAGES = {
@@ -83,6 +87,8 @@ class InvalidDiagnosis(BaseDiagnosis):
             "that is not followed by a line return."
         ),
         "BAD_PARSE": "Address is malformed.",
+        "INPUT_TOOLONG": "Address is longer than the parser will accept.",
+        "NESTING_TOODEEP": "Address nests too deeply for the parser to accept.",
     }
 
     REFERENCES = {
@@ -109,4 +115,6 @@ class InvalidDiagnosis(BaseDiagnosis):
         "FWS_CRLF_END": ["CFWS"],
         "CR_NO_LF": ["CFWS", "CRLF"],
         "BAD_PARSE": [],
+        "INPUT_TOOLONG": [],
+        "NESTING_TOODEEP": [],
     }
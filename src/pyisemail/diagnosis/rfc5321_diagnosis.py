@@ -5,6 +5,8 @@ class RFC5321Diagnosis(BaseDiagnosis):
 
     """A diagnosis indicating the address is only valid for SMTP."""
 
+    __slots__ = ()
+
     DESCRIPTION = "Address is valid for SMTP but has unusual elements."
 
     ERROR_CODES = {
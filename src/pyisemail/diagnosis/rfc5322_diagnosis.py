@@ -5,6 +5,8 @@ class RFC5322Diagnosis(BaseDiagnosis):
 
     """A diagnosis indicating the address is only technically valid."""
 
+    __slots__ = ()
+
     DESCRIPTION = (
         "Address is only valid according to the "
         "broad definition of RFC5322. It is otherwise invalid."
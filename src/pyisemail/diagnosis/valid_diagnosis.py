@@ -5,6 +5,8 @@ class ValidDiagnosis(BaseDiagnosis):
 
     """A diagnosis indicating the address is valid for use."""
 
+    __slots__ = ()
+
     DESCRIPTION = "Address is valid."
 
     MESSAGE = (
@@ -18,5 +20,11 @@ class ValidDiagnosis(BaseDiagnosis):
         self.diagnosis_type = diagnosis_type
         self.description = self.DESCRIPTION
         self.message = self.MESSAGE
-        self.references = None
         self.code = 0
+
+    @classmethod
+    def get(cls, diagnosis_type="VALID"):
+        return super(ValidDiagnosis, cls).get(diagnosis_type)
+
+    def get_references(self, diagnosis_type):
+        return None
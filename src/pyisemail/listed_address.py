@@ -0,0 +1,44 @@
+from pyisemail.parsed_address import ParsedAddress
+
+
+class ListedAddress(ParsedAddress):
+
+    """An address found in an address list, like the value of a To header.
+
+    Along with the components and diagnosis of the addr-spec, it has the
+    display name and group that the address was listed with, as they appear
+    in the header, and where the addr-spec is in the header.
+
+    """
+
+    __slots__ = ("display_name", "group", "start", "end")
+
+    def __init__(self, local_part, domain, diagnosis, display_name, group, start, end):
+        """Create a listed address.
+
+        Keyword arguments:
+        local_part   -- the local part of the address
+        domain       -- the domain of the address
+        diagnosis    -- the diagnosis of the address
+        display_name -- the display name before the address, or None
+        group        -- the display name of the group the address is in, or
+                        None
+        start        -- index of the first character of the addr-spec
+        end          -- index after the last character of the addr-spec
+
+        """
+        super(ListedAddress, self).__init__(local_part, domain, diagnosis)
+        self.display_name = display_name
+        self.group = group
+        self.start = start
+        self.end = end
+
+    def __repr__(self):
+        return "<%s: %s@%s at %d:%d (%r)>" % (
+            self.__class__.__name__,
+            self.local_part,
+            self.domain,
+            self.start,
+            self.end,
+            self.diagnosis,
+        )
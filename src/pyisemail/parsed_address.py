@@ -0,0 +1,102 @@
+import re
+
+from pyisemail.diagnosis import BaseDiagnosis
+
+# The words of a local part, once the parser has dropped its CFWS: quoted
+# strings, whose quoted pairs stand for the character after the backslash,
+# and everything between them
+LOCAL_WORD = re.compile(r'"((?:[^"\\]|\\.)*)"|([^"]+)', re.DOTALL)
+QUOTED_PAIR = re.compile(r"\\(.)", re.DOTALL)
+# The characters that can only appear in a quoted string as a quoted pair
+QUOTED_SPECIAL = re.compile(r'(["\\\0\r\n])')
+# A local part that needs no quoting. Non-ASCII characters only get this far
+# in SMTPUTF8 mode, where they are atext.
+ATEXT = r"[A-Za-z0-9!#$%&'*+/=?^_`{|}~\x80-\U0010ffff-]+"
+DOT_ATOM = re.compile(r"%s(?:\.%s)*" % (ATEXT, ATEXT))
+
+
+class ParsedAddress(object):
+
+    """The components of an address, as the parser found them.
+
+    The local part and domain are those the parser collected, so comments and
+    folding white space have already been dropped from them. An address the
+    parser gave up on partway through only has the components it reached.
+
+    """
+
+    __slots__ = ("local_part", "domain", "labels", "literal", "diagnosis")
+
+    def __init__(self, local_part, domain, diagnosis):
+        """Create a parsed address.
+
+        Keyword arguments:
+        local_part -- the local part of the address
+        domain     -- the domain of the address
+        diagnosis  -- the diagnosis of the address
+
+        """
+        self.local_part = local_part
+        self.domain = domain
+        self.literal = domain.startswith("[")
+        if self.literal or not domain:
+            self.labels = ()
+        else:
+            self.labels = tuple(domain.split("."))
+        self.diagnosis = diagnosis
+
+    @property
+    def canonical(self):
+        """Return the address in a form that is the same for equal addresses.
+
+        The domain is lowercased, and the local part is only quoted if it
+        has to be, with only the characters that must be escaped escaped. The
+        local part keeps its case, which is up to the receiving host. None
+        for an address the parser gave up on, whose components can't be
+        trusted.
+
+        """
+        if self.diagnosis > BaseDiagnosis.CATEGORIES["RFC5322"]:
+            return None
+
+        local_part = self.local_part
+
+        if '"' in local_part:
+            words = []
+
+            for match in LOCAL_WORD.finditer(local_part):
+                quoted, text = match.groups()
+                words.append(text if quoted is None else QUOTED_PAIR.sub(r"\1", quoted))
+
+            local_part = "".join(words)
+
+            if DOT_ATOM.fullmatch(local_part) is None:
+                local_part = '"%s"' % QUOTED_SPECIAL.sub(r"\\\1", local_part)
+
+        if self.literal:
+            domain = self.domain
+        else:
+            domain = self.domain.lower()
+
+        return "%s@%s" % (local_part, domain)
+
+    def __repr__(self):
+        return "<%s: %s@%s (%r)>" % (
+            self.__class__.__name__,
+            self.local_part,
+            self.domain,
+            self.diagnosis,
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, ParsedAddress):
+            return NotImplemented
+
+        return (self.local_part, self.domain, self.diagnosis) == (
+            other.local_part,
+            other.domain,
+            other.diagnosis,
+        )
+
+    def __hash__(self):
+        return hash((self.local_part, self.domain, self.diagnosis))
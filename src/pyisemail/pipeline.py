@@ -0,0 +1,89 @@
+from pyisemail.diagnosis import BaseDiagnosis
+from pyisemail.validators import ParserValidator
+
+__all__ = ["Pipeline", "Stage"]
+
+
+class Stage(object):
+
+    """Abstract pipeline stage to subclass from.
+
+    A stage checks an address the parser has already taken apart. It
+    declares how costly it is, so that the pipeline can run the cheap
+    stages first, and the worst diagnosis code it can give, its ceiling, so
+    that the pipeline can skip it once the address has a diagnosis at least
+    that bad. DNSValidator and GTLDValidator are stages too.
+
+    """
+
+    cost = 0
+    ceiling = BaseDiagnosis.CATEGORIES["ERR"]
+
+    def is_valid(self, address, diagnose=False):
+        """Interface for is_valid method.
+
+        Keyword arguments:
+        address  -- the ParsedAddress to check
+        diagnose -- flag to report a diagnosis or just True/False; the
+                    pipeline always asks for a diagnosis
+        """
+        raise NotImplementedError()
+
+
+class Pipeline(object):
+
+    """Parse an address, then run it through a series of stages.
+
+    Stages run in order of their cost, cheapest first. A stage is skipped
+    when the diagnosis so far is already as bad as its ceiling, since it
+    couldn't change the outcome, and when only a verdict is wanted, the
+    pipeline stops as soon as the address is known to be invalid. A network
+    check like DNSValidator therefore never runs for an address that a
+    string check has already rejected.
+
+    """
+
+    def __init__(self, stages=(), parser=None, smtputf8=False):
+        """Create a pipeline.
+
+        Keyword arguments:
+        stages   -- the stages to run after the parser, in any order
+        parser   -- the ParserValidator to parse addresses with (default
+                    None, for one with the default options)
+        smtputf8 -- flag for whether to allow UTF-8 in the local part, as
+                    RFC 6531 does; ignored when a parser is given
+
+        """
+        if parser is None:
+            parser = ParserValidator(smtputf8=smtputf8)
+
+        self.parser = parser
+        # sorted is stable, so stages of the same cost keep their order
+        self.stages = sorted(stages, key=lambda stage: stage.cost)
+
+    def diagnose(self, address, threshold=None):
+        """Return the worst diagnosis of the parser and the stages.
+
+        Keyword arguments:
+        address   -- the email address, as a str or a bytes-like object
+        threshold -- the diagnosis code from which on the address is
+                     invalid; once it is reached, the remaining stages are
+                     skipped (default None, to get the full diagnosis)
+
+        """
+        parsed = self.parser.parse(address)
+        d = parsed.diagnosis
+
+        if threshold is not None and d.code >= threshold:
+            return d
+
+        for stage in self.stages:
+            if d.code >= stage.ceiling:
+                continue
+
+            d = max(d, stage.is_valid(parsed, True))
+
+            if threshold is not None and d.code >= threshold:
+                break
+
+        return d
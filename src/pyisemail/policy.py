@@ -0,0 +1,284 @@
+from collections import deque
+from functools import partial
+
+from pyisemail.diagnosis import BaseDiagnosis
+from pyisemail.pipeline import Pipeline
+from pyisemail.utils import LRUCache
+from pyisemail.validators import DNSValidator, GTLDValidator, ParserValidator
+
+__all__ = ["Policy"]
+
+# How many domains to remember the DNS checks of while streaming
+DOMAIN_MEMO_SIZE = 4096
+
+
+class Policy(object):
+
+    """A reusable set of is_email options, with the validators they need.
+
+    The options are settled once, when the policy is created, along with the
+    validators and their caches, so validating an address with it costs no
+    more than the checks themselves. Use one policy for the life of a
+    program rather than calling is_email with the same options each time.
+
+    """
+
+    def __init__(
+        self,
+        check_dns=False,
+        diagnose=False,
+        allow_gtld=True,
+        as_code=False,
+        smtputf8=False,
+        parser=None,
+        resolver=None,
+        stages=(),
+        dns_cache_size=None,
+    ):
+        """Create a policy.
+
+        Keyword arguments:
+        check_dns  --- flag for whether to check the DNS status of the domain
+        diagnose   --- flag for whether to return True/False or a Diagnosis
+        allow_gtld --- flag for whether to prevent gTLDs as the domain
+        as_code    --- flag for whether to return the integer code of the
+                       Diagnosis instead; see pyisemail.diagnosis.CODES
+        smtputf8   --- flag for whether to allow UTF-8 in the local part, as
+                       RFC 6531 does; ignored when a parser is given
+        parser     --- the ParserValidator to parse addresses with (default
+                       None, for one with the default options)
+        resolver   --- the dns.resolver.Resolver for DNS checks (default
+                       None, for dnspython's default resolver)
+        stages     --- more pipeline Stages to run, like blocklists (default
+                       none)
+        dns_cache_size --- how many domains to remember the DNS checks of
+                           for the life of the policy (default None, for
+                           none; the batch and stream methods still avoid
+                           repeating a lookup within a call)
+
+        """
+        if parser is None:
+            parser = ParserValidator(smtputf8=smtputf8)
+
+        self.check_dns = check_dns
+        self.diagnose = diagnose
+        self.allow_gtld = allow_gtld
+        self.as_code = as_code
+        self.parser = parser
+        self.dns_validator = DNSValidator(resolver) if check_dns else None
+        self.gtld_validator = None if allow_gtld else GTLDValidator()
+        dns_stage = self.dns_validator
+
+        if dns_stage is not None and dns_cache_size is not None:
+            dns_stage = _DomainMemo(dns_stage, LRUCache(dns_cache_size))
+
+        stages = [dns_stage, self.gtld_validator] + list(stages)
+        self.pipeline = Pipeline([s for s in stages if s is not None], parser)
+
+        # Only a verdict from the parser is wanted, so let it stop early
+        self.verdict_only = not (diagnose or as_code or self.pipeline.stages)
+
+        if check_dns or not allow_gtld:
+            self.threshold = BaseDiagnosis.CATEGORIES["VALID"]
+        else:
+            self.threshold = BaseDiagnosis.CATEGORIES["THRESHOLD"]
+
+    def validate(self, address):
+        """Validate an email address, as is_email does with these options.
+
+        Keyword arguments:
+        address --- the email address, as a str or a bytes-like object
+
+        """
+        if self.verdict_only:
+            return self.parser.is_email(address)
+
+        return self._validate(self.pipeline, address)
+
+    def validate_many(self, addresses):
+        """Validate a batch of email addresses, returning a list in order.
+
+        Each distinct address is only validated once, and each distinct
+        domain only looked up in DNS once, however often they appear in the
+        batch.
+
+        Keyword arguments:
+        addresses --- an iterable of email addresses, as str or bytes-like
+                      objects
+
+        """
+        if self.verdict_only:
+            validate = self.parser.is_email
+        else:
+            validate = partial(self._validate, self._memo_pipeline({}))
+
+        results = []
+        append = results.append
+        seen = {}
+
+        for address in addresses:
+            try:
+                result = seen[address]
+            except KeyError:
+                result = seen[address] = validate(address)
+            except TypeError:
+                # A mutable buffer, like a bytearray or memoryview
+                result = validate(address)
+
+            append(result)
+
+        return results
+
+    def iter_validate(self, addresses, window=64):
+        """Yield (address, result) for each of a stream of email addresses.
+
+        Addresses are taken from the iterable as they are needed, so that
+        only a bounded number are held at once, and the results come out in
+        the same order. With DNS checks, up to window addresses are checked
+        at the same time, ahead of the one being yielded, and each domain is
+        only looked up once while it is among the recently seen ones.
+
+        Keyword arguments:
+        addresses --- an iterable of email addresses, as str or bytes-like
+                      objects
+        window    --- how many addresses to check ahead with DNS checks
+                      (default 64)
+
+        """
+        if self.dns_validator is None:
+            for address in addresses:
+                yield address, self.validate(address)
+
+            return
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        pipeline = self._memo_pipeline(LRUCache(DOMAIN_MEMO_SIZE))
+        validate = partial(self._validate, pipeline)
+        executor = ThreadPoolExecutor(window)
+        pending = deque()
+
+        try:
+            for address in addresses:
+                pending.append((address, executor.submit(validate, address)))
+
+                if len(pending) >= window:
+                    address, future = pending.popleft()
+                    yield address, future.result()
+
+            while pending:
+                address, future = pending.popleft()
+                yield address, future.result()
+        finally:
+            # shutdown waits for queued lookups, so a generator closed early
+            # would otherwise block on DNS for the rest of the window
+            for _, future in pending:
+                future.cancel()
+
+            executor.shutdown()
+
+    def _memo_pipeline(self, diagnoses):
+        """Return a pipeline of these stages that remembers DNS checks.
+
+        Keyword arguments:
+        diagnoses --- the mapping to remember the DNS checks in
+
+        """
+        stages = []
+
+        for stage in self.pipeline.stages:
+            if stage is self.dns_validator:
+                stage = _DomainMemo(stage, diagnoses)
+
+            stages.append(stage)
+
+        return Pipeline(stages, self.parser)
+
+    def _validate(self, pipeline, address):
+        """Validate an email address with a pipeline of these stages.
+
+        Keyword arguments:
+        pipeline --- the Pipeline to diagnose the address with
+        address  --- the email address, as a str or a bytes-like object
+
+        """
+        if self.diagnose or self.as_code:
+            d = pipeline.diagnose(address)
+        else:
+            d = pipeline.diagnose(address, self.threshold)
+
+        if self.as_code:
+            return d.code
+        elif self.diagnose:
+            return d
+        else:
+            return d < self.threshold
+
+    def __repr__(self):
+        return (
+            "<%s: check_dns=%r, diagnose=%r, allow_gtld=%r, as_code=%r, "
+            "smtputf8=%r>"
+            % (
+                self.__class__.__name__,
+                self.check_dns,
+                self.diagnose,
+                self.allow_gtld,
+                self.as_code,
+                self.parser.smtputf8,
+            )
+        )
+
+
+class _DomainMemo(object):
+
+    """A pipeline stage that remembers the diagnosis of each domain.
+
+    Only for stages whose diagnosis depends on nothing but the domain. It is
+    safe to share between threads: while one thread checks a domain, the
+    others that want it wait for that check rather than starting their own.
+
+    """
+
+    def __init__(self, stage, diagnoses):
+        """Wrap a stage.
+
+        Keyword arguments:
+        stage     --- the stage to remember the diagnoses of
+        diagnoses --- the mapping to keep them in, like a dict or an LRUCache
+
+        """
+        # Only DNS checks need this, and they cost far more than the imports
+        from concurrent.futures import Future
+        from threading import Lock
+
+        self.stage = stage
+        self.cost = stage.cost
+        self.ceiling = stage.ceiling
+        self.diagnoses = diagnoses
+        self.future = Future
+        self.lock = Lock()
+
+    def is_valid(self, address, diagnose=False):
+        # Domains are case-insensitive, so remember them in lowercase
+        domain = address.domain.lower()
+
+        with self.lock:
+            future = self.diagnoses.get(domain)
+
+            if future is None:
+                future = self.diagnoses[domain] = self.future()
+                owner = True
+            else:
+                owner = False
+
+        if owner:
+            try:
+                future.set_result(self.stage.is_valid(address, True))
+            except BaseException as e:
+                # Let the next address at the domain try again
+                with self.lock:
+                    self.diagnoses[domain] = None
+
+                future.set_exception(e)
+
+        return future.result()
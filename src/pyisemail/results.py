@@ -0,0 +1,149 @@
+import sys
+from array import array
+
+__all__ = ["Results"]
+
+
+class Results(object):
+
+    """The diagnoses of a bulk run, kept as columns a few bytes per address.
+
+    Each address takes up its diagnosis code, in an array("H"), and the
+    index of its domain, in an array("i"). Each distinct domain is only kept
+    once, lowercased, as are the diagnoses themselves, which are only looked
+    up from their codes when asked for. The columns can be written straight
+    to an Arrow IPC or Parquet file, with pyarrow installed.
+
+    """
+
+    def __init__(self):
+        self.codes = array("H")
+        self.domain_ids = array("i")
+        self.domains = []
+        self._ids = {}
+
+    def append(self, address, code):
+        """Add the diagnosis code of an address.
+
+        Keyword arguments:
+        address --- the email address, as a str or a bytes-like object
+        code    --- the integer code of its diagnosis
+
+        """
+        if isinstance(address, str):
+            domain = address.rpartition("@")
+        else:
+            domain = bytes(address).decode("utf-8", "replace").rpartition("@")
+
+        # Domains are case-insensitive, and an address with no "@" has none
+        domain = domain[2].lower() if domain[1] else ""
+        domain_id = self._ids.get(domain)
+
+        if domain_id is None:
+            domain_id = self._ids[domain] = len(self.domains)
+            self.domains.append(domain)
+
+        self.codes.append(code)
+        self.domain_ids.append(domain_id)
+
+    def extend(self, addresses, codes):
+        """Add the diagnosis codes of some addresses, in order.
+
+        Keyword arguments:
+        addresses --- an iterable of email addresses
+        codes     --- an iterable of the integer codes of their diagnoses
+
+        """
+        for address, code in zip(addresses, codes):
+            self.append(address, code)
+
+    def domain(self, index):
+        """Return the lowercased domain of the address at an index.
+
+        Keyword arguments:
+        index --- the position of the address
+
+        """
+        return self.domains[self.domain_ids[index]]
+
+    def to_arrow(self):
+        """Return the results as a pyarrow Table.
+
+        It has a "code" column of uint16 and a "domain" column of
+        dictionary-encoded strings, which keeps the domains interned.
+
+        """
+        import pyarrow
+
+        codes = self.codes
+        domain_ids = self.domain_ids
+
+        # Arrow buffers are little-endian
+        if sys.byteorder == "big":
+            codes, domain_ids = array("H", codes), array("i", domain_ids)
+            codes.byteswap()
+            domain_ids.byteswap()
+
+        count = len(codes)
+        # The buffers are copied, so that the arrays can still grow
+        codes = pyarrow.Array.from_buffers(
+            pyarrow.uint16(), count, [None, pyarrow.py_buffer(codes.tobytes())]
+        )
+        domain_ids = pyarrow.Array.from_buffers(
+            pyarrow.int32(), count, [None, pyarrow.py_buffer(domain_ids.tobytes())]
+        )
+        domains = pyarrow.DictionaryArray.from_arrays(
+            domain_ids, pyarrow.array(self.domains, pyarrow.string())
+        )
+
+        return pyarrow.Table.from_arrays([codes, domains], ["code", "domain"])
+
+    def write_ipc(self, where):
+        """Write the results to an Arrow IPC file.
+
+        Keyword arguments:
+        where --- the path of the file, or a file object opened in binary
+                  mode
+
+        """
+        import pyarrow.ipc
+
+        table = self.to_arrow()
+
+        with pyarrow.ipc.new_file(where, table.schema) as writer:
+            writer.write_table(table)
+
+    def write_parquet(self, where, **kwargs):
+        """Write the results to a Parquet file.
+
+        Any other keyword arguments go to pyarrow.parquet.write_table, like
+        compression.
+
+        Keyword arguments:
+        where --- the path of the file, or a file object opened in binary
+                  mode
+
+        """
+        import pyarrow.parquet
+
+        pyarrow.parquet.write_table(self.to_arrow(), where, **kwargs)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        from pyisemail.diagnosis import from_code
+
+        return from_code(self.codes[index])
+
+    def __iter__(self):
+        from pyisemail.diagnosis import from_code
+
+        return map(from_code, self.codes)
+
+    def __repr__(self):
+        return "<%s: %d addresses at %d domains>" % (
+            self.__class__.__name__,
+            len(self.codes),
+            len(self.domains),
+        )
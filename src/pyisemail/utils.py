@@ -1,3 +1,6 @@
+from collections import OrderedDict
+
+
 def enum(**enums):
 
     """Provide the capabilities of an enum from other languages.
@@ -8,3 +11,71 @@ def enum(**enums):
     """
 
     return type("Enum", (), enums)
+
+
+class LRUCache(object):
+
+    """A bounded mapping that forgets the least recently used item first.
+
+    Counts the hits and misses of get, so that callers can tell whether the
+    cache is earning its keep.
+
+    """
+
+    def __init__(self, maxsize=128):
+        """Create an empty cache.
+
+        Keyword arguments:
+        maxsize --- the most items to hold on to (default 128)
+
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        """Look up an item, marking it as the most recently used.
+
+        Keyword arguments:
+        key     --- the key of the item
+        default --- what to return if there is no such item (default None)
+
+        """
+        try:
+            value = self._data[key]
+            self._data.move_to_end(key)
+        except KeyError:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        return value
+
+    def clear(self):
+        """Forget every item and reset the counters."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return "<%s: %d/%d items, %d hits, %d misses>" % (
+            self.__class__.__name__,
+            len(self._data),
+            self.maxsize,
+            self.hits,
+            self.misses,
+        )
@@ -1,5 +1,39 @@
-from pyisemail.validators.dns_validator import DNSValidator
-from pyisemail.validators.gtld_validator import GTLDValidator
-from pyisemail.validators.parser_validator import ParserValidator
+import importlib
 
-__all__ = ["DNSValidator", "GTLDValidator", "ParserValidator"]
+__all__ = [
+    "AddressListParser",
+    "AddressScanner",
+    "DNSValidator",
+    "GTLDValidator",
+    "IncrementalParser",
+    "LiteralValidator",
+    "ParserValidator",
+]
+
+# Each validator is only imported when it is first asked for, so that using
+# one of them doesn't pay for loading the rest
+_MODULES = {
+    "AddressListParser": "address_list_parser",
+    "AddressScanner": "address_scanner",
+    "DNSValidator": "dns_validator",
+    "GTLDValidator": "gtld_validator",
+    "IncrementalParser": "incremental_parser",
+    "LiteralValidator": "literal_validator",
+    "ParserValidator": "parser_validator",
+}
+
+
+def __getattr__(name):
+    try:
+        module = _MODULES[name]
+    except KeyError:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+    value = getattr(importlib.import_module("%s.%s" % (__name__, module)), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,332 @@
+import re
+
+from pyisemail import ListedAddress
+from pyisemail.diagnosis import InvalidDiagnosis
+from pyisemail.validators.parser_validator import (
+    ParserValidator,
+    fast_diagnose,
+)
+from pyisemail.validators.table_parser import TableParser
+
+__all__ = ["AddressListParser"]
+
+# http://tools.ietf.org/html/rfc5322#section-3.4
+#   address-list    =   (address *("," address)) / obs-addr-list
+#
+#   address         =   mailbox / group
+#
+#   mailbox         =   name-addr / addr-spec
+#
+#   name-addr       =   [display-name] angle-addr
+#
+#   angle-addr      =   [CFWS] "<" addr-spec ">" [CFWS] /
+#                       obs-angle-addr
+#
+#   group           =   display-name ":" [group-list] ";" [CFWS]
+#
+#   display-name    =   phrase
+#
+# The header is split into tokens that keep quoted strings, domain literals
+# and comments whole, so that the commas, colons and brackets inside them
+# aren't mistaken for the structure of the list.
+HEADER_TOKEN = re.compile(
+    r"(?P<space>[ \t\r\n]+)"
+    r'|(?P<quoted>"(?:[^"\\]|\\.?)*"?)'
+    r"|(?P<literal>\[(?:[^\]\\]|\\.?)*\]?)"
+    r"|(?P<comment>\()"
+    r"|(?P<comma>,)|(?P<lt><)|(?P<gt>>)|(?P<colon>:)|(?P<semicolon>;)"
+    r'|(?P<text>[^ \t\r\n"(\[,:;<>]+)',
+    re.DOTALL,
+)
+HEADER_TOKEN_BYTES = re.compile(HEADER_TOKEN.pattern.encode("ascii"), re.DOTALL)
+COMMENT_STOP = re.compile(r"[()\\]")
+COMMENT_STOP_BYTES = re.compile(COMMENT_STOP.pattern.encode("ascii"))
+
+
+class AddressListParser(object):
+
+    """Find and diagnose every address in an address list in one pass.
+
+    The header is tokenized once to find its display names, angle brackets
+    and groups. The TableParser then diagnoses each addr-spec where it is in
+    the header, without copying it or classifying it again.
+
+    The addr-spec of each address excludes the comments and folding white
+    space around it, which belong to the header, but not those inside it,
+    which are diagnosed as they would be by is_email. Empty entries, like
+    those of obs-addr-list, are skipped. An unclosed angle bracket, or text
+    after a closing one, is left in the addr-spec for the parser to diagnose.
+
+    """
+
+    def __init__(self, validator=None):
+        """Create a parser.
+
+        Keyword arguments:
+        validator -- the ParserValidator whose options to parse with (default
+                     None, for the default options)
+
+        """
+        if validator is None:
+            validator = ParserValidator()
+
+        self.validator = validator
+
+    def parse(self, header):
+        """Yield a ListedAddress for each address in the header, in order.
+
+        Keyword arguments:
+        header -- the value of the header, as a str or a bytes-like object
+
+        """
+        v = self.validator
+        parser = TableParser(
+            header,
+            max_depth=v.max_depth,
+            domain_cache=v.domain_cache,
+            smtputf8=v.smtputf8,
+            literal_validator=v.literal_validator,
+        )
+        # The parser reads a non-ASCII str as UTF-8, so offsets into it have
+        # to be turned back into offsets into the str
+        if isinstance(header, str) and parser.encoding == "utf-8":
+            offsets = _Offsets(parser.data)
+        else:
+            offsets = None
+
+        for entry, group in _entries(parser):
+            listed = self._finish(parser, entry, group, offsets)
+
+            if listed is not None:
+                yield listed
+
+    def _finish(self, parser, entry, group, offsets):
+        """Diagnose the addr-spec of an entry, or return None if it is empty.
+
+        Keyword arguments:
+        parser  -- the TableParser over the whole header
+        entry   -- the _Entry to finish
+        group   -- the display name of the group the entry is in, or None
+        offsets -- the _Offsets to convert offsets with, or None
+
+        """
+        display_name = None
+
+        if entry.lt is None:
+            if entry.start is None:
+                # An empty entry, which obs-addr-list allows
+                return None
+
+            start, end = entry.start, entry.end
+        else:
+            if entry.start is not None:
+                display_name = parser.text([parser.data[entry.start : entry.end]])
+
+            if entry.gt is None:
+                # Unclosed, so let the parser find the stray bracket
+                start, end = entry.lt, entry.last
+            elif entry.junk:
+                start = entry.gt if entry.inner_start is None else entry.inner_start
+                end = entry.last
+            elif entry.inner_start is None:
+                start = end = entry.gt
+            else:
+                start, end = entry.inner_start, entry.inner_end
+
+        v = self.validator
+        diagnosis = None
+
+        if v.max_length is not None and end - start > v.max_length:
+            local_part = domain = ""
+            diagnosis = InvalidDiagnosis.get("INPUT_TOOLONG")
+        elif v.fast_path:
+            diagnosis = fast_diagnose(parser.data, start, end)
+
+            if diagnosis is not None:
+                local_part, _, domain = parser.text([parser.data[start:end]]).partition(
+                    "@"
+                )
+
+        if diagnosis is None:
+            parser.restart(start, end)
+            parser.parse()
+            local_part = parser.text(parser.local_part)
+            domain = parser.text(parser.domain)
+            diagnosis = parser.final_status()
+
+        if offsets is not None:
+            start, end = offsets.convert(start), offsets.convert(end)
+
+        return ListedAddress(
+            local_part, domain, diagnosis, display_name, group, start, end
+        )
+
+
+def _entries(parser):
+    """Split the header into entries, in one pass.
+
+    Yields each entry along with the display name of the group it is in.
+
+    Keyword arguments:
+    parser -- the TableParser over the whole header
+
+    """
+    data = parser.data
+
+    if isinstance(data, str):
+        header_token = HEADER_TOKEN
+        at = "@"
+    else:
+        header_token = HEADER_TOKEN_BYTES
+        at = b"@"
+
+    entry = _Entry()
+    group = None
+    i = 0
+    length = len(data)
+
+    while i < length:
+        match = header_token.match(data, i)
+        kind = match.lastgroup
+        start, i = i, match.end()
+
+        if kind == "space":
+            continue
+        elif kind == "comment":
+            i = _comment_end(data, i)
+            continue
+        elif kind == "comma":
+            yield entry, group
+            entry = _Entry()
+            continue
+        elif kind == "lt" and entry.lt is None:
+            entry.lt = start
+            entry.last = i
+            continue
+        elif kind == "gt" and entry.lt is not None and entry.gt is None:
+            entry.gt = start
+            entry.last = i
+            continue
+        elif kind == "colon" and group is None and entry.lt is None and not entry.at:
+            # The display name of a group
+            if entry.start is None:
+                group = ""
+            else:
+                group = parser.text([data[entry.start : entry.end]])
+
+            entry = _Entry()
+            continue
+        elif kind == "semicolon" and group is not None:
+            if entry.lt is None or entry.gt is not None:
+                yield entry, group
+                entry = _Entry()
+                group = None
+                continue
+        elif kind == "text" and entry.lt is None and not entry.at:
+            entry.at = data.find(at, start, i) != -1
+
+        # Anything else is part of the display name or the addr-spec
+        entry.mark(start, i)
+
+    yield entry, group
+
+
+class _Entry(object):
+
+    """Where the parts of one entry of an address list are in the header."""
+
+    __slots__ = (
+        "start",
+        "end",
+        "lt",
+        "gt",
+        "inner_start",
+        "inner_end",
+        "junk",
+        "last",
+        "at",
+    )
+
+    def __init__(self):
+        self.start = None  # The extent of the text before any "<"
+        self.end = None
+        self.lt = None  # Where the angle brackets are
+        self.gt = None
+        self.inner_start = None  # The extent of the text between them
+        self.inner_end = None
+        self.junk = False  # There is text after the ">"
+        self.last = None  # The end of the last text in the entry
+        self.at = False  # There is an "@" before any "<"
+
+    def mark(self, start, end):
+        """Note a token that isn't white space, a comment or structure.
+
+        Keyword arguments:
+        start -- index of the first character of the token
+        end   -- index after the last character of the token
+
+        """
+        if self.gt is not None:
+            self.junk = True
+        elif self.lt is not None:
+            if self.inner_start is None:
+                self.inner_start = start
+            self.inner_end = end
+        else:
+            if self.start is None:
+                self.start = start
+            self.end = end
+
+        self.last = end
+
+
+class _Offsets(object):
+
+    """Turn increasing offsets into UTF-8 into offsets into the str."""
+
+    def __init__(self, data):
+        self.data = data
+        self.octets = 0
+        self.chars = 0
+
+    def convert(self, octets):
+        self.chars += len(self.data[self.octets : octets].decode("utf-8"))
+        self.octets = octets
+        return self.chars
+
+
+def _comment_end(data, i):
+    """Return the index after the comment whose body starts at i.
+
+    Keyword arguments:
+    data -- the header
+    i    -- index after the opening parenthesis
+
+    """
+    if isinstance(data, str):
+        comment_stop = COMMENT_STOP
+    else:
+        comment_stop = COMMENT_STOP_BYTES
+
+    depth = 1
+
+    while depth:
+        match = comment_stop.search(data, i)
+
+        if match is None:
+            return len(data)
+
+        token = match.group()
+        i = match.end()
+
+        if not isinstance(token, str):
+            token = token.decode("ascii")
+
+        if token == "\\":
+            i += 1
+        elif token == "(":
+            depth += 1
+        else:
+            depth -= 1
+
+    return min(i, len(data))
@@ -0,0 +1,195 @@
+import mmap
+import os
+import re
+
+from pyisemail.utils import LRUCache
+from pyisemail.validators.parser_validator import ParserValidator
+
+__all__ = ["AddressScanner"]
+
+# The most octets on either side of the "@" that are worth looking at, since
+# no address is longer than that
+WINDOW = 255
+
+AT = re.compile(b"@")
+# The local part is found by matching backward from the "@", over the window
+# reversed
+LOCAL_RUN = re.compile(rb"[A-Za-z0-9!#$%&'*+/=?^_`{|}~.-]*")
+LOCAL_RUN_UTF8 = re.compile(rb"[A-Za-z0-9!#$%&'*+/=?^_`{|}~.\x80-\xff-]*")
+DOMAIN_RUN = re.compile(rb"[A-Za-z0-9.-]*[A-Za-z0-9-]|\[[^\[\]\\\s@]*\]")
+
+
+class AddressScanner(object):
+
+    """Find and diagnose the addresses in a large text, like an mbox file.
+
+    The text is searched for each "@", which is cheap, and only the text
+    around it is looked at. A candidate is the longest run of atext and dots
+    before the "@", less any leading dots, and the hostname or domain literal
+    after it. Each candidate is then diagnosed with a ParserValidator, so an
+    invalid one is still reported, along with why.
+
+    Files are read through mmap where possible, so they are never loaded
+    whole. Every message in a thread repeats the addresses of the ones
+    before it in its headers and quoted text, so the diagnoses of the
+    candidates are kept in a bounded cache, keyed on their octets.
+
+    """
+
+    def __init__(self, validator=None, chunk_size=1 << 20, cache_size=1024):
+        """Create a scanner.
+
+        Keyword arguments:
+        validator  -- the ParserValidator to diagnose candidates with
+                      (default None, for the default options)
+        chunk_size -- how much to read at a time from files that can't be
+                      memory-mapped, like pipes (default 1 MiB)
+        cache_size -- how many candidates to remember the diagnoses of
+                      (default 1024; None for no cache)
+
+        """
+        if validator is None:
+            validator = ParserValidator()
+
+        self.validator = validator
+        self.chunk_size = chunk_size
+
+        if cache_size is None:
+            self.cache = None
+        else:
+            self.cache = LRUCache(cache_size)
+
+        if validator.smtputf8:
+            self.local_run = LOCAL_RUN_UTF8
+            self.encoding = "utf-8"
+        else:
+            self.local_run = LOCAL_RUN
+            self.encoding = "ascii"
+
+    def scan(self, data, offset=0):
+        """Yield (offset, address, diagnosis) for each candidate in a buffer.
+
+        Keyword arguments:
+        data   -- the text, as a bytes-like object or an mmap
+        offset -- what to add to the offset of each candidate (default 0)
+
+        """
+        return self._scan(data, 0, len(data), 0, offset)
+
+    def scan_file(self, file):
+        """Yield (offset, address, diagnosis) for each candidate in a file.
+
+        Offsets are from the start of the file.
+
+        Keyword arguments:
+        file -- the path of the file, or a file object opened in binary mode
+
+        """
+        if isinstance(file, (str, bytes, os.PathLike)):
+            with open(file, "rb") as f:
+                yield from self.scan_file(f)
+
+            return
+
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError):
+            # Not a regular file, or an empty one, which can't be mapped
+            yield from self._scan_chunks(file)
+            return
+
+        with data:
+            yield from self._scan(data, 0, len(data), 0, 0)
+
+    def _scan_chunks(self, file):
+        """Scan a file a chunk at a time.
+
+        Each chunk is scanned along with the end of the one before, so that
+        candidates across the boundary are found whole.
+
+        Keyword arguments:
+        file -- a file object opened in binary mode
+
+        """
+        data = b""
+        base = 0  # The offset in the file of data[0]
+        start = 0  # Where in data the "@"s haven't been looked at yet
+        left = 0  # Where in data the last candidate ended
+
+        while True:
+            chunk = file.read(self.chunk_size)
+
+            if chunk:
+                data += chunk
+                # Leave the "@"s near the end for when there's enough after
+                stop = len(data) - WINDOW - 1
+            else:
+                stop = len(data)
+
+            if stop > start:
+                left = yield from self._scan(data, start, stop, left, base)
+                start = stop
+
+            if not chunk:
+                break
+
+            keep = max(start - WINDOW, 0)
+            data = data[keep:]
+            base += keep
+            start -= keep
+            left = max(left - keep, 0)
+
+    def _scan(self, data, start, stop, left, offset):
+        """Yield the candidates with an "@" from start up to stop.
+
+        Returns where the last candidate ended, or left if there were none.
+
+        Keyword arguments:
+        data   -- the text
+        start  -- where to start looking for an "@"
+        stop   -- where to stop looking for an "@"
+        left   -- how far back a local part can go
+        offset -- the offset in the whole text of data[0]
+
+        """
+        local_run = self.local_run
+        cache = self.cache
+        length = len(data)
+        match = AT.search(data, start, stop)
+
+        while match is not None:
+            i = match.start()
+            window = bytes(data[max(left, i - WINDOW) : i])[::-1]
+            run = local_run.match(window).end()
+
+            if run == WINDOW:
+                # Longer than any address could be
+                match = AT.search(data, i + 1, stop)
+                continue
+
+            # Leading dots are far more likely to be punctuation
+            while run and window[run - 1] == 0x2E:
+                run -= 1
+
+            domain = DOMAIN_RUN.match(data, i + 1, min(i + 1 + WINDOW, length))
+
+            if run == 0 or domain is None:
+                match = AT.search(data, i + 1, stop)
+                continue
+
+            s, e = i - run, domain.end()
+            candidate = bytes(data[s:e])
+            left = e
+            diagnosis = None if cache is None else cache.get(candidate)
+
+            if diagnosis is None:
+                diagnosis = self.validator.is_email(candidate, True)
+
+                if cache is not None:
+                    cache[candidate] = diagnosis
+
+            yield offset + s, candidate.decode(self.encoding, "replace"), diagnosis
+
+            match = AT.search(data, e, stop) if e < stop else None
+
+        return left
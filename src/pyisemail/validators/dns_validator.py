@@ -1,22 +1,58 @@
-import dns.exception
-import dns.resolver
-from dns.rdatatype import MX
-
+from pyisemail import ParsedAddress
 from pyisemail.diagnosis import DNSDiagnosis, RFC5321Diagnosis, ValidDiagnosis
 
 
 class DNSValidator(object):
+
+    # As a pipeline stage: a network round trip, which can at worst find a
+    # TLD with no records
+    cost = 1000
+    ceiling = max(
+        max(DNSDiagnosis.ERROR_CODES.values()),
+        RFC5321Diagnosis.ERROR_CODES["TLD"],
+        RFC5321Diagnosis.ERROR_CODES["TLDNUMERIC"],
+    )
+
+    def __init__(self, resolver=None):
+        """Create a validator.
+
+        Keyword arguments:
+        resolver --- the dns.resolver.Resolver to look records up with, e.g.
+                     one with a cache (default None, for dnspython's default
+                     resolver)
+
+        """
+        self.resolver = resolver
+
     def is_valid(self, domain, diagnose=False):
 
         """Check whether a domain has a valid MX or A record.
 
         Keyword arguments:
-        domain   --- the domain to check
+        domain   --- the domain to check, or a ParsedAddress
         diagnose --- flag to report a diagnosis or a boolean (default False)
 
         """
 
-        return_status = [ValidDiagnosis()]
+        # dnspython is slow to import, so only load it for a DNS check
+        import dns.exception
+        import dns.name
+        import dns.resolver
+        from dns.rdatatype import MX
+
+        if self.resolver is None:
+            resolve = dns.resolver.resolve
+        else:
+            resolve = self.resolver.resolve
+
+        if isinstance(domain, ParsedAddress):
+            # A domain literal has no labels, so split it as we would a string
+            labels = domain.labels or domain.domain.split(".")
+            domain = domain.domain
+        else:
+            labels = domain.split(".")
+
+        return_status = [ValidDiagnosis.get()]
         dns_checked = False
 
         # http://tools.ietf.org/html/rfc5321#section-2.3.5
@@ -38,7 +74,7 @@ class DNSValidator(object):
         # we will raise a warning because we didn't immediately find an MX
         # record.
         try:
-            records = dns.resolver.resolve(domain, MX)
+            records = resolve(domain, MX)
             dns_checked = True
 
             # Even if there's an MX record set we need to verify the preference
@@ -47,29 +83,29 @@ class DNSValidator(object):
             # https://www.rfc-editor.org/rfc/rfc7505.html#section-3
             if len(records) == 1:
                 if records[0].preference == 0 and len(records[0].exchange) <= 1:
-                    return_status.append(DNSDiagnosis("NULL_MX_RECORD"))
+                    return_status.append(DNSDiagnosis.get("NULL_MX_RECORD"))
         except (dns.resolver.NXDOMAIN, dns.name.NameTooLong):
             # Domain can't be found in DNS
-            return_status.append(DNSDiagnosis("NO_RECORD"))
+            return_status.append(DNSDiagnosis.get("NO_RECORD"))
 
             # Since dns.resolver gives more information than the PHP analog, we
             # can say that TLDs that throw an NXDOMAIN or NameTooLong error
             # have been checked
-            if len(domain.split(".")) == 1:
+            if len(labels) == 1:
                 dns_checked = True
         except dns.resolver.NoAnswer:
             # MX-record for domain can't be found
-            return_status.append(DNSDiagnosis("NO_MX_RECORD"))
+            return_status.append(DNSDiagnosis.get("NO_MX_RECORD"))
 
             try:
-                dns.resolver.resolve(domain)
+                resolve(domain)
             except dns.resolver.NoAnswer:
                 # No usable records for the domain can be found
-                return_status.append(DNSDiagnosis("NO_RECORD"))
+                return_status.append(DNSDiagnosis.get("NO_RECORD"))
         except dns.resolver.NoNameservers:
-            return_status.append(DNSDiagnosis("NO_NAMESERVERS"))
+            return_status.append(DNSDiagnosis.get("NO_NAMESERVERS"))
         except (dns.exception.Timeout, dns.resolver.Timeout):
-            return_status.append(DNSDiagnosis("DNS_TIMEDOUT"))
+            return_status.append(DNSDiagnosis.get("DNS_TIMEDOUT"))
 
         # Check for TLD addresses
         # -----------------------
@@ -104,16 +140,15 @@ class DNSValidator(object):
         #   component label to start with a digit even if it is not
         #   all-numeric.
         if not dns_checked:
-            atom_list = domain.split(".")
-            if len(atom_list) == 1:
-                return_status.append(RFC5321Diagnosis("TLD"))
+            if len(labels) == 1:
+                return_status.append(RFC5321Diagnosis.get("TLD"))
 
             try:
-                float(atom_list[len(atom_list) - 1][0])
-                return_status.append(RFC5321Diagnosis("TLDNUMERIC"))
+                float(labels[len(labels) - 1][0])
+                return_status.append(RFC5321Diagnosis.get("TLDNUMERIC"))
             except ValueError:
                 pass
 
         final_status = max(return_status)
 
-        return final_status if diagnose else final_status == ValidDiagnosis()
+        return final_status if diagnose else final_status == ValidDiagnosis.get()
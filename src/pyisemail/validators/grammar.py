@@ -0,0 +1,128 @@
+from pyisemail.utils import enum
+
+__all__ = [
+    "CLASS_TABLE",
+    "CONTROL_PICTURES",
+    "Char",
+    "CharClass",
+    "Context",
+    "to_char",
+]
+
+Char = enum(
+    AT="@",
+    BACKSLASH="\\",
+    DOT=".",
+    DQUOTE='"',
+    OPENPARENTHESIS="(",
+    CLOSEPARENTHESIS=")",
+    OPENSQBRACKET="[",
+    CLOSESQBRACKET="]",
+    HYPHEN="-",
+    COLON=":",
+    DOUBLECOLON="::",
+    SP=" ",
+    HTAB="\t",
+    CR="\r",
+    LF="\n",
+    IPV6TAG="IPv6:",
+    # US-ASCII visible characters not valid for atext
+    # (http:#tools.ietf.org/html/rfc5322#section-3.2.3)
+    SPECIALS='()<>[]:;@\\,."',
+)
+
+Context = enum(
+    LOCALPART=0, DOMAIN=1, LITERAL=2, COMMENT=3, FWS=4, QUOTEDSTRING=5, QUOTEDPAIR=6
+)
+
+# Every character is treated identically by the parser to the others in its
+# class, so the table-driven engine only ever looks at the class.
+CharClass = enum(
+    ATEXT=0,  # atext that is not a letter, digit or hyphen
+    LETDIG=1,  # ALPHA / DIGIT
+    HYPHEN=2,
+    DOT=3,
+    AT=4,
+    DQUOTE=5,
+    OPENPARENTHESIS=6,
+    CLOSEPARENTHESIS=7,
+    OPENSQBRACKET=8,
+    CLOSESQBRACKET=9,
+    BACKSLASH=10,
+    SPECIAL=11,  # The remaining specials: "<", ">", ":", ";" and ","
+    SP=12,
+    HTAB=13,
+    CR=14,
+    LF=15,
+    CTL=16,  # obs-NO-WS-CTL, except for US
+    US=17,  # US is obs-NO-WS-CTL but is not an obs-qp
+    NUL=18,
+    NONASCII=19,
+)
+
+# The test data represents control characters with their Unicode control
+# pictures (see to_char below)
+CONTROL_PICTURES = {9216 + o: o for o in range(0, 13 + 1)}
+
+
+def to_char(token):
+    """Transforms the ASCII control character symbols to their real char.
+
+    Note: If the token is not an ASCII control character symbol, just
+    return the token.
+
+    Keyword arguments:
+    token -- the token to transform
+
+    """
+    if ord(token) in range(9216, 9229 + 1):
+        token = chr(ord(token) - 9216)
+
+    return token
+
+
+def _classify(o):
+    """Find the CharClass for an octet.
+
+    Keyword arguments:
+    o -- the octet to classify
+
+    """
+    c = chr(o)
+
+    if o > 127:
+        return CharClass.NONASCII
+    elif "0" <= c <= "9" or "A" <= c <= "Z" or "a" <= c <= "z":
+        return CharClass.LETDIG
+    elif c in "<>:;,":
+        return CharClass.SPECIAL
+    elif o == 0:
+        return CharClass.NUL
+    elif o == 31:
+        return CharClass.US
+    elif o in (9, 10, 13, 32):
+        return {
+            Char.HTAB: CharClass.HTAB,
+            Char.LF: CharClass.LF,
+            Char.CR: CharClass.CR,
+            Char.SP: CharClass.SP,
+        }[c]
+    elif o < 32 or o == 127:
+        return CharClass.CTL
+    else:
+        return {
+            Char.HYPHEN: CharClass.HYPHEN,
+            Char.DOT: CharClass.DOT,
+            Char.AT: CharClass.AT,
+            Char.DQUOTE: CharClass.DQUOTE,
+            Char.OPENPARENTHESIS: CharClass.OPENPARENTHESIS,
+            Char.CLOSEPARENTHESIS: CharClass.CLOSEPARENTHESIS,
+            Char.OPENSQBRACKET: CharClass.OPENSQBRACKET,
+            Char.CLOSESQBRACKET: CharClass.CLOSESQBRACKET,
+            Char.BACKSLASH: CharClass.BACKSLASH,
+        }.get(c, CharClass.ATEXT)
+
+
+# A translation table from octets to their CharClass, for use with
+# bytes.translate
+CLASS_TABLE = bytes(_classify(o) for o in range(256))
@@ -1,20 +1,29 @@
+from pyisemail import ParsedAddress
 from pyisemail.diagnosis import GTLDDiagnosis, ValidDiagnosis
 
 
 class GTLDValidator(object):
+
+    # As a pipeline stage: a string check that can only ever report a gTLD
+    cost = 1
+    ceiling = GTLDDiagnosis.ERROR_CODES["GTLD"]
+
     def is_valid(self, domain, diagnose=False):
 
         """Check whether a domain is a gTLD.
 
         Keyword arguments:
-        domain   --- the domain to check
+        domain   --- the domain to check, or a ParsedAddress
         diagnose --- flag to report a diagnosis or a boolean (default False)
 
         """
 
+        if isinstance(domain, ParsedAddress):
+            domain = domain.domain
+
         if "." in domain:
-            d = ValidDiagnosis()
+            d = ValidDiagnosis.get()
         else:
-            d = GTLDDiagnosis("GTLD")
+            d = GTLDDiagnosis.get("GTLD")
 
         return d
@@ -0,0 +1,165 @@
+from pyisemail.validators.grammar import CLASS_TABLE, CONTROL_PICTURES
+from pyisemail.validators.grammar import CharClass as C
+from pyisemail.validators.grammar import Context
+from pyisemail.validators.table_parser import TableParser
+
+__all__ = ["IncrementalParser"]
+
+
+class IncrementalParser(TableParser):
+
+    """A TableParser that is fed an address a piece at a time.
+
+    Each piece is parsed as it arrives, picking up where the last one left
+    off, so the cost of keeping the diagnosis up to date is proportional to
+    the size of the piece rather than the whole address. Use checkpoint and
+    rewind to take back what was fed since a checkpoint, e.g. when someone
+    deletes characters as they type.
+
+    A trailing CR is held back until we know whether a LF follows it.
+
+    """
+
+    def __init__(self, diagnose=True, max_depth=None):
+        """Start with an empty address.
+
+        Keyword arguments:
+        diagnose  -- flag for whether the full diagnosis is wanted, rather
+                     than just a verdict (default True)
+        max_depth -- how deeply contexts may nest (default None, for no limit)
+
+        """
+        super(IncrementalParser, self).__init__(b"", diagnose, max_depth)
+        self.data = bytearray()
+        self.classes = bytearray()
+        self.empty = self.data[:0]
+
+    def feed(self, text):
+        """Append some text to the address and parse it.
+
+        Non-ASCII text is stored as UTF-8, which the parser diagnoses the
+        same way as the characters themselves.
+
+        Keyword arguments:
+        text -- the text to append, as a str or a bytes-like object
+
+        """
+        if isinstance(text, str):
+            if not text.isascii():
+                text = text.translate(CONTROL_PICTURES)
+
+            text = text.encode("utf-8")
+        else:
+            text = bytes(text)
+
+        self.data += text
+        self.classes += text.translate(CLASS_TABLE)
+        self.length = len(self.data)
+
+        return self.parse()
+
+    def parse(self):
+        """Parse whatever has been fed but not yet parsed."""
+        length = self.length
+
+        if length == 0 or self.classes[-1] != C.CR:
+            return super(IncrementalParser, self).parse()
+
+        self.length = length - 1
+        super(IncrementalParser, self).parse()
+        self.length = length
+
+        # A quoted pair takes the CR as it is, so there's no need to wait
+        if self.context == Context.QUOTEDPAIR and self.max_code <= self.limit:
+            super(IncrementalParser, self).parse()
+
+        return self
+
+    def final_status(self):
+        """Return the diagnosis of the address as it stands."""
+        if self.position == self.length or self.max_code > self.limit:
+            return super(IncrementalParser, self).final_status()
+
+        # See what the held back CR does to the address, then undo it
+        checkpoint = self.checkpoint()
+        super(IncrementalParser, self).parse()
+        final_status = super(IncrementalParser, self).final_status()
+        self.rewind(checkpoint)
+
+        return final_status
+
+    def checkpoint(self):
+        """Return an opaque snapshot of the parser to rewind to later.
+
+        Components only ever grow, so the snapshot just notes their size and
+        costs no more than the nesting depth and the number of diagnoses.
+
+        """
+        return (
+            self.length,
+            self.position,
+            set(self.return_status),
+            self.max_code,
+            self.context,
+            list(self.context_stack),
+            self.context_prior,
+            self.local_part,
+            len(self.local_part),
+            self.local_len,
+            self.domain,
+            len(self.domain),
+            self.domain_len,
+            self.literal,
+            len(self.literal),
+            self.element_count,
+            self.element_len,
+            self.hyphen_flag,
+            self.end_or_die,
+            self.prior_cr,
+            self.crlf_count,
+            self.crlf_end,
+        )
+
+    def rewind(self, checkpoint):
+        """Go back to a snapshot, forgetting everything fed since.
+
+        Checkpoints taken after the snapshot are no good afterward.
+
+        Keyword arguments:
+        checkpoint -- a snapshot from checkpoint
+
+        """
+        (
+            self.length,
+            self.position,
+            return_status,
+            self.max_code,
+            self.context,
+            context_stack,
+            self.context_prior,
+            self.local_part,
+            local_count,
+            self.local_len,
+            self.domain,
+            domain_count,
+            self.domain_len,
+            self.literal,
+            literal_count,
+            self.element_count,
+            self.element_len,
+            self.hyphen_flag,
+            self.end_or_die,
+            self.prior_cr,
+            self.crlf_count,
+            self.crlf_end,
+        ) = checkpoint
+
+        # Copy the containers that are changed in place, so that the same
+        # checkpoint can be rewound to again
+        self.return_status = set(return_status)
+        self.context_stack = list(context_stack)
+        del self.local_part[local_count:]
+        del self.domain[domain_count:]
+        del self.literal[literal_count:]
+        del self.data[self.length :]
+        del self.classes[self.length :]
@@ -0,0 +1,193 @@
+import re
+
+from pyisemail import ParsedAddress
+from pyisemail.diagnosis import (
+    BaseDiagnosis,
+    RFC5321Diagnosis,
+    RFC5322Diagnosis,
+)
+from pyisemail.utils import LRUCache
+from pyisemail.validators.grammar import Char
+
+__all__ = ["LiteralValidator"]
+
+# An IPv4 address at the end of the literal, which is either all of it or the
+# tail of an IPv6v4 address
+IPV4_LITERAL = re.compile(
+    r"\b(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.)"
+    r"{3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$"
+)
+# Colon-separated groups of up to four hex digits, where empty groups are
+# left for the "::" checks to judge. Matching the whole address in one pass
+# checks every group without splitting it into a list.
+IPV6_GROUPS = re.compile(r"[0-9A-Fa-f]{0,4}(?::[0-9A-Fa-f]{0,4})*")
+
+
+class LiteralValidator(object):
+
+    """Check the contents of a domain literal as an RFC 5321 address literal.
+
+    An address literal names a host rather than a mailbox, so every address
+    at that host carries the same one. Their diagnoses are kept in a bounded
+    cache, keyed on the text between the brackets.
+
+    """
+
+    def __init__(self, cache_size=128):
+        """Create a validator.
+
+        Keyword arguments:
+        cache_size -- how many address literals to remember the diagnoses of
+                      (default 128; None for no cache)
+
+        """
+        if cache_size is None:
+            self.cache = None
+        else:
+            self.cache = LRUCache(cache_size)
+
+    def is_valid(self, address_literal, diagnose=False):
+        """Check whether an address literal is valid.
+
+        Keyword arguments:
+        address_literal -- the text between the square brackets, or a
+                           ParsedAddress with a domain literal
+        diagnose        -- flag to report a diagnosis or a boolean (default
+                           False)
+
+        """
+        if isinstance(address_literal, ParsedAddress):
+            address_literal = address_literal.domain[1:-1]
+
+        d = max(self.diagnoses(address_literal))
+
+        if diagnose:
+            return d
+        else:
+            return d < BaseDiagnosis.CATEGORIES["THRESHOLD"]
+
+    def diagnoses(self, address_literal):
+        """Return the diagnoses of an address literal, as a tuple.
+
+        Keyword arguments:
+        address_literal -- the text between the square brackets
+
+        """
+        if self.cache is None:
+            return _diagnose(address_literal)
+
+        return_status = self.cache.get(address_literal)
+
+        if return_status is None:
+            return_status = _diagnose(address_literal)
+            self.cache[address_literal] = return_status
+
+        return return_status
+
+
+def _diagnose(address_literal):
+    """Diagnose an address literal without caching.
+
+    Keyword arguments:
+    address_literal -- the text between the square brackets
+
+    """
+
+    # http://tools.ietf.org/html/rfc5321#section-4.1.2
+    #   address-literal  = "[" ( IPv4-address-literal /
+    #                    IPv6-address-literal /
+    #                    General-address-literal ) "]"
+    #                    ; See Section 4.1.3
+    #
+    # http://tools.ietf.org/html/rfc5321#section-4.1.3
+    #   IPv4-address-literal  = Snum 3("."  Snum)
+    #
+    #   IPv6-address-literal  = "IPv6:" IPv6-addr
+    #
+    #   General-address-literal  = Standardized-tag ":" 1*dcontent
+    #
+    #   Standardized-tag  = Ldh-str
+    #                     ; Standardized-tag MUST be specified in a
+    #                     ; Standards-Track RFC and registered with IANA
+    #
+    #   dcontent     = %d33-90 / ; Printable US-ASCII
+    #                  %d94-126  ; excl. "[", "\", "]"
+    #
+    #   Snum         = 1*3DIGIT
+    #                ; representing a decimal integer value in the range 0-255
+    #
+    #   IPv6-addr    = IPv6-full / IPv6-comp / IPv6v4-full / IPv6v4-comp
+    #
+    #   IPv6-hex     = 1*4HEXDIG
+    #
+    #   IPv6-full    = IPv6-hex 7(":" IPv6-hex)
+    #
+    #   IPv6-comp    = [IPv6-hex *5(":" IPv6-hex)] "::"
+    #                  [IPv6-hex *5(":" IPv6-hex)]
+    #                ; The "::" represents at least 2 16-bit groups of zeros.
+    #                ; No more than 6 groups in addition to the "::" may be
+    #                ; present.
+    #
+    #   IPv6v4-full  = IPv6-hex 5(":" IPv6-hex) ":" IPv4-address-literal
+    #
+    #   IPv6v4-comp  = [IPv6-hex *3(":" IPv6-hex)] "::"
+    #                  [IPv6-hex *3(":" IPv6-hex) ":"]
+    #                  IPv4-address-literal
+    #                ; The "::" represents at least 2 16-bit groups of zeros.
+    #                ; No more than 4 groups in addition to the "::" and
+    #                ; IPv4-address-literal may be present.
+
+    # Extract IPv4 part from the end of the address-literal (if there is one)
+    match_ip = IPV4_LITERAL.search(address_literal)
+
+    if match_ip:
+        if match_ip.start() == 0:
+            # Nothing there except a valid IPv4 address
+            return (RFC5321Diagnosis.get("ADDRESSLITERAL"),)
+
+        # Convert IPv4 part to IPv6 format for further testing
+        address_literal = address_literal[: match_ip.start()] + "0:0"
+
+    if not address_literal.startswith(Char.IPV6TAG):
+        return (RFC5322Diagnosis.get("DOMAINLITERAL"),)
+
+    return_status = []
+    ipv6 = address_literal[5:]
+    max_groups = 8
+    # Revision 2.7: Daniel Marschall's new IPv6 testing strategy
+    grp_count = ipv6.count(Char.COLON) + 1
+    index = ipv6.find(Char.DOUBLECOLON)
+
+    if index == -1:
+        # We need exactly the right number of groups
+        if grp_count != max_groups:
+            return_status.append(RFC5322Diagnosis.get("IPV6_GRPCOUNT"))
+    else:
+        if index != ipv6.rfind(Char.DOUBLECOLON):
+            return_status.append(RFC5322Diagnosis.get("IPV6_2X2XCOLON"))
+        else:
+            if index in [0, len(ipv6) - 2]:
+                # RFC 4291 allows :: at the start or end of an address
+                # with 7 other groups in addition
+                max_groups += 1
+
+            if grp_count > max_groups:
+                return_status.append(RFC5322Diagnosis.get("IPV6_MAXGRPS"))
+            elif grp_count == max_groups:
+                # Eliding a single "::"
+                return_status.append(RFC5321Diagnosis.get("IPV6DEPRECATED"))
+
+    # Revision 2.7: Daniel Marschall's new IPv6 testing strategy
+    if ipv6.startswith(Char.COLON) and not ipv6.startswith(Char.DOUBLECOLON):
+        # Address starts with a single colon
+        return_status.append(RFC5322Diagnosis.get("IPV6_COLONSTRT"))
+    elif ipv6.endswith(Char.COLON) and not ipv6.endswith(Char.DOUBLECOLON):
+        # Address ends with a single colon
+        return_status.append(RFC5322Diagnosis.get("IPV6_COLONEND"))
+    elif IPV6_GROUPS.fullmatch(ipv6) is None:
+        # Check for unmatched characters
+        return_status.append(RFC5322Diagnosis.get("IPV6_BADCHAR"))
+    else:
+        return_status.append(RFC5321Diagnosis.get("ADDRESSLITERAL"))
+
+    return tuple(return_status)
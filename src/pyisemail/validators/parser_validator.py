@@ -1,7 +1,7 @@
 import re
 import sys
 
-from pyisemail import EmailValidator
+from pyisemail import EmailValidator, ParsedAddress
 from pyisemail.diagnosis import (
     BaseDiagnosis,
     CFWSDiagnosis,
@@ -11,55 +11,167 @@ from pyisemail.diagnosis import (
     RFC5322Diagnosis,
     ValidDiagnosis,
 )
-from pyisemail.utils import enum
+from pyisemail.utils import LRUCache
+from pyisemail.validators.grammar import Char, Context, to_char
+from pyisemail.validators.literal_validator import LiteralValidator
 
 __all__ = ["ParserValidator"]
 
-Char = enum(
-    AT="@",
-    BACKSLASH="\\",
-    DOT=".",
-    DQUOTE='"',
-    OPENPARENTHESIS="(",
-    CLOSEPARENTHESIS=")",
-    OPENSQBRACKET="[",
-    CLOSESQBRACKET="]",
-    HYPHEN="-",
-    COLON=":",
-    DOUBLECOLON="::",
-    SP=" ",
-    HTAB="\t",
-    CR="\r",
-    LF="\n",
-    IPV6TAG="IPv6:",
-    # US-ASCII visible characters not valid for atext
-    # (http:#tools.ietf.org/html/rfc5322#section-3.2.3)
-    SPECIALS='()<>[]:;@\\,."',
-)
-
-Context = enum(
-    LOCALPART=0, DOMAIN=1, LITERAL=2, COMMENT=3, FWS=4, QUOTEDSTRING=5, QUOTEDPAIR=6
+# http://tools.ietf.org/html/rfc5322#section-3.2.3
+#   dot-atom-text  =  1*atext *("." 1*atext)
+#
+# http://tools.ietf.org/html/rfc5321#section-4.1.2
+#   sub-domain     = Let-dig [Ldh-str]
+#
+# An address made of nothing but these is the overwhelmingly common case. It
+# cannot produce any diagnosis other than the length checks, so we can settle
+# it with a single precompiled match instead of the character-by-character
+# parse below.
+ATEXT = r"[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+"
+SUBDOMAIN = r"[A-Za-z0-9](?:[A-Za-z0-9-]*[A-Za-z0-9])?"
+DOT_ATOM_ADDRESS = re.compile(
+    r"(%s(?:\.%s)*)@(%s(?:\.%s)*)" % (ATEXT, ATEXT, SUBDOMAIN, SUBDOMAIN)
 )
+DOT_ATOM_ADDRESS_BYTES = re.compile(DOT_ATOM_ADDRESS.pattern.encode("ascii"))
 
 
-def to_char(token):
-    """Transforms the ASCII control character symbols to their real char.
+def fast_diagnose(address, pos=0, endpos=None):
+    """Diagnose a plain dot-atom address without the full parser.
 
-    Note: If the token is not an ASCII control character symbol, just
-    return the token.
+    Returns None when the address is anything other than a dot-atom local
+    part and an LDH domain, in which case the caller must use the full parser.
+    The length checks mirror the ones the parser applies to the same address.
 
     Keyword arguments:
-    token -- the token to transform
+    address -- address to check, as a str or a bytes-like object
+    pos     -- index of the first character of the address (default 0)
+    endpos  -- index after the last character of the address (default None,
+               for the end of the text)
+
+    """
+    if endpos is None:
+        endpos = len(address)
+
+    if isinstance(address, str):
+        match = DOT_ATOM_ADDRESS.fullmatch(address, pos, endpos)
+        dot = Char.DOT
+    else:
+        match = DOT_ATOM_ADDRESS_BYTES.fullmatch(address, pos, endpos)
+        dot = b"."
+
+    if match is None:
+        return None
+
+    local_part, domain = match.groups()
+    labels = domain.split(dot)
+    return_status = [ValidDiagnosis.get()]
+
+    # http://tools.ietf.org/html/rfc5321#section-4.5.3.1.1
+    if len(local_part) > 64:
+        return_status.append(RFC5322Diagnosis.get("LOCAL_TOOLONG"))
+
+    # http://tools.ietf.org/html/rfc1035#section-2.3.4
+    for label in labels[:-1]:
+        if len(label) > 63:
+            return_status.append(RFC5322Diagnosis.get("LABEL_TOOLONG"))
+            break
+
+    # http://tools.ietf.org/html/rfc5321#section-4.5.3.1.2
+    if len(domain) > 255:
+        return_status.append(RFC5322Diagnosis.get("DOMAIN_TOOLONG"))
+    # http://www.rfc-editor.org/errata_search.php?rfc=3696&eid=1690
+    elif endpos - pos > 254:
+        return_status.append(RFC5322Diagnosis.get("TOOLONG"))
+    elif len(labels[-1]) > 63:
+        return_status.append(RFC5322Diagnosis.get("LABEL_TOOLONG"))
+
+    return max(return_status)
+
+
+def _table_parser():
+    """Return the TableParser class, importing it on first use.
+
+    Building its transition tables takes longer than the rest of the package
+    does to import, and most callers only ever use the state machine.
 
     """
-    if ord(token) in range(9216, 9229 + 1):
-        token = chr(ord(token) - 9216)
+    global _TABLE_PARSER
+
+    if _TABLE_PARSER is None:
+        from pyisemail.validators.table_parser import TableParser
+
+        _TABLE_PARSER = TableParser
+
+    return _TABLE_PARSER
 
-    return token
+
+_TABLE_PARSER = None
 
 
 class ParserValidator(EmailValidator):
-    def is_email(self, address, diagnose=False):
+
+    ENGINES = ("state", "table")
+
+    def __init__(
+        self,
+        fast_path=True,
+        engine="state",
+        max_length=None,
+        max_depth=None,
+        domain_cache_size=None,
+        smtputf8=False,
+        literal_cache_size=128,
+    ):
+        """Create a parser.
+
+        Keyword arguments:
+        fast_path -- flag to settle plain dot-atom addresses without running
+                     the full parser (default True)
+        engine    -- the parser to use: "state" for the original state
+                     machine or "table" for the table-driven TableParser
+                     (default "state"). Bytes-like addresses always use the
+                     TableParser, which reads them without decoding.
+        max_length -- the longest input to parse at all; anything longer is
+                      diagnosed as INPUT_TOOLONG straight away (default None,
+                      for no limit)
+        max_depth  -- how deeply the parser may nest contexts; each
+                      comment, quoted string, quoted pair, folding white
+                      space or domain literal is one level, and going
+                      deeper is diagnosed as NESTING_TOODEEP (default None,
+                      for no limit)
+        domain_cache_size -- how many domains to remember the outcome of
+                             parsing, so that the table engine only has to
+                             parse the local part of addresses at a domain
+                             it has seen; needs the table engine (default
+                             None, for no cache)
+        smtputf8   -- flag to accept UTF-8 in the atoms and quoted strings of
+                      the local part, as RFC 6531 does for mail sent with
+                      the SMTPUTF8 extension. ASCII addresses are parsed
+                      exactly as before, while the rest always use the
+                      TableParser, which counts their length in octets
+                      (default False)
+        literal_cache_size -- how many address literals to remember the
+                              diagnoses of (default 128; None for no cache)
+
+        """
+        if engine not in self.ENGINES:
+            raise ValueError("Unknown parser engine: %r" % (engine,))
+        if domain_cache_size is not None and engine != "table":
+            raise ValueError("The domain cache needs the table engine")
+
+        self.fast_path = fast_path
+        self.engine = engine
+        self.max_length = max_length
+        self.max_depth = max_depth
+        self.smtputf8 = smtputf8
+        self.literal_validator = LiteralValidator(literal_cache_size)
+
+        if domain_cache_size is None:
+            self.domain_cache = None
+        else:
+            self.domain_cache = LRUCache(domain_cache_size)
+
+    def is_email(self, address, diagnose=False, as_code=False):
         """Check that an address address conforms to RFCs 5321, 5322 and others.
 
         More specifically, see the follow RFCs:
@@ -70,14 +182,127 @@ class ParserValidator(EmailValidator):
             * http://tools.ietf.org/html/rfc3696) (guidance only)
 
         Keyword arguments:
-        address    -- address to check.
+        address    -- address to check, as a str or a bytes-like object.
         diagnose   -- flag to report a diagnosis or a boolean (default False)
+        as_code    -- flag to report the integer code of the diagnosis instead
+                      (default False)
 
         """
 
-        threshold = BaseDiagnosis.CATEGORIES["VALID"]
-        return_status = [ValidDiagnosis()]
-        parse_data = {}
+        if as_code:
+            return self.is_email(address, True).code
+
+        if self.max_length is not None and len(address) > self.max_length:
+            if diagnose:
+                return InvalidDiagnosis.get("INPUT_TOOLONG")
+            else:
+                return False
+
+        if self.fast_path:
+            final_status = fast_diagnose(address)
+
+            if final_status is not None:
+                if diagnose:
+                    return final_status
+                else:
+                    return final_status < BaseDiagnosis.CATEGORIES["THRESHOLD"]
+
+        if self._use_table(address):
+            TableParser = _table_parser()
+
+            parser = TableParser(
+                address,
+                diagnose,
+                self.max_depth,
+                self.domain_cache,
+                self.smtputf8,
+                self.literal_validator,
+            )
+            final_status = parser.parse().final_status()
+
+            if diagnose:
+                return final_status
+            else:
+                return final_status < BaseDiagnosis.CATEGORIES["THRESHOLD"]
+
+        return self._parse(address, diagnose)[0]
+
+    def parse(self, address):
+        """Parse an address into a ParsedAddress.
+
+        The result carries the components of the address along with its
+        diagnosis, so that later checks don't have to split the address again.
+
+        Keyword arguments:
+        address -- address to parse, as a str or a bytes-like object
+
+        """
+        if self.max_length is not None and len(address) > self.max_length:
+            return ParsedAddress("", "", InvalidDiagnosis.get("INPUT_TOOLONG"))
+
+        if self.fast_path:
+            final_status = fast_diagnose(address)
+
+            if final_status is not None:
+                if not isinstance(address, str):
+                    # Dot-atom addresses are all ASCII
+                    address = bytes(address).decode("ascii")
+
+                local_part, _, domain = address.partition(Char.AT)
+
+                return ParsedAddress(local_part, domain, final_status)
+
+        if self._use_table(address):
+            TableParser = _table_parser()
+
+            parser = TableParser(
+                address,
+                max_depth=self.max_depth,
+                domain_cache=self.domain_cache,
+                smtputf8=self.smtputf8,
+                literal_validator=self.literal_validator,
+            ).parse()
+            final_status = parser.final_status()
+
+            return ParsedAddress(
+                parser.text(parser.local_part), parser.text(parser.domain), final_status
+            )
+
+        final_status, parse_data = self._parse(address, True)
+
+        return ParsedAddress(
+            parse_data[Context.LOCALPART], parse_data[Context.DOMAIN], final_status
+        )
+
+    def _use_table(self, address):
+        """Return whether an address needs the TableParser.
+
+        Keyword arguments:
+        address -- address to parse
+
+        """
+        if self.engine == "table" or not isinstance(address, str):
+            return True
+
+        # Only the TableParser knows about UTF-8
+        return self.smtputf8 and not address.isascii()
+
+    def _parse(self, address, diagnose):
+        """Run the state machine over an address.
+
+        Returns the result for is_email along with the parsed components.
+
+        Keyword arguments:
+        address  -- address to parse
+        diagnose -- flag to report a diagnosis or a boolean
+
+        """
+        threshold = BaseDiagnosis.CATEGORIES["THRESHOLD"]
+        # A set, so that repeated diagnoses don't make it grow with the input
+        return_status = {ValidDiagnosis.get()}
+        status_count = 1
+        final_status = ValidDiagnosis.get()
+        max_depth = self.max_depth
 
         # Parse the address into components, character by character
         raw_length = len(address)
@@ -86,12 +311,9 @@ class ParserValidator(EmailValidator):
         context_prior = Context.LOCALPART  # Where we just came from
         token = ""  # The current character
         token_prior = ""  # The previous character
-        parse_data[Context.LOCALPART] = ""  # The address' components
-        parse_data[Context.DOMAIN] = ""
-        atom_list = {
-            Context.LOCALPART: [""],
-            Context.DOMAIN: [""],
-        }  # The address' dot-atoms
+        local_part = ""  # The address' components
+        domain = ""
+        literal = ""
         element_count = 0
         element_len = 0
         hyphen_flag = False  # Hyphen cannot occur at the end of a subdomain
@@ -140,11 +362,11 @@ class ParserValidator(EmailValidator):
                         if element_len == 0:
                             # Comments are OK at the beginning of an element
                             if element_count == 0:
-                                return_status.append(CFWSDiagnosis("COMMENT"))
+                                return_status.add(CFWSDiagnosis.get("COMMENT"))
                             else:
-                                return_status.append(DeprecatedDiagnosis("COMMENT"))
+                                return_status.add(DeprecatedDiagnosis.get("COMMENT"))
                         else:
-                            return_status.append(CFWSDiagnosis("COMMENT"))
+                            return_status.add(CFWSDiagnosis.get("COMMENT"))
                             # We can't start a comment in the middle of an
                             # element, so this better be the end
                             end_or_die = True
@@ -155,17 +377,17 @@ class ParserValidator(EmailValidator):
                         if element_len == 0:
                             # Another dot, already? Fatal error
                             if element_count == 0:
-                                return_status.append(InvalidDiagnosis("DOT_START"))
+                                return_status.add(InvalidDiagnosis.get("DOT_START"))
                             else:
-                                return_status.append(
-                                    InvalidDiagnosis("CONSECUTIVEDOTS")
+                                return_status.add(
+                                    InvalidDiagnosis.get("CONSECUTIVEDOTS")
                                 )
                         else:
                             # The entire local-part can be a quoted string for
                             # RFC 5321. If it's just one atom that is quoted
                             # then it's an RFC 5322 obsolete form
                             if end_or_die:
-                                return_status.append(DeprecatedDiagnosis("LOCALPART"))
+                                return_status.add(DeprecatedDiagnosis.get("LOCALPART"))
 
                             # CFWS & quoted strings are OK again now we're at
                             # the beginning of an element (although they are
@@ -173,27 +395,25 @@ class ParserValidator(EmailValidator):
                             end_or_die = False
                             element_len = 0
                             element_count += 1
-                            parse_data[Context.LOCALPART] += token
-                            atom_list[Context.LOCALPART].append("")
+                            local_part += token
                     elif token == Char.DQUOTE:
                         if element_len == 0:
                             # The entire local-part can be a quoted string for
                             # RFC 5321. If it's just one atom that is quoted
                             # then it's an RFC 5322 obsolete form
                             if element_count == 0:
-                                return_status.append(RFC5321Diagnosis("QUOTEDSTRING"))
+                                return_status.add(RFC5321Diagnosis.get("QUOTEDSTRING"))
                             else:
-                                return_status.append(DeprecatedDiagnosis("LOCALPART"))
+                                return_status.add(DeprecatedDiagnosis.get("LOCALPART"))
 
-                            parse_data[Context.LOCALPART] += token
-                            atom_list[Context.LOCALPART][element_count] += token
+                            local_part += token
                             element_len += 1
                             end_or_die = True
                             context_stack.append(context)
                             context = Context.QUOTEDSTRING
                         else:
                             # Fatal error
-                            return_status.append(InvalidDiagnosis("EXPECTING_ATEXT"))
+                            return_status.add(InvalidDiagnosis.get("EXPECTING_ATEXT"))
                     # Folding White Space (FWS)
                     elif token in [Char.CR, Char.SP, Char.HTAB]:
                         # Skip simulates the use of ++ operator if the latter
@@ -205,14 +425,14 @@ class ParserValidator(EmailValidator):
                                 i + 1 == raw_length
                                 or to_char(address[i + 1]) != Char.LF
                             ):
-                                return_status.append(InvalidDiagnosis("CR_NO_LF"))
+                                return_status.add(InvalidDiagnosis.get("CR_NO_LF"))
                                 break
 
                         if element_len == 0:
                             if element_count == 0:
-                                return_status.append(CFWSDiagnosis("FWS"))
+                                return_status.add(CFWSDiagnosis.get("FWS"))
                             else:
-                                return_status.append(DeprecatedDiagnosis("FWS"))
+                                return_status.add(DeprecatedDiagnosis.get("FWS"))
                         else:
                             # We can't start FWS in the middle of an element,
                             # so this better be the end
@@ -225,22 +445,19 @@ class ParserValidator(EmailValidator):
                     elif token == Char.AT:
                         # At this point we should have a valid local-part
                         if len(context_stack) != 1:  # pragma: no cover
-                            if diagnose:
-                                return InvalidDiagnosis("BAD_PARSE")
-                            else:
-                                return False
+                            return_status.add(InvalidDiagnosis.get("BAD_PARSE"))
 
-                        if parse_data[Context.LOCALPART] == "":
+                        if local_part == "":
                             # Fatal error
-                            return_status.append(InvalidDiagnosis("NOLOCALPART"))
+                            return_status.add(InvalidDiagnosis.get("NOLOCALPART"))
                         elif element_len == 0:
                             # Fatal error
-                            return_status.append(InvalidDiagnosis("DOT_END"))
+                            return_status.add(InvalidDiagnosis.get("DOT_END"))
                         # http://tools.ietf.org/html/rfc5321#section-4.5.3.1.1
                         #   The maximum total length of a user name or other
                         #   local-part is 64 octets.
-                        elif len(parse_data[Context.LOCALPART]) > 64:
-                            return_status.append(RFC5322Diagnosis("LOCAL_TOOLONG"))
+                        elif len(local_part) > 64:
+                            return_status.add(RFC5322Diagnosis.get("LOCAL_TOOLONG"))
                         # http://tools.ietf.org/html/rfc5322#section-3.4.1
                         #   Comments and folding white space
                         #   SHOULD NOT be used around the "@" in the addr-spec.
@@ -254,11 +471,11 @@ class ParserValidator(EmailValidator):
                         #    the case carefully weighed before implementing any
                         #    behavior described with this label.
                         elif context_prior in [Context.COMMENT, Context.FWS]:
-                            return_status.append(DeprecatedDiagnosis("CFWS_NEAR_AT"))
+                            return_status.add(DeprecatedDiagnosis.get("CFWS_NEAR_AT"))
 
                         # Clear everything down for the domain parsing
                         context = Context.DOMAIN
-                        context_stack = []
+                        context_stack = [context]
                         element_count = 0
                         element_len = 0
                         # CFWS can only appear at the end of the element
@@ -281,27 +498,25 @@ class ParserValidator(EmailValidator):
                             # We have encountered atext where it is no longer
                             # valid
                             if context_prior in [Context.COMMENT, Context.FWS]:
-                                return_status.append(
-                                    InvalidDiagnosis("ATEXT_AFTER_CFWS")
+                                return_status.add(
+                                    InvalidDiagnosis.get("ATEXT_AFTER_CFWS")
                                 )
                             elif context_prior == Context.QUOTEDSTRING:
-                                return_status.append(InvalidDiagnosis("ATEXT_AFTER_QS"))
+                                return_status.add(
+                                    InvalidDiagnosis.get("ATEXT_AFTER_QS")
+                                )
                             else:  # pragma: no cover
-                                if diagnose:
-                                    return InvalidDiagnosis("BAD_PARSE")
-                                else:
-                                    return False
+                                return_status.add(InvalidDiagnosis.get("BAD_PARSE"))
                         else:
                             context_prior = context
                             o = ord(token)
 
                             if o < 33 or o > 126 or o == 10 or token in Char.SPECIALS:
-                                return_status.append(
-                                    InvalidDiagnosis("EXPECTING_ATEXT")
+                                return_status.add(
+                                    InvalidDiagnosis.get("EXPECTING_ATEXT")
                                 )
 
-                            parse_data[Context.LOCALPART] += token
-                            atom_list[Context.LOCALPART][element_count] += token
+                            local_part += token
                             element_len += 1
                 # -------------------------------------------------------
                 # Domain
@@ -363,13 +578,13 @@ class ParserValidator(EmailValidator):
                             # obs-domain
                             # (http://tools.ietf.org/html/rfc5322#section-3.4.1)
                             if element_count == 0:
-                                return_status.append(
-                                    DeprecatedDiagnosis("CFWS_NEAR_AT")
+                                return_status.add(
+                                    DeprecatedDiagnosis.get("CFWS_NEAR_AT")
                                 )
                             else:
-                                return_status.append(DeprecatedDiagnosis("COMMENT"))
+                                return_status.add(DeprecatedDiagnosis.get("COMMENT"))
                         else:
-                            return_status.append(CFWSDiagnosis("COMMENT"))
+                            return_status.add(CFWSDiagnosis.get("COMMENT"))
                             # We can't start a comment in the middle of an
                             # element, so this better be the end
                             end_or_die = True
@@ -381,14 +596,14 @@ class ParserValidator(EmailValidator):
                         if element_len == 0:
                             # Another dot, already? Fatal error
                             if element_count == 0:
-                                return_status.append(InvalidDiagnosis("DOT_START"))
+                                return_status.add(InvalidDiagnosis.get("DOT_START"))
                             else:
-                                return_status.append(
-                                    InvalidDiagnosis("CONSECUTIVEDOTS")
+                                return_status.add(
+                                    InvalidDiagnosis.get("CONSECUTIVEDOTS")
                                 )
                         elif hyphen_flag:
                             # Previous subdomain ended in a hyphen. Fatal error
-                            return_status.append(InvalidDiagnosis("DOMAINHYPHENEND"))
+                            return_status.add(InvalidDiagnosis.get("DOMAINHYPHENEND"))
                         else:
                             # Nowhere in RFC 5321 does it say explicitly that
                             # the domain part of a Mailbox must be a valid
@@ -405,29 +620,27 @@ class ParserValidator(EmailValidator):
                             # http://tools.ietf.org/html/rfc1035#section-2.3.4
                             # labels         63 octets or less
                             if element_len > 63:
-                                return_status.append(RFC5322Diagnosis("LABEL_TOOLONG"))
+                                return_status.add(RFC5322Diagnosis.get("LABEL_TOOLONG"))
 
                             # CFWS is OK again now we're at the beginning of an
                             # element (although it may be obsolete CFWS)
                             end_or_die = False
                             element_len = 0
                             element_count += 1
-                            atom_list[Context.DOMAIN].append("")
-                            parse_data[Context.DOMAIN] += token
+                            domain += token
                     # Domain literal
                     elif token == Char.OPENSQBRACKET:
-                        if parse_data[Context.DOMAIN] == "":
+                        if domain == "":
                             # Domain literal must be the only component
                             end_or_die = True
                             element_len += 1
                             context_stack.append(context)
                             context = Context.LITERAL
-                            parse_data[Context.DOMAIN] += token
-                            atom_list[Context.DOMAIN][element_count] += token
-                            parse_data["literal"] = ""
+                            domain += token
+                            literal = ""
                         else:
                             # Fatal error
-                            return_status.append(InvalidDiagnosis("EXPECTING_ATEXT"))
+                            return_status.add(InvalidDiagnosis.get("EXPECTING_ATEXT"))
 
                     # Folding White Space (FWS)
                     elif token in [Char.CR, Char.SP, Char.HTAB]:
@@ -440,18 +653,18 @@ class ParserValidator(EmailValidator):
                                 to_char(address[i + 1]) != Char.LF
                             ):
                                 # Fatal error
-                                return_status.append(InvalidDiagnosis("CR_NO_LF"))
+                                return_status.add(InvalidDiagnosis.get("CR_NO_LF"))
                                 break
 
                         if element_len == 0:
                             if element_count == 0:
-                                return_status.append(
-                                    DeprecatedDiagnosis("CFWS_NEAR_AT")
+                                return_status.add(
+                                    DeprecatedDiagnosis.get("CFWS_NEAR_AT")
                                 )
                             else:
-                                return_status.append(DeprecatedDiagnosis("FWS"))
+                                return_status.add(DeprecatedDiagnosis.get("FWS"))
                         else:
-                            return_status.append(CFWSDiagnosis("FWS"))
+                            return_status.add(CFWSDiagnosis.get("FWS"))
                             # We can't start FWS in the middle of an element,
                             # so this better be the end
                             end_or_die = True
@@ -488,18 +701,15 @@ class ParserValidator(EmailValidator):
                             # We have encountered atext where it is no longer
                             # valid
                             if context_prior in [Context.COMMENT, Context.FWS]:
-                                return_status.append(
-                                    InvalidDiagnosis("ATEXT_AFTER_CFWS")
+                                return_status.add(
+                                    InvalidDiagnosis.get("ATEXT_AFTER_CFWS")
                                 )
                             elif context_prior == Context.LITERAL:
-                                return_status.append(
-                                    InvalidDiagnosis("ATEXT_AFTER_DOMLIT")
+                                return_status.add(
+                                    InvalidDiagnosis.get("ATEXT_AFTER_DOMLIT")
                                 )
                             else:  # pragma: no cover
-                                if diagnose:
-                                    return InvalidDiagnosis("BAD_PARSE")
-                                else:
-                                    return False
+                                return_status.add(InvalidDiagnosis.get("BAD_PARSE"))
 
                         o = ord(token)
                         # Assume this token isn't a hyphen unless we discover
@@ -508,24 +718,23 @@ class ParserValidator(EmailValidator):
 
                         if o < 33 or o > 126 or token in Char.SPECIALS:
                             # Fatal error
-                            return_status.append(InvalidDiagnosis("EXPECTING_ATEXT"))
+                            return_status.add(InvalidDiagnosis.get("EXPECTING_ATEXT"))
                         elif token == Char.HYPHEN:
                             if element_len == 0:
                                 # Hyphens can't be at the beginning of a
                                 # subdomain
                                 # Fatal error
-                                return_status.append(
-                                    InvalidDiagnosis("DOMAINHYPHENSTART")
+                                return_status.add(
+                                    InvalidDiagnosis.get("DOMAINHYPHENSTART")
                                 )
 
                             hyphen_flag = True
                         elif not (47 < o < 58 or 64 < o < 91 or 96 < o < 123):
                             # Not an RFC 5321 subdomain, but still OK by RFC
                             # 5322
-                            return_status.append(RFC5322Diagnosis("DOMAIN"))
+                            return_status.add(RFC5322Diagnosis.get("DOMAIN"))
 
-                        parse_data[Context.DOMAIN] += token
-                        atom_list[Context.DOMAIN][element_count] += token
+                        domain += token
                         element_len += 1
                 # -------------------------------------------------------
                 # Domain literal
@@ -547,156 +756,18 @@ class ParserValidator(EmailValidator):
                         if max(return_status) < BaseDiagnosis.CATEGORIES["DEPREC"]:
                             # Could be a valid RFC 5321 address literal, so
                             # let's check
-                            #
-                            # http://tools.ietf.org/html/rfc5321#section-4.1.2
-                            #   address-literal  = "[" ( IPv4-address-literal /
-                            #                    IPv6-address-literal /
-                            #                    General-address-literal ) "]"
-                            #                    ; See Section 4.1.3
-                            #
-                            # http://tools.ietf.org/html/rfc5321#section-4.1.3
-                            #   IPv4-address-literal  = Snum 3("."  Snum)
-                            #
-                            #   IPv6-address-literal  = "IPv6:" IPv6-addr
-                            #
-                            #   General-address-literal  = Standardized-tag ":"
-                            #                              1*dcontent
-                            #
-                            #   Standardized-tag  = Ldh-str
-                            #                     ; Standardized-tag MUST be
-                            #                     ; specified in a
-                            #                     ; Standards-Track RFC and
-                            #                     ; registered with IANA
-                            #
-                            #   dcontent     = %d33-90 / ; Printable US-ASCII
-                            #                  %d94-126  ; excl. "[", "\", "]"
-                            #
-                            #   Snum         = 1*3DIGIT
-                            #                ; representing a decimal integer
-                            #                ; value in the range 0-255
-                            #
-                            #   IPv6-addr    = IPv6-full / IPv6-comp /
-                            #                  IPv6v4-full / IPv6v4-comp
-                            #
-                            #   IPv6-hex     = 1*4HEXDIG
-                            #
-                            #   IPv6-full    = IPv6-hex 7(":" IPv6-hex)
-                            #
-                            #   IPv6-comp    = [IPv6-hex *5(":" IPv6-hex)]
-                            #                  "::"
-                            #                  [IPv6-hex *5(":" IPv6-hex)]
-                            #                ; The "::" represents at least 2
-                            #                ; 16-bit groups of zeros. No more
-                            #                ; than 6 groups in addition to
-                            #                ; the "::" may be present.
-                            #
-                            #   IPv6v4-full  = IPv6-hex 5(":" IPv6-hex) ":"
-                            #                  IPv4-address-literal
-                            #
-                            #   IPv6v4-comp  = [IPv6-hex *3(":" IPv6-hex)]
-                            #                  "::"
-                            #                  [IPv6-hex *3(":" IPv6-hex) ":"]
-                            #                  IPv4-address-literal
-                            #                ; The "::" represents at least 2
-                            #                ; 16-bit groups of zeros. No more
-                            #                ; than 4 groups in addition to
-                            #                ; the "::" and
-                            #                ; IPv4-address-literal may be
-                            #                ; present.
-
-                            max_groups = 8
-                            index = False
-                            address_literal = parse_data["literal"]
-
-                            # Extract IPv4 part from the end of the
-                            # address-literal (if there is one)
-                            regex = (
-                                r"\b(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.)"
-                                r"{3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$"
+                            return_status.update(
+                                self.literal_validator.diagnoses(literal)
                             )
-                            match_ip = re.search(regex, address_literal)
-                            if match_ip:
-                                index = address_literal.rfind(match_ip.group(0))
-                                if index != 0:
-                                    # Convert IPv4 part to IPv6 format for
-                                    # further testing
-                                    address_literal = address_literal[0:index] + "0:0"
-
-                            if index == 0 and index is not False:
-                                # Nothing there except a valid IPv4 address
-                                return_status.append(RFC5321Diagnosis("ADDRESSLITERAL"))
-                            elif not address_literal.startswith(Char.IPV6TAG):
-                                return_status.append(RFC5322Diagnosis("DOMAINLITERAL"))
-                            else:
-                                ipv6 = address_literal[5:]
-                                # Revision 2.7: Daniel Marschall's new IPv6
-                                # testing strategy
-                                match_ip = ipv6.split(Char.COLON)
-                                grp_count = len(match_ip)
-                                index = ipv6.find(Char.DOUBLECOLON)
-
-                                if index == -1:
-                                    # We need exactly the right number of
-                                    # groups
-                                    if grp_count != max_groups:
-                                        return_status.append(
-                                            RFC5322Diagnosis("IPV6_GRPCOUNT")
-                                        )
-                                else:
-                                    if index != ipv6.rfind(Char.DOUBLECOLON):
-                                        return_status.append(
-                                            RFC5322Diagnosis("IPV6_2X2XCOLON")
-                                        )
-                                    else:
-                                        if index in [0, len(ipv6) - 2]:
-                                            # RFC 4291 allows :: at the start
-                                            # or end of an address with 7 other
-                                            # groups in addition
-                                            max_groups += 1
-
-                                        if grp_count > max_groups:
-                                            return_status.append(
-                                                RFC5322Diagnosis("IPV6_MAXGRPS")
-                                            )
-                                        elif grp_count == max_groups:
-                                            # Eliding a single "::"
-                                            return_status.append(
-                                                RFC5321Diagnosis("IPV6DEPRECATED")
-                                            )
-
-                                # Revision 2.7: Daniel Marschall's new IPv6
-                                # testing strategy
-                                if ipv6[0] == Char.COLON and ipv6[1] != Char.COLON:
-                                    # Address starts with a single colon
-                                    return_status.append(
-                                        RFC5322Diagnosis("IPV6_COLONSTRT")
-                                    )
-                                elif ipv6[-1] == Char.COLON and ipv6[-2] != Char.COLON:
-                                    # Address ends with a single colon
-                                    return_status.append(
-                                        RFC5322Diagnosis("IPV6_COLONEND")
-                                    )
-                                elif [
-                                    re.match(r"^[0-9A-Fa-f]{0,4}$", i) for i in match_ip
-                                ].count(None) != 0:
-                                    # Check for unmatched characters
-                                    return_status.append(
-                                        RFC5322Diagnosis("IPV6_BADCHAR")
-                                    )
-                                else:
-                                    return_status.append(
-                                        RFC5321Diagnosis("ADDRESSLITERAL")
-                                    )
                         else:
-                            return_status.append(RFC5322Diagnosis("DOMAINLITERAL"))
+                            return_status.add(RFC5322Diagnosis.get("DOMAINLITERAL"))
 
-                        parse_data[Context.DOMAIN] += token
-                        atom_list[Context.DOMAIN][element_count] += token
+                        domain += token
                         element_len += 1
                         context_prior = context
                         context = context_stack.pop()
                     elif token == Char.BACKSLASH:
-                        return_status.append(RFC5322Diagnosis("DOMLIT_OBSDTEXT"))
+                        return_status.add(RFC5322Diagnosis.get("DOMLIT_OBSDTEXT"))
                         context_stack.append(context)
                         context = Context.QUOTEDPAIR
                     # Folding White Space (FWS)
@@ -710,10 +781,10 @@ class ParserValidator(EmailValidator):
                                 i + 1 == raw_length
                                 or to_char(address[i + 1]) != Char.LF
                             ):
-                                return_status.append(InvalidDiagnosis("CR_NO_LF"))
+                                return_status.add(InvalidDiagnosis.get("CR_NO_LF"))
                                 break
 
-                        return_status.append(CFWSDiagnosis("FWS"))
+                        return_status.add(CFWSDiagnosis.get("FWS"))
 
                         context_stack.append(context)
                         context = Context.FWS
@@ -738,14 +809,13 @@ class ParserValidator(EmailValidator):
                         # CR, LF, SP & HTAB have already been parsed above
                         if o > 127 or o == 0 or token == Char.OPENSQBRACKET:
                             # Fatal error
-                            return_status.append(InvalidDiagnosis("EXPECTING_DTEXT"))
+                            return_status.add(InvalidDiagnosis.get("EXPECTING_DTEXT"))
                             break
                         elif o < 33 or o == 127:
-                            return_status.append(RFC5322Diagnosis("DOMLIT_OBSDTEXT"))
+                            return_status.add(RFC5322Diagnosis.get("DOMLIT_OBSDTEXT"))
 
-                        parse_data["literal"] += token
-                        parse_data[Context.DOMAIN] += token
-                        atom_list[Context.DOMAIN][element_count] += token
+                        literal += token
+                        domain += token
                         element_len += 1
                 # -------------------------------------------------------
                 # Quoted string
@@ -775,7 +845,7 @@ class ParserValidator(EmailValidator):
                                 i + 1 == raw_length
                                 or to_char(address[i + 1]) != Char.LF
                             ):
-                                return_status.append(InvalidDiagnosis("CR_NO_LF"))
+                                return_status.add(InvalidDiagnosis.get("CR_NO_LF"))
                                 break
 
                         # http://tools.ietf.org/html/rfc5322#section-3.2.2
@@ -788,18 +858,16 @@ class ParserValidator(EmailValidator):
                         #   the CRLF in any FWS/CFWS that appears within the
                         #   quoted string [is] semantically "invisible" and
                         #   therefore not part of the quoted-string
-                        parse_data[Context.LOCALPART] += Char.SP
-                        atom_list[Context.LOCALPART][element_count] += Char.SP
+                        local_part += Char.SP
                         element_len += 1
 
-                        return_status.append(CFWSDiagnosis("FWS"))
+                        return_status.add(CFWSDiagnosis.get("FWS"))
                         context_stack.append(context)
                         context = Context.FWS
                         token_prior = token
                     # End of quoted string
                     elif token == Char.DQUOTE:
-                        parse_data[Context.LOCALPART] += token
-                        atom_list[Context.LOCALPART][element_count] += token
+                        local_part += token
                         element_len += 1
                         context_prior = context
                         context = context_stack.pop()
@@ -823,12 +891,11 @@ class ParserValidator(EmailValidator):
 
                         if o > 127 or o == 0 or o == 10:
                             # Fatal error
-                            return_status.append(InvalidDiagnosis("EXPECTING_QTEXT"))
+                            return_status.add(InvalidDiagnosis.get("EXPECTING_QTEXT"))
                         elif o < 32 or o == 127:
-                            return_status.append(DeprecatedDiagnosis("QTEXT"))
+                            return_status.add(DeprecatedDiagnosis.get("QTEXT"))
 
-                        parse_data[Context.LOCALPART] += token
-                        atom_list[Context.LOCALPART][element_count] += token
+                        local_part += token
                         element_len += 1
                 # -------------------------------------------------------
                 # Quoted pair
@@ -856,10 +923,10 @@ class ParserValidator(EmailValidator):
 
                     if o > 127:
                         # Fatal error
-                        return_status.append(InvalidDiagnosis("EXPECTING_QPAIR"))
+                        return_status.add(InvalidDiagnosis.get("EXPECTING_QPAIR"))
                     elif (o < 31 and o != 9) or o == 127:
                         # SP & HTAB are allowed
-                        return_status.append(DeprecatedDiagnosis("QP"))
+                        return_status.add(DeprecatedDiagnosis.get("QP"))
 
                     # At this point we know where this qpair occurred so
                     # we could check to see if the character actually
@@ -874,22 +941,17 @@ class ParserValidator(EmailValidator):
                     if context == Context.COMMENT:
                         pass
                     elif context == Context.QUOTEDSTRING:
-                        parse_data[Context.LOCALPART] += token
-                        atom_list[Context.LOCALPART][element_count] += token
+                        local_part += token
                         # The maximum sizes specified by RFC 5321 are octet
                         # counts, so we must include the backslash
                         element_len += 2
                     elif context == Context.LITERAL:
-                        parse_data[Context.DOMAIN] += token
-                        atom_list[Context.DOMAIN][element_count] += token
+                        domain += token
                         # The maximum sizes specified by RFC 5321 are octet
                         # counts, so we must include the backslash
                         element_len += 2
                     else:  # pragma: no cover
-                        if diagnose:
-                            return InvalidDiagnosis("BAD_PARSE")
-                        else:
-                            return False
+                        return_status.add(InvalidDiagnosis.get("BAD_PARSE"))
                 # -------------------------------------------------------
                 # Comment
                 # -------------------------------------------------------
@@ -923,10 +985,10 @@ class ParserValidator(EmailValidator):
                                 i + 1 == raw_length
                                 or to_char(address[i + 1]) != Char.LF
                             ):
-                                return_status.append(InvalidDiagnosis("CR_NO_LF"))
+                                return_status.add(InvalidDiagnosis.get("CR_NO_LF"))
                                 break
 
-                        return_status.append(CFWSDiagnosis("FWS"))
+                        return_status.add(CFWSDiagnosis.get("FWS"))
 
                         context_stack.append(context)
                         context = Context.FWS
@@ -952,10 +1014,10 @@ class ParserValidator(EmailValidator):
 
                         if o > 127 or o == 0 or o == 10:
                             # Fatal error
-                            return_status.append(InvalidDiagnosis("EXPECTING_CTEXT"))
+                            return_status.add(InvalidDiagnosis.get("EXPECTING_CTEXT"))
                             break
                         elif o < 32 or o == 127:
-                            return_status.append(DeprecatedDiagnosis("CTEXT"))
+                            return_status.add(DeprecatedDiagnosis.get("CTEXT"))
 
                 # -------------------------------------------------------
                 # Folding White Space (FWS)
@@ -979,14 +1041,14 @@ class ParserValidator(EmailValidator):
                     if token_prior == Char.CR:
                         if token == Char.CR:
                             # Fatal error
-                            return_status.append(InvalidDiagnosis("FWS_CRLF_X2"))
+                            return_status.add(InvalidDiagnosis.get("FWS_CRLF_X2"))
                             break
 
                         if crlf_count != -1:
                             crlf_count += 1
                             if crlf_count > 1:
                                 # Multiple folds = obsolete FWS
-                                return_status.append(DeprecatedDiagnosis("FWS"))
+                                return_status.add(DeprecatedDiagnosis.get("FWS"))
                         else:
                             crlf_count = 1
 
@@ -996,14 +1058,14 @@ class ParserValidator(EmailValidator):
                         skip = True
 
                         if i + 1 == raw_length or to_char(address[i + 1]) != Char.LF:
-                            return_status.append(InvalidDiagnosis("CR_NO_LF"))
+                            return_status.add(InvalidDiagnosis.get("CR_NO_LF"))
                             break
                     elif token in [Char.SP, Char.HTAB]:
                         pass
                     else:
                         if token_prior == Char.CR:
                             # Fatal error
-                            return_status.append(InvalidDiagnosis("FWS_CRLF_END"))
+                            return_status.add(InvalidDiagnosis.get("FWS_CRLF_END"))
                             break
 
                         if crlf_count != -1:
@@ -1022,45 +1084,57 @@ class ParserValidator(EmailValidator):
                 # A context we aren't expecting
                 # -------------------------------------------------------
                 else:  # pragma: no cover
-                    if diagnose:
-                        return InvalidDiagnosis("BAD_PARSE")
-                    else:
-                        return False
+                    return_status.add(InvalidDiagnosis.get("BAD_PARSE"))
+
+            # Only nested comments can keep the stack growing
+            if max_depth is not None and len(context_stack) > max_depth + 1:
+                return_status.add(InvalidDiagnosis.get("NESTING_TOODEEP"))
+
+            # There are only so many diagnoses, so this is rarely recomputed
+            if len(return_status) != status_count:
+                status_count = len(return_status)
+                final_status = max(return_status)
 
             # No point in going on if we've got a fatal error
-            if max(return_status) > BaseDiagnosis.CATEGORIES["RFC5322"]:
+            if final_status > BaseDiagnosis.CATEGORIES["RFC5322"]:
                 break
 
+            # Nor, if all we need is a verdict, once the address is invalid
+            if not diagnose and final_status.code >= threshold:
+                break
+
+        parse_data = {Context.LOCALPART: local_part, Context.DOMAIN: domain}
+
         # Some simple final tests
         if max(return_status) < BaseDiagnosis.CATEGORIES["RFC5322"]:
             if context == Context.QUOTEDSTRING:
                 # Fatal error
-                return_status.append(InvalidDiagnosis("UNCLOSEDQUOTEDSTR"))
+                return_status.add(InvalidDiagnosis.get("UNCLOSEDQUOTEDSTR"))
             elif context == Context.QUOTEDPAIR:
                 # Fatal error
-                return_status.append(InvalidDiagnosis("BACKSLASHEND"))
+                return_status.add(InvalidDiagnosis.get("BACKSLASHEND"))
             elif context == Context.COMMENT:
                 # Fatal error
-                return_status.append(InvalidDiagnosis("UNCLOSEDCOMMENT"))
+                return_status.add(InvalidDiagnosis.get("UNCLOSEDCOMMENT"))
             elif context == Context.LITERAL:
                 # Fatal error
-                return_status.append(InvalidDiagnosis("UNCLOSEDDOMLIT"))
+                return_status.add(InvalidDiagnosis.get("UNCLOSEDDOMLIT"))
             elif token == Char.CR:
                 # Fatal error
-                return_status.append(InvalidDiagnosis("FWS_CRLF_END"))
-            elif parse_data[Context.DOMAIN] == "":
+                return_status.add(InvalidDiagnosis.get("FWS_CRLF_END"))
+            elif domain == "":
                 # Fatal error
-                return_status.append(InvalidDiagnosis("NODOMAIN"))
+                return_status.add(InvalidDiagnosis.get("NODOMAIN"))
             elif element_len == 0:
                 # Fatal error
-                return_status.append(InvalidDiagnosis("DOT_END"))
+                return_status.add(InvalidDiagnosis.get("DOT_END"))
             elif hyphen_flag:
                 # Fatal error
-                return_status.append(InvalidDiagnosis("DOMAINHYPHENEND"))
+                return_status.add(InvalidDiagnosis.get("DOMAINHYPHENEND"))
             # http://tools.ietf.org/html/rfc5321#section-4.5.3.1.2
             # The maximum total length of a domain name or number is 255 octets
-            elif len(parse_data[Context.DOMAIN]) > 255:
-                return_status.append(RFC5322Diagnosis("DOMAIN_TOOLONG"))
+            elif len(domain) > 255:
+                return_status.add(RFC5322Diagnosis.get("DOMAIN_TOOLONG"))
             # http://tools.ietf.org/html/rfc5321#section-4.1.2
             #   Forward-path   = Path
             #
@@ -1080,31 +1154,25 @@ class ParserValidator(EmailValidator):
             #   addresses that do not fit in those fields are not normally
             #   useful, the upper limit on address lengths should normally be
             #   considered to be 254.
-            elif (
-                len(
-                    parse_data[Context.LOCALPART] + Char.AT + parse_data[Context.DOMAIN]
-                )
-                > 254
-            ):
-                return_status.append(RFC5322Diagnosis("TOOLONG"))
+            elif len(local_part + Char.AT + domain) > 254:
+                return_status.add(RFC5322Diagnosis.get("TOOLONG"))
             # http://tools.ietf.org/html/rfc1035#section-2.3.4
             # labels           63 octets or less
             elif element_len > 63:
-                return_status.append(RFC5322Diagnosis("LABEL_TOOLONG"))
+                return_status.add(RFC5322Diagnosis.get("LABEL_TOOLONG"))
+
+        if not diagnose:
+            return max(return_status) < threshold, parse_data
 
-        return_status = list(set(return_status))
         final_status = max(return_status)
 
         if len(return_status) != 1:
             # Remove redundant ValidDiagnosis
-            return_status.pop(0)
+            return_status.discard(ValidDiagnosis.get())
 
-        parse_data["status"] = return_status
+        parse_data["status"] = list(return_status)
 
-        if final_status < threshold:
-            final_status = ValidDiagnosis()
+        if final_status < BaseDiagnosis.CATEGORIES["VALID"]:
+            final_status = ValidDiagnosis.get()
 
-        if diagnose:
-            return final_status
-        else:
-            return final_status < BaseDiagnosis.CATEGORIES["THRESHOLD"]
+        return final_status, parse_data
@@ -0,0 +1,1141 @@
+import re
+
+from pyisemail.diagnosis import (
+    BaseDiagnosis,
+    CFWSDiagnosis,
+    DeprecatedDiagnosis,
+    InvalidDiagnosis,
+    RFC5321Diagnosis,
+    RFC5322Diagnosis,
+    ValidDiagnosis,
+)
+from pyisemail.validators.grammar import (
+    CLASS_TABLE,
+    CONTROL_PICTURES,
+    CharClass,
+    Context,
+)
+from pyisemail.validators.literal_validator import LiteralValidator
+
+__all__ = ["TableParser"]
+
+C = CharClass
+
+
+def _run(*classes):
+    """Compile a pattern matching a run of characters in the given classes.
+
+    Keyword arguments:
+    classes -- the CharClass values allowed in the run
+
+    """
+    return re.compile(b"[" + re.escape(bytes(classes)) + b"]+")
+
+
+# Characters that need no individual attention in each context, so that the
+# engine can consume them as a run rather than one at a time
+ATEXT_RUN = _run(C.ATEXT, C.LETDIG, C.HYPHEN)
+WSP_RUN = _run(C.SP, C.HTAB)
+# dtext, qtext and ctext are all the printable characters, less a few
+PRINTABLE = (
+    C.ATEXT,
+    C.LETDIG,
+    C.HYPHEN,
+    C.DOT,
+    C.AT,
+    C.DQUOTE,
+    C.OPENPARENTHESIS,
+    C.CLOSEPARENTHESIS,
+    C.OPENSQBRACKET,
+    C.CLOSESQBRACKET,
+    C.BACKSLASH,
+    C.SPECIAL,
+)
+DTEXT_RUN = _run(
+    *[c for c in PRINTABLE if c not in (C.OPENSQBRACKET, C.CLOSESQBRACKET, C.BACKSLASH)]
+)
+QTEXT_RUN = _run(C.SP, *[c for c in PRINTABLE if c not in (C.DQUOTE, C.BACKSLASH)])
+# http://tools.ietf.org/html/rfc6531#section-3.3
+#   atext          =/ UTF8-non-ascii
+#
+#   qtextSMTP      =/ UTF8-non-ascii
+ATEXT_UTF8_RUN = _run(C.ATEXT, C.LETDIG, C.HYPHEN, C.NONASCII)
+QTEXT_UTF8_RUN = _run(
+    C.SP, C.NONASCII, *[c for c in PRINTABLE if c not in (C.DQUOTE, C.BACKSLASH)]
+)
+CTEXT_RUN = _run(
+    *[
+        c
+        for c in PRINTABLE
+        if c not in (C.OPENPARENTHESIS, C.CLOSEPARENTHESIS, C.BACKSLASH)
+    ]
+)
+
+
+UNCACHED_LITERALS = LiteralValidator(cache_size=None)
+
+
+class TableParser(object):
+
+    """Table-driven engine for the ParserValidator.
+
+    Rather than walking a chain of comparisons for every character, the
+    engine classifies the whole address up front with a translation table and
+    then dispatches on (context, character class) through TRANSITIONS. Runs of
+    characters that need no individual attention are consumed in one step.
+
+    It produces exactly the same diagnoses as the original parser.
+
+    """
+
+    def __init__(
+        self,
+        address,
+        diagnose=True,
+        max_depth=None,
+        domain_cache=None,
+        smtputf8=False,
+        literal_validator=None,
+    ):
+        """Prepare to parse an address.
+
+        Keyword arguments:
+        address  -- the address to parse, as a str or a bytes-like object
+        diagnose -- flag for whether the full diagnosis is wanted, rather
+                    than just a verdict (default True)
+        max_depth -- how deeply contexts may nest (default None, for no limit)
+        domain_cache -- an LRUCache for the outcome of parsing each domain
+                        (default None, for no caching)
+        smtputf8 -- flag to allow UTF-8 in the atoms and quoted strings of
+                    the local part, as RFC 6531 does (default False)
+        literal_validator -- the LiteralValidator for address literals
+                             (default None, for one without a cache)
+
+        """
+        self.transitions = TRANSITIONS
+        self.encoding = "latin-1"
+
+        if isinstance(address, str):
+            if not address.isascii():
+                address = address.translate(CONTROL_PICTURES)
+
+            if address.isascii():
+                address = address.encode("ascii")
+            elif smtputf8:
+                try:
+                    # Lengths in RFC 5321 are in octets, so count those
+                    address = address.encode("utf-8")
+                except UnicodeEncodeError:
+                    # Lone surrogates aren't characters, so stay rejected
+                    pass
+                else:
+                    self.transitions = UTF8_TRANSITIONS
+                    self.encoding = "utf-8"
+        elif smtputf8:
+            address = bytes(address)
+
+            if not address.isascii():
+                try:
+                    address.decode("utf-8")
+                except UnicodeDecodeError:
+                    # Not UTF-8, so the non-ASCII bytes stay rejected
+                    pass
+                else:
+                    self.transitions = UTF8_TRANSITIONS
+                    self.encoding = "utf-8"
+
+        if isinstance(address, str):
+            self.data = address
+            self.classes = bytes(
+                CLASS_TABLE[o] if o < 128 else C.NONASCII for o in map(ord, address)
+            )
+        else:
+            # Bytes-like addresses are parsed as they are, without decoding
+            self.data = bytes(address)
+            self.classes = self.data.translate(CLASS_TABLE)
+
+        self.empty = self.data[:0]
+        self.space = " " if isinstance(self.data, str) else b" "
+
+        # Once the address is invalid, a verdict can't change, so there is no
+        # need to parse any further unless we are diagnosing
+        if diagnose:
+            self.limit = BaseDiagnosis.CATEGORIES["RFC5322"]
+        else:
+            self.limit = BaseDiagnosis.CATEGORIES["THRESHOLD"] - 1
+
+        self.max_depth = max_depth
+        self.domain_cache = domain_cache
+        self.literal_validator = literal_validator or UNCACHED_LITERALS
+        self.restart(0, len(self.data))
+
+    def restart(self, start, end):
+        """Get ready to parse part of the data as an address of its own.
+
+        This lets an address that is part of a longer text, like a header, be
+        parsed where it is, without copying or classifying it again.
+
+        Keyword arguments:
+        start -- index of the first character of the address
+        end   -- index after the last character of the address
+
+        """
+        self.position = start
+        self.length = end
+        self.return_status = {ValidDiagnosis.get()}
+        self.max_code = 0
+        self.context = Context.LOCALPART  # Where we are
+        self.context_stack = [self.context]  # Where we've been
+        self.context_prior = Context.LOCALPART  # Where we just came from
+        self.local_part = []  # The address' components
+        self.local_len = 0
+        self.domain = []
+        self.domain_len = 0
+        self.literal = []
+        self.element_count = 0
+        self.element_len = 0
+        self.hyphen_flag = False  # Hyphen cannot occur at the end of a subdomain
+        self.end_or_die = False  # CFWS can only appear at the end of an element
+        self.prior_cr = False  # The previous character was a CR
+        self.crlf_count = -1  # crlf_count = -1 == !isset(crlf_count)
+        self.crlf_end = -1  # Where the most recent CRLF ended
+        self.domain_key = None  # Where to cache the domain once it's parsed
+        self.domain_start = 0
+        self.domain_status = None  # The diagnoses that the domain added
+
+    def add(self, diagnosis):
+        """Record a diagnosis.
+
+        Keyword arguments:
+        diagnosis -- the diagnosis to record
+
+        """
+        self.return_status.add(diagnosis)
+
+        if diagnosis.code > self.max_code:
+            self.max_code = diagnosis.code
+
+        if self.domain_status is not None:
+            self.domain_status.add(diagnosis)
+
+    def parse(self):
+        """Parse the address until it ends or becomes invalid."""
+        transitions = self.transitions
+        classes = self.classes
+        length = self.length
+        limit = self.limit
+        i = self.position
+
+        # No point in going on if we've got a fatal error
+        while i < length and self.max_code <= limit:
+            i = transitions[self.context][classes[i]](self, i)
+
+        self.position = i
+
+        if self.domain_key is not None:
+            self.cache_domain()
+
+        return self
+
+    def start_domain(self, start):
+        """Use the cached outcome of parsing the domain, if there is one.
+
+        Parsing the domain only depends on the domain itself and on a little
+        of what came before it, which all goes into the key. On a miss, the
+        domain is parsed as usual and its outcome cached afterward.
+
+        Returns the index of the next character to look at.
+
+        Keyword arguments:
+        start -- index of the first character of the domain
+
+        """
+        key = (
+            self.data[start : self.length],
+            self.limit,
+            # An address literal is only checked if nothing is deprecated
+            self.max_code < BaseDiagnosis.CATEGORIES["DEPREC"],
+            self.context_prior,
+        )
+        outcome = self.domain_cache.get(key)
+
+        if outcome is None:
+            self.domain_key = key
+            self.domain_start = start
+            self.domain_status = set()
+            return start
+
+        (
+            status,
+            max_code,
+            self.context,
+            self.element_len,
+            self.hyphen_flag,
+            domain,
+            crlf_end,
+            end,
+        ) = outcome
+
+        self.return_status |= status
+        self.max_code = max(self.max_code, max_code)
+        self.domain = [domain]
+        self.domain_len = len(domain)
+
+        if crlf_end:
+            self.crlf_end = self.length
+
+        return start + end
+
+    def cache_domain(self):
+        """Cache the outcome of parsing the domain."""
+        status = frozenset(self.domain_status)
+
+        self.domain_cache[self.domain_key] = (
+            status,
+            max(status).code if status else 0,
+            self.context,
+            self.element_len,
+            self.hyphen_flag,
+            self.empty.join(self.domain),
+            self.crlf_end == self.length,
+            self.position - self.domain_start,
+        )
+        self.domain_key = None
+        self.domain_status = None
+
+    def final_status(self):
+        """Return the diagnosis for everything parsed so far.
+
+        Runs the checks that only make sense at the end of an address, without
+        recording their outcome, so parsing could continue afterward.
+
+        """
+        return_status = self.return_status
+
+        if self.max_code > self.limit:
+            # Parsing stopped early, so the end-of-address checks don't apply
+            return max(return_status)
+
+        if self.max_code < BaseDiagnosis.CATEGORIES["RFC5322"]:
+            d = None
+
+            if self.context == Context.QUOTEDSTRING:
+                d = InvalidDiagnosis.get("UNCLOSEDQUOTEDSTR")
+            elif self.context == Context.QUOTEDPAIR:
+                d = InvalidDiagnosis.get("BACKSLASHEND")
+            elif self.context == Context.COMMENT:
+                d = InvalidDiagnosis.get("UNCLOSEDCOMMENT")
+            elif self.context == Context.LITERAL:
+                d = InvalidDiagnosis.get("UNCLOSEDDOMLIT")
+            elif self.crlf_end == self.length:
+                d = InvalidDiagnosis.get("FWS_CRLF_END")
+            elif self.domain_len == 0:
+                d = InvalidDiagnosis.get("NODOMAIN")
+            elif self.element_len == 0:
+                d = InvalidDiagnosis.get("DOT_END")
+            elif self.hyphen_flag:
+                d = InvalidDiagnosis.get("DOMAINHYPHENEND")
+            # http://tools.ietf.org/html/rfc5321#section-4.5.3.1.2
+            elif self.domain_len > 255:
+                d = RFC5322Diagnosis.get("DOMAIN_TOOLONG")
+            # http://www.rfc-editor.org/errata_search.php?rfc=3696&eid=1690
+            elif self.local_len + 1 + self.domain_len > 254:
+                d = RFC5322Diagnosis.get("TOOLONG")
+            # http://tools.ietf.org/html/rfc1035#section-2.3.4
+            elif self.element_len > 63:
+                d = RFC5322Diagnosis.get("LABEL_TOOLONG")
+
+            if d is not None:
+                return_status = return_status | {d}
+
+        final_status = max(return_status)
+
+        if final_status < BaseDiagnosis.CATEGORIES["VALID"]:
+            final_status = ValidDiagnosis.get()
+
+        return final_status
+
+    def text(self, pieces):
+        """Join a list of component pieces back into a string.
+
+        Keyword arguments:
+        pieces -- the pieces of the component
+
+        """
+        text = self.empty.join(pieces)
+
+        if not isinstance(text, str):
+            # A fatal error can leave a UTF-8 sequence cut short
+            text = text.decode(self.encoding, "replace")
+
+        return text
+
+    def push(self, context):
+        """Enter a new context, remembering the current one.
+
+        Keyword arguments:
+        context -- the context to enter
+
+        """
+        self.context_stack.append(self.context)
+        self.context = context
+
+        # Only nested comments can keep the stack growing
+        if self.max_depth is not None and len(self.context_stack) > self.max_depth + 1:
+            self.add(InvalidDiagnosis.get("NESTING_TOODEEP"))
+
+    def pop(self):
+        """Return to the context we came from."""
+        self.context_prior = self.context
+        self.context = self.context_stack.pop()
+
+    def append_local(self, start, end):
+        """Add characters of the address to the local part.
+
+        Keyword arguments:
+        start -- index of the first character
+        end   -- index after the last character
+
+        """
+        self.local_part.append(self.data[start:end])
+        self.local_len += end - start
+        self.element_len += end - start
+
+    def append_domain(self, start, end):
+        """Add characters of the address to the domain.
+
+        Keyword arguments:
+        start -- index of the first character
+        end   -- index after the last character
+
+        """
+        self.domain.append(self.data[start:end])
+        self.domain_len += end - start
+        self.element_len += end - start
+
+
+def _crlf(p, i):
+    """Check that the CR at i is followed by a LF.
+
+    Returns False after recording the error if it is not.
+
+    """
+    if i + 1 == p.length or p.classes[i + 1] != C.LF:
+        p.add(InvalidDiagnosis.get("CR_NO_LF"))
+        return False
+
+    p.crlf_end = i + 2
+    return True
+
+
+def _fws(start):
+    """Wrap a handler for the first character of Folding White Space.
+
+    The wrapped handler is used for SP and HTAB, and for a CR once we know it
+    is followed by a LF, which is skipped.
+
+    Keyword arguments:
+    start -- the handler for the character
+
+    """
+
+    def wsp(p, i):
+        start(p, i)
+        p.prior_cr = False
+        return i + 1
+
+    def cr(p, i):
+        if not _crlf(p, i):
+            return i + 1
+
+        start(p, i)
+        p.prior_cr = True
+        return i + 2
+
+    return wsp, cr
+
+
+# -------------------------------------------------------
+# Local part
+# -------------------------------------------------------
+# http://tools.ietf.org/html/rfc5322#section-3.4.1
+#   local-part     =  dot-atom / quoted-string / obs-local-part
+#
+#   dot-atom       =  [CFWS] dot-atom-text [CFWS]
+#
+#   dot-atom-text  =  1*atext *("." 1*atext)
+#
+#   quoted-string  =  [CFWS]
+#                     DQUOTE *([FWS] qcontent) [FWS] DQUOTE
+#                     [CFWS]
+#
+#   obs-local-part =  word *("." word)
+#
+#   word           =  atom / quoted-string
+#
+#   atom           =  [CFWS] 1*atext [CFWS]
+def _local_comment(p, i):
+    if p.element_len == 0:
+        # Comments are OK at the beginning of an element
+        if p.element_count == 0:
+            p.add(CFWSDiagnosis.get("COMMENT"))
+        else:
+            p.add(DeprecatedDiagnosis.get("COMMENT"))
+    else:
+        p.add(CFWSDiagnosis.get("COMMENT"))
+        # We can't start a comment in the middle of an element, so this
+        # better be the end
+        p.end_or_die = True
+
+    p.push(Context.COMMENT)
+    return i + 1
+
+
+def _local_dot(p, i):
+    if p.element_len == 0:
+        # Another dot, already? Fatal error
+        if p.element_count == 0:
+            p.add(InvalidDiagnosis.get("DOT_START"))
+        else:
+            p.add(InvalidDiagnosis.get("CONSECUTIVEDOTS"))
+    else:
+        # The entire local-part can be a quoted string for RFC 5321. If it's
+        # just one atom that is quoted then it's an RFC 5322 obsolete form
+        if p.end_or_die:
+            p.add(DeprecatedDiagnosis.get("LOCALPART"))
+
+        # CFWS & quoted strings are OK again now we're at the beginning of an
+        # element (although they are obsolete forms)
+        p.end_or_die = False
+        p.element_len = 0
+        p.element_count += 1
+        p.local_part.append(p.data[i : i + 1])
+        p.local_len += 1
+
+    return i + 1
+
+
+def _local_dquote(p, i):
+    if p.element_len == 0:
+        # The entire local-part can be a quoted string for RFC 5321. If it's
+        # just one atom that is quoted then it's an RFC 5322 obsolete form
+        if p.element_count == 0:
+            p.add(RFC5321Diagnosis.get("QUOTEDSTRING"))
+        else:
+            p.add(DeprecatedDiagnosis.get("LOCALPART"))
+
+        p.append_local(i, i + 1)
+        p.end_or_die = True
+        p.push(Context.QUOTEDSTRING)
+    else:
+        # Fatal error
+        p.add(InvalidDiagnosis.get("EXPECTING_ATEXT"))
+
+    return i + 1
+
+
+def _local_fws_start(p, i):
+    if p.element_len == 0:
+        if p.element_count == 0:
+            p.add(CFWSDiagnosis.get("FWS"))
+        else:
+            p.add(DeprecatedDiagnosis.get("FWS"))
+    else:
+        # We can't start FWS in the middle of an element, so this better be
+        # the end
+        p.end_or_die = True
+
+    p.push(Context.FWS)
+
+
+_local_wsp, _local_cr = _fws(_local_fws_start)
+
+
+def _local_at(p, i):
+    # At this point we should have a valid local-part
+    if len(p.context_stack) != 1:  # pragma: no cover
+        p.add(InvalidDiagnosis.get("BAD_PARSE"))
+        return i + 1
+
+    if p.local_len == 0:
+        # Fatal error
+        p.add(InvalidDiagnosis.get("NOLOCALPART"))
+    elif p.element_len == 0:
+        # Fatal error
+        p.add(InvalidDiagnosis.get("DOT_END"))
+    # http://tools.ietf.org/html/rfc5321#section-4.5.3.1.1
+    #   The maximum total length of a user name or other local-part is 64
+    #   octets.
+    elif p.local_len > 64:
+        p.add(RFC5322Diagnosis.get("LOCAL_TOOLONG"))
+    # http://tools.ietf.org/html/rfc5322#section-3.4.1
+    #   Comments and folding white space SHOULD NOT be used around the "@" in
+    #   the addr-spec.
+    elif p.context_prior in [Context.COMMENT, Context.FWS]:
+        p.add(DeprecatedDiagnosis.get("CFWS_NEAR_AT"))
+
+    # Clear everything down for the domain parsing
+    p.context = Context.DOMAIN
+    p.context_stack = [p.context]
+    p.element_count = 0
+    p.element_len = 0
+    # CFWS can only appear at the end of the element
+    p.end_or_die = False
+
+    if p.domain_cache is not None and p.max_code <= p.limit:
+        return p.start_domain(i + 1)
+
+    return i + 1
+
+
+def _local_atext_after_end(p, i):
+    # We have encountered atext where it is no longer valid
+    if p.context_prior in [Context.COMMENT, Context.FWS]:
+        p.add(InvalidDiagnosis.get("ATEXT_AFTER_CFWS"))
+    elif p.context_prior == Context.QUOTEDSTRING:
+        p.add(InvalidDiagnosis.get("ATEXT_AFTER_QS"))
+    else:  # pragma: no cover
+        p.add(InvalidDiagnosis.get("BAD_PARSE"))
+
+    return i + 1
+
+
+def _local_atext(p, i):
+    if p.end_or_die:
+        return _local_atext_after_end(p, i)
+
+    end = ATEXT_RUN.match(p.classes, i, p.length).end()
+    p.context_prior = Context.LOCALPART
+    p.append_local(i, end)
+    return end
+
+
+def _local_utf8_atext(p, i):
+    if p.end_or_die:
+        return _local_atext_after_end(p, i)
+
+    end = ATEXT_UTF8_RUN.match(p.classes, i, p.length).end()
+    p.context_prior = Context.LOCALPART
+    p.append_local(i, end)
+    return end
+
+
+def _local_not_atext(p, i):
+    if p.end_or_die:
+        return _local_atext_after_end(p, i)
+
+    p.context_prior = Context.LOCALPART
+    p.add(InvalidDiagnosis.get("EXPECTING_ATEXT"))
+    p.append_local(i, i + 1)
+    return i + 1
+
+
+# -------------------------------------------------------
+# Domain
+# -------------------------------------------------------
+# http://tools.ietf.org/html/rfc5322#section-3.4.1
+#   domain         = dot-atom / domain-literal / obs-domain
+#
+#   dot-atom       = [CFWS] dot-atom-text [CFWS]
+#
+#   dot-atom-text  = 1*atext *("." 1*atext)
+#
+#   domain-literal = [CFWS] "[" *([FWS] dtext) [FWS] "]" [CFWS]
+#
+#   obs-domain     = atom *("." atom)
+#
+# http://tools.ietf.org/html/rfc5321#section-4.1.2
+#   Domain         = sub-domain *("." sub-domain)
+#
+#   sub-domain     = Let-dig [Ldh-str]
+#
+#   Let-dig        = ALPHA / DIGIT
+#
+#   Ldh-str        = *( ALPHA / DIGIT / "-" ) Let-dig
+def _domain_comment(p, i):
+    if p.element_len == 0:
+        # Comments at the start of the domain are deprecated in the text
+        # Comments at the start of a subdomain are obs-domain
+        if p.element_count == 0:
+            p.add(DeprecatedDiagnosis.get("CFWS_NEAR_AT"))
+        else:
+            p.add(DeprecatedDiagnosis.get("COMMENT"))
+    else:
+        p.add(CFWSDiagnosis.get("COMMENT"))
+        # We can't start a comment in the middle of an element, so this
+        # better be the end
+        p.end_or_die = True
+
+    p.push(Context.COMMENT)
+    return i + 1
+
+
+def _domain_dot(p, i):
+    if p.element_len == 0:
+        # Another dot, already? Fatal error
+        if p.element_count == 0:
+            p.add(InvalidDiagnosis.get("DOT_START"))
+        else:
+            p.add(InvalidDiagnosis.get("CONSECUTIVEDOTS"))
+    elif p.hyphen_flag:
+        # Previous subdomain ended in a hyphen. Fatal error
+        p.add(InvalidDiagnosis.get("DOMAINHYPHENEND"))
+    else:
+        # http://tools.ietf.org/html/rfc1035#section-2.3.4
+        # labels         63 octets or less
+        if p.element_len > 63:
+            p.add(RFC5322Diagnosis.get("LABEL_TOOLONG"))
+
+        # CFWS is OK again now we're at the beginning of an element (although
+        # it may be obsolete CFWS)
+        p.end_or_die = False
+        p.element_len = 0
+        p.element_count += 1
+        p.domain.append(p.data[i : i + 1])
+        p.domain_len += 1
+
+    return i + 1
+
+
+def _domain_literal(p, i):
+    if p.domain_len == 0:
+        # Domain literal must be the only component
+        p.end_or_die = True
+        p.push(Context.LITERAL)
+        p.append_domain(i, i + 1)
+        p.literal = []
+    else:
+        # Fatal error
+        p.add(InvalidDiagnosis.get("EXPECTING_ATEXT"))
+
+    return i + 1
+
+
+def _domain_fws_start(p, i):
+    if p.element_len == 0:
+        if p.element_count == 0:
+            p.add(DeprecatedDiagnosis.get("CFWS_NEAR_AT"))
+        else:
+            p.add(DeprecatedDiagnosis.get("FWS"))
+    else:
+        p.add(CFWSDiagnosis.get("FWS"))
+        # We can't start FWS in the middle of an element, so this better be
+        # the end
+        p.end_or_die = True
+
+    p.push(Context.FWS)
+
+
+_domain_wsp, _domain_cr = _fws(_domain_fws_start)
+
+
+def _domain_atext_after_end(p):
+    # We have encountered atext where it is no longer valid
+    if p.context_prior in [Context.COMMENT, Context.FWS]:
+        p.add(InvalidDiagnosis.get("ATEXT_AFTER_CFWS"))
+    elif p.context_prior == Context.LITERAL:
+        p.add(InvalidDiagnosis.get("ATEXT_AFTER_DOMLIT"))
+    else:  # pragma: no cover
+        p.add(InvalidDiagnosis.get("BAD_PARSE"))
+
+
+def _domain_atext(p, i):
+    if p.end_or_die:
+        _domain_atext_after_end(p)
+
+    classes = p.classes
+    end = ATEXT_RUN.match(classes, i, p.length).end()
+
+    if p.element_len == 0 and classes[i] == C.HYPHEN:
+        # Hyphens can't be at the beginning of a subdomain. Fatal error
+        p.add(InvalidDiagnosis.get("DOMAINHYPHENSTART"))
+
+    if classes.find(C.ATEXT, i, end) != -1:
+        # Not an RFC 5321 subdomain, but still OK by RFC 5322
+        p.add(RFC5322Diagnosis.get("DOMAIN"))
+
+    p.hyphen_flag = classes[end - 1] == C.HYPHEN
+    p.append_domain(i, end)
+    return end
+
+
+def _domain_not_atext(p, i):
+    if p.end_or_die:
+        _domain_atext_after_end(p)
+
+    # Fatal error
+    p.hyphen_flag = False
+    p.add(InvalidDiagnosis.get("EXPECTING_ATEXT"))
+    p.append_domain(i, i + 1)
+    return i + 1
+
+
+# -------------------------------------------------------
+# Domain literal
+# -------------------------------------------------------
+# http://tools.ietf.org/html/rfc5322#section-3.4.1
+#   dtext          = %d33-90 /     ; Printable US-ASCII
+#                    %d94-126 /    ; characters not
+#                    obs-dtext     ; including [, ], or \
+#
+#   obs-dtext      = obs-NO-WS-CTL / quoted-pair
+def _literal_end(p, i):
+    if p.max_code < BaseDiagnosis.CATEGORIES["DEPREC"]:
+        # Could be a valid RFC 5321 address literal, so let's check
+        for d in p.literal_validator.diagnoses(p.text(p.literal)):
+            p.add(d)
+    else:
+        p.add(RFC5322Diagnosis.get("DOMAINLITERAL"))
+
+    p.append_domain(i, i + 1)
+    p.pop()
+    return i + 1
+
+
+def _literal_quoted_pair(p, i):
+    p.add(RFC5322Diagnosis.get("DOMLIT_OBSDTEXT"))
+    p.push(Context.QUOTEDPAIR)
+    return i + 1
+
+
+def _literal_fws_start(p, i):
+    p.add(CFWSDiagnosis.get("FWS"))
+    p.push(Context.FWS)
+
+
+_literal_wsp, _literal_cr = _fws(_literal_fws_start)
+
+
+def _literal_dtext(p, i):
+    end = DTEXT_RUN.match(p.classes, i, p.length).end()
+    p.literal.append(p.data[i:end])
+    p.append_domain(i, end)
+    return end
+
+
+def _literal_obs_dtext(p, i):
+    p.add(RFC5322Diagnosis.get("DOMLIT_OBSDTEXT"))
+    p.literal.append(p.data[i : i + 1])
+    p.append_domain(i, i + 1)
+    return i + 1
+
+
+def _literal_not_dtext(p, i):
+    # Fatal error
+    p.add(InvalidDiagnosis.get("EXPECTING_DTEXT"))
+    return i + 1
+
+
+# -------------------------------------------------------
+# Quoted string
+# -------------------------------------------------------
+# http://tools.ietf.org/html/rfc5322#section-3.2.4
+#   quoted-string   =  [CFWS]
+#                      DQUOTE *([FWS] qcontent) [FWS] DQUOTE
+#                      [CFWS]
+#
+#   qcontent        =  qtext / quoted-pair
+#
+#   qtext           =  %d33 /      ; Printable US-ASCII
+#                      %d35-91 /   ; characters not
+#                      %d93-126 /  ; including "\" or
+#                      obs-qtext   ; the quote character
+def _quoted_string_quoted_pair(p, i):
+    p.push(Context.QUOTEDPAIR)
+    return i + 1
+
+
+def _quoted_string_fws_start(p, i):
+    # http://tools.ietf.org/html/rfc5322#section-3.2.4
+    #   the CRLF in any FWS/CFWS that appears within the quoted string [is]
+    #   semantically "invisible" and therefore not part of the quoted-string
+    p.local_part.append(p.space)
+    p.local_len += 1
+    p.element_len += 1
+
+    p.add(CFWSDiagnosis.get("FWS"))
+    p.push(Context.FWS)
+
+
+_quoted_string_wsp, _quoted_string_cr = _fws(_quoted_string_fws_start)
+
+
+def _quoted_string_end(p, i):
+    p.append_local(i, i + 1)
+    p.pop()
+    return i + 1
+
+
+def _quoted_string_qtext(p, i):
+    end = QTEXT_RUN.match(p.classes, i, p.length).end()
+    p.append_local(i, end)
+    return end
+
+
+def _quoted_string_utf8_qtext(p, i):
+    end = QTEXT_UTF8_RUN.match(p.classes, i, p.length).end()
+    p.append_local(i, end)
+    return end
+
+
+def _quoted_string_obs_qtext(p, i):
+    p.add(DeprecatedDiagnosis.get("QTEXT"))
+    p.append_local(i, i + 1)
+    return i + 1
+
+
+def _quoted_string_not_qtext(p, i):
+    # Fatal error
+    p.add(InvalidDiagnosis.get("EXPECTING_QTEXT"))
+    p.append_local(i, i + 1)
+    return i + 1
+
+
+# -------------------------------------------------------
+# Quoted pair
+# -------------------------------------------------------
+# http://tools.ietf.org/html/rfc5322#section-3.2.1
+#   quoted-pair     =   ("\" (VCHAR / WSP)) / obs-qp
+#
+#   obs-qp          =   "\" (%d0 / obs-NO-WS-CTL / LF / CR)
+def _quoted_pair(p, i):
+    p.pop()  # End of qpair
+
+    # The maximum sizes specified by RFC 5321 are octet counts, so we must
+    # include the backslash
+    if p.context == Context.COMMENT:
+        pass
+    elif p.context == Context.QUOTEDSTRING:
+        p.append_local(i - 1, i + 1)
+    elif p.context == Context.LITERAL:
+        p.append_domain(i - 1, i + 1)
+    else:  # pragma: no cover
+        p.add(InvalidDiagnosis.get("BAD_PARSE"))
+
+    return i + 1
+
+
+def _quoted_pair_obs(p, i):
+    p.add(DeprecatedDiagnosis.get("QP"))
+    return _quoted_pair(p, i)
+
+
+def _quoted_pair_invalid(p, i):
+    # Fatal error
+    p.add(InvalidDiagnosis.get("EXPECTING_QPAIR"))
+    return _quoted_pair(p, i)
+
+
+# -------------------------------------------------------
+# Comment
+# -------------------------------------------------------
+# http://tools.ietf.org/html/rfc5322#section-3.2.2
+#   comment         =   "(" *([FWS] ccontent) [FWS] ")"
+#
+#   ccontent        =   ctext / quoted-pair / comment
+#
+#   ctext           =   %d33-39 /   ; Printable US-
+#                       %d42-91 /   ; ASCII characters
+#                       %d93-126 /  ; not including
+#                       obs-ctext   ; "(", ")", or "\"
+def _comment_nested(p, i):
+    # Nested comments are OK
+    p.push(Context.COMMENT)
+    return i + 1
+
+
+def _comment_end(p, i):
+    p.pop()
+    return i + 1
+
+
+def _comment_quoted_pair(p, i):
+    p.push(Context.QUOTEDPAIR)
+    return i + 1
+
+
+def _comment_fws_start(p, i):
+    p.add(CFWSDiagnosis.get("FWS"))
+    p.push(Context.FWS)
+
+
+_comment_wsp, _comment_cr = _fws(_comment_fws_start)
+
+
+def _comment_ctext(p, i):
+    return CTEXT_RUN.match(p.classes, i, p.length).end()
+
+
+def _comment_obs_ctext(p, i):
+    p.add(DeprecatedDiagnosis.get("CTEXT"))
+    return i + 1
+
+
+def _comment_not_ctext(p, i):
+    # Fatal error
+    p.add(InvalidDiagnosis.get("EXPECTING_CTEXT"))
+    return i + 1
+
+
+# -------------------------------------------------------
+# Folding White Space (FWS)
+# -------------------------------------------------------
+# http://tools.ietf.org/html/rfc5322#section-3.2.2
+#   FWS             =   ([*WSP CRLF] 1*WSP) /  obs-FWS
+#
+#   obs-FWS         =   1*([CRLF] WSP)
+def _fws_after_crlf(p):
+    if p.crlf_count != -1:
+        p.crlf_count += 1
+        if p.crlf_count > 1:
+            # Multiple folds = obsolete FWS
+            p.add(DeprecatedDiagnosis.get("FWS"))
+    else:
+        p.crlf_count = 1
+
+
+def _fws_cr(p, i):
+    if p.prior_cr:
+        # Fatal error
+        p.add(InvalidDiagnosis.get("FWS_CRLF_X2"))
+        return i + 1
+
+    if not _crlf(p, i):
+        return i + 1
+
+    p.prior_cr = True
+    return i + 2
+
+
+def _fws_wsp(p, i):
+    if p.prior_cr:
+        _fws_after_crlf(p)
+        p.prior_cr = False
+
+    return WSP_RUN.match(p.classes, i, p.length).end()
+
+
+def _fws_end(p, i):
+    if p.prior_cr:
+        _fws_after_crlf(p)
+        # Fatal error
+        p.add(InvalidDiagnosis.get("FWS_CRLF_END"))
+        return i + 1
+
+    p.crlf_count = -1
+    # End of FWS. Look at this character again in the parent context
+    p.pop()
+    return i
+
+
+def _transitions(default, **handlers):
+    """Build the row of the transition table for one context.
+
+    Keyword arguments:
+    default  -- the handler for classes that aren't named
+    handlers -- the handler for each named CharClass
+
+    """
+    row = [default] * (C.NONASCII + 1)
+
+    for name, handler in handlers.items():
+        row[getattr(C, name)] = handler
+
+    return row
+
+
+# The handler for each (context, character class) pair. Each handler takes the
+# parser and the index of the current character and returns the index of the
+# next character to look at.
+TRANSITIONS = [None] * (Context.QUOTEDPAIR + 1)
+TRANSITIONS[Context.LOCALPART] = _transitions(
+    _local_not_atext,
+    ATEXT=_local_atext,
+    LETDIG=_local_atext,
+    HYPHEN=_local_atext,
+    OPENPARENTHESIS=_local_comment,
+    DOT=_local_dot,
+    DQUOTE=_local_dquote,
+    SP=_local_wsp,
+    HTAB=_local_wsp,
+    CR=_local_cr,
+    AT=_local_at,
+)
+TRANSITIONS[Context.DOMAIN] = _transitions(
+    _domain_not_atext,
+    ATEXT=_domain_atext,
+    LETDIG=_domain_atext,
+    HYPHEN=_domain_atext,
+    OPENPARENTHESIS=_domain_comment,
+    DOT=_domain_dot,
+    OPENSQBRACKET=_domain_literal,
+    SP=_domain_wsp,
+    HTAB=_domain_wsp,
+    CR=_domain_cr,
+)
+TRANSITIONS[Context.LITERAL] = _transitions(
+    _literal_dtext,
+    CLOSESQBRACKET=_literal_end,
+    BACKSLASH=_literal_quoted_pair,
+    SP=_literal_wsp,
+    HTAB=_literal_wsp,
+    CR=_literal_cr,
+    LF=_literal_obs_dtext,
+    CTL=_literal_obs_dtext,
+    US=_literal_obs_dtext,
+    OPENSQBRACKET=_literal_not_dtext,
+    NUL=_literal_not_dtext,
+    NONASCII=_literal_not_dtext,
+)
+TRANSITIONS[Context.QUOTEDSTRING] = _transitions(
+    _quoted_string_qtext,
+    BACKSLASH=_quoted_string_quoted_pair,
+    HTAB=_quoted_string_wsp,
+    CR=_quoted_string_cr,
+    DQUOTE=_quoted_string_end,
+    CTL=_quoted_string_obs_qtext,
+    US=_quoted_string_obs_qtext,
+    LF=_quoted_string_not_qtext,
+    NUL=_quoted_string_not_qtext,
+    NONASCII=_quoted_string_not_qtext,
+)
+TRANSITIONS[Context.QUOTEDPAIR] = _transitions(
+    _quoted_pair,
+    NUL=_quoted_pair_obs,
+    CTL=_quoted_pair_obs,
+    LF=_quoted_pair_obs,
+    CR=_quoted_pair_obs,
+    NONASCII=_quoted_pair_invalid,
+)
+TRANSITIONS[Context.COMMENT] = _transitions(
+    _comment_ctext,
+    OPENPARENTHESIS=_comment_nested,
+    CLOSEPARENTHESIS=_comment_end,
+    BACKSLASH=_comment_quoted_pair,
+    SP=_comment_wsp,
+    HTAB=_comment_wsp,
+    CR=_comment_cr,
+    CTL=_comment_obs_ctext,
+    US=_comment_obs_ctext,
+    LF=_comment_not_ctext,
+    NUL=_comment_not_ctext,
+    NONASCII=_comment_not_ctext,
+)
+TRANSITIONS[Context.FWS] = _transitions(
+    _fws_end,
+    SP=_fws_wsp,
+    HTAB=_fws_wsp,
+    CR=_fws_cr,
+)
+
+# With SMTPUTF8, the local part takes UTF-8 wherever it takes atext or qtext.
+# The address has already been checked to be UTF-8, so every NONASCII byte is
+# part of a character.
+UTF8_TRANSITIONS = [list(row) for row in TRANSITIONS]
+
+for name in ("ATEXT", "LETDIG", "HYPHEN", "NONASCII"):
+    UTF8_TRANSITIONS[Context.LOCALPART][getattr(C, name)] = _local_utf8_atext
+
+for c, handler in enumerate(TRANSITIONS[Context.QUOTEDSTRING]):
+    if handler is _quoted_string_qtext or c == C.NONASCII:
+        UTF8_TRANSITIONS[Context.QUOTEDSTRING][c] = _quoted_string_utf8_qtext
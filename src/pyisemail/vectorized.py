@@ -0,0 +1,278 @@
+import numpy as np
+
+from pyisemail.diagnosis import InvalidDiagnosis, RFC5322Diagnosis
+from pyisemail.policy import Policy
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+__all__ = ["validate_array"]
+
+# The classes of character the prefilter tells apart
+OTHER, ATEXT, LETDIG, HYPHEN, DOT, AT = range(6)
+
+CLASSES = np.full(256, OTHER, dtype=np.uint8)
+CLASSES[np.frombuffer(b"!#$%&'*+/=?^_`{|}~", np.uint8)] = ATEXT
+CLASSES[
+    np.frombuffer(
+        b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789", np.uint8
+    )
+] = LETDIG
+CLASSES[ord("-")] = HYPHEN
+CLASSES[ord(".")] = DOT
+CLASSES[ord("@")] = AT
+
+# Longer values are left to the parser, rather than widening every row of
+# their block to fit them
+MAX_WIDTH = 320
+
+NODOMAIN = InvalidDiagnosis.get("NODOMAIN").code
+LOCAL_TOOLONG = RFC5322Diagnosis.get("LOCAL_TOOLONG").code
+LABEL_TOOLONG = RFC5322Diagnosis.get("LABEL_TOOLONG").code
+DOMAIN_TOOLONG = RFC5322Diagnosis.get("DOMAIN_TOOLONG").code
+TOOLONG = RFC5322Diagnosis.get("TOOLONG").code
+
+
+def validate_array(
+    values,
+    check_dns=False,
+    allow_gtld=True,
+    smtputf8=False,
+    block_size=4096,
+):
+    """Validate an array of email addresses, returning (valid, codes).
+
+    Takes the same options as is_email, and returns a boolean array of the
+    verdicts along with a uint16 array of the diagnosis codes, as is_email
+    gives them with as_code. Missing values, like None, NaN and pandas.NA,
+    are invalid, with the code of NODOMAIN, as an empty address is.
+
+    The rows are first looked at a block at a time, as a fixed-width array
+    of characters, to settle the plain dot-atom addresses and the plain
+    local parts with no domain, which are most of any real column. Only the
+    rest go through the parser, each distinct one once.
+
+    Keyword arguments:
+    values     --- a one-dimensional array-like of email addresses: a NumPy
+                   str or bytes array, or an object array of str or
+                   bytes-like objects
+    check_dns  --- flag for whether to check the DNS status of the domain
+    allow_gtld --- flag for whether to prevent gTLDs as the domain
+    smtputf8   --- flag for whether to allow UTF-8 in the local part, as
+                   RFC 6531 does
+    block_size --- how many rows to look at at a time, which bounds the
+                   memory the prefilter needs (default 4096)
+
+    """
+    values = np.asarray(values)
+
+    if values.ndim != 1:
+        raise ValueError("Expected a one-dimensional array of addresses")
+    if values.dtype.kind not in "SUO":
+        raise TypeError("Expected an array of str or bytes, not %s" % values.dtype)
+
+    policy = Policy(check_dns, allow_gtld=allow_gtld, as_code=True, smtputf8=smtputf8)
+    codes = np.zeros(len(values), dtype=np.uint16)
+    settled = np.zeros(len(values), dtype=bool)
+    missing = np.zeros(len(values), dtype=bool)
+
+    for start in range(0, len(values), block_size):
+        stop = start + block_size
+        characters, lengths, missing[start:stop] = _block(values[start:stop])
+        codes[start:stop], settled[start:stop] = _prefilter(characters, lengths)
+
+    # The prefilter only stands in for the parser, so the addresses it
+    # passes still have to go through any later stages
+    ceiling = max((stage.ceiling for stage in policy.pipeline.stages), default=0)
+    settled &= codes >= ceiling
+    codes[missing] = NODOMAIN
+    rows = np.flatnonzero(~(settled | missing))
+
+    if len(rows):
+        codes[rows] = policy.validate_many(values[rows].tolist())
+
+    return codes < policy.threshold, codes
+
+
+def _block(values):
+    """Return the characters, lengths and missing rows of a block of values.
+
+    The characters are a matrix of character codes, a row per value, only
+    as wide as the longest row the prefilter looks at. Rows longer than
+    MAX_WIDTH, and rows of an object array that aren't a str, have a length
+    of -1, so that the prefilter leaves them to the parser.
+
+    Keyword arguments:
+    values --- a block of a one-dimensional array of email addresses
+
+    """
+    if values.dtype.kind in "SU":
+        lengths = np.char.str_len(values)
+        missing = np.zeros(len(values), dtype=bool)
+    else:
+        missing = _missing(values)
+        lengths = np.fromiter(
+            (len(v) if isinstance(v, str) else -1 for v in values),
+            dtype=np.intp,
+            count=len(values),
+        )
+
+    lengths[lengths > MAX_WIDTH] = -1
+
+    if values.dtype.kind == "O":
+        fixed = np.where(lengths >= 0, values, "").astype("U")
+        # A fixed-width array drops trailing NULs, which the parser must see
+        lengths[np.char.str_len(fixed) != np.maximum(lengths, 0)] = -1
+    else:
+        fixed = values
+
+    width = max(lengths.max(initial=0), 1)
+
+    return _characters(fixed)[:, :width], lengths, missing
+
+
+def _missing(values):
+    """Return a mask of the missing values in an object array.
+
+    Keyword arguments:
+    values --- a one-dimensional object array
+
+    """
+    if pandas is not None:
+        return np.asarray(pandas.isna(values), dtype=bool)
+
+    return np.fromiter(
+        (v is None or (isinstance(v, float) and v != v) for v in values),
+        dtype=bool,
+        count=len(values),
+    )
+
+
+def _characters(fixed):
+    """Return a fixed-width array as a matrix of character codes.
+
+    Keyword arguments:
+    fixed --- a fixed-width str or bytes array
+
+    """
+    fixed = np.ascontiguousarray(fixed)
+
+    if fixed.dtype.kind == "S":
+        return fixed.view(np.uint8).reshape(len(fixed), fixed.itemsize)
+
+    return fixed.view(np.uint32).reshape(len(fixed), fixed.itemsize // 4)
+
+
+def _prefilter(characters, lengths):
+    """Diagnose what rows the parser isn't needed for, all at once.
+
+    Returns the parser's diagnosis code for each row it settles, along with
+    a mask of the rows it settles. Those are the plain dot-atom addresses
+    with an LDH domain, which the parser only checks the lengths of, and
+    the plain dot-atom local parts with no "@", which are NODOMAIN.
+
+    Keyword arguments:
+    characters --- a matrix of character codes, a row per address
+    lengths    --- the length of each address, or -1 to leave it alone
+
+    """
+    count, width = characters.shape
+    codes = np.zeros(count, dtype=np.uint16)
+
+    if width == 0:
+        return codes, np.zeros(count, dtype=bool)
+
+    rows = np.arange(count)
+    pos = np.arange(width)
+    last = np.maximum(lengths - 1, 0)
+    cls = CLASSES[np.minimum(characters, 255)]
+    # Padding is OTHER too, so only look at what's inside each row
+    inside = pos < lengths[:, None]
+    at = cls == AT
+    dot = cls == DOT
+    hyphen = cls == HYPHEN
+    sep = dot | at
+    at_count = at.sum(axis=1)
+    at_pos = at.argmax(axis=1)
+
+    # Dots may only come between atoms
+    plain = (lengths > 0) & ~((cls == OTHER) & inside).any(axis=1)
+    plain &= ~(dot[:, :-1] & sep[:, 1:]).any(axis=1)
+    plain &= ~(at[:, :-1] & dot[:, 1:]).any(axis=1)
+    plain &= ~dot[:, 0] & ~dot[rows, last]
+
+    no_domain = plain & (at_count == 0)
+    plain &= (at_count == 1) & (at_pos > 0) & (at_pos < last)
+
+    # http://tools.ietf.org/html/rfc5321#section-4.1.2
+    #   sub-domain     = Let-dig [Ldh-str]
+    domain = pos > at_pos[:, None]
+    plain &= ~((cls == ATEXT) & domain).any(axis=1)
+    plain &= ~(sep[:, :-1] & hyphen[:, 1:] & domain[:, 1:]).any(axis=1)
+    plain &= ~(hyphen[:, :-1] & dot[:, 1:] & domain[:, :-1]).any(axis=1)
+    plain &= ~hyphen[rows, last]
+
+    # The length of each label up to each position in it
+    run = pos - np.maximum.accumulate(np.where(sep, pos, -1), axis=1)
+    domain_len = lengths - at_pos - 1
+    last_label = run[rows, last]
+    inner_label = (run[:, :-1] > 63) & dot[:, 1:] & domain[:, :-1]
+
+    # The same checks as fast_diagnose, in the same order
+    codes[no_domain] = NODOMAIN
+    checks = (
+        (at_pos > 64, LOCAL_TOOLONG),
+        (inner_label.any(axis=1), LABEL_TOOLONG),
+        (domain_len > 255, DOMAIN_TOOLONG),
+        ((domain_len <= 255) & (lengths > 254), TOOLONG),
+        ((domain_len <= 255) & (lengths <= 254) & (last_label > 63), LABEL_TOOLONG),
+    )
+
+    for failed, code in checks:
+        failed &= plain
+        codes[failed] = np.maximum(codes[failed], code)
+
+    return codes, plain | no_domain
+
+
+if pandas is not None:
+
+    @pandas.api.extensions.register_series_accessor("isemail")
+    class EmailAccessor(object):
+
+        """Validate a Series of email addresses, as series.isemail.validate().
+
+        Registered when pyisemail.vectorized is imported with pandas
+        installed.
+
+        """
+
+        def __init__(self, series):
+            self.series = series
+
+        def validate(self, check_dns=False, allow_gtld=True, smtputf8=False):
+            """Return a DataFrame of the "valid" verdict and "code" of each row.
+
+            Takes the same options as validate_array, and keeps the index of
+            the Series. Missing values are invalid, with the code of NODOMAIN.
+
+            Keyword arguments:
+            check_dns  --- flag for whether to check the DNS status of the
+                           domain
+            allow_gtld --- flag for whether to prevent gTLDs as the domain
+            smtputf8   --- flag for whether to allow UTF-8 in the local part,
+                           as RFC 6531 does
+
+            """
+            valid, codes = validate_array(
+                self.series.to_numpy(),
+                check_dns=check_dns,
+                allow_gtld=allow_gtld,
+                smtputf8=smtputf8,
+            )
+
+            return pandas.DataFrame(
+                {"valid": valid, "code": codes}, index=self.series.index
+            )
@@ -1,6 +1,15 @@
+import pickle
+
 import pytest
 
-from pyisemail.diagnosis import BaseDiagnosis
+from pyisemail import Reference
+from pyisemail.diagnosis import (
+    BaseDiagnosis,
+    CFWSDiagnosis,
+    InvalidDiagnosis,
+    RFC5321Diagnosis,
+    ValidDiagnosis,
+)
 
 
 def test_diagnosis_less_than():
@@ -37,3 +46,55 @@ def test_diagnosis_hash():
     d2 = BaseDiagnosis("test")
 
     assert hash(d1) == hash(d2)
+
+
+def test_diagnosis_get_is_shared():
+    assert CFWSDiagnosis.get("COMMENT") is CFWSDiagnosis.get("COMMENT")
+    assert CFWSDiagnosis.get("COMMENT") == CFWSDiagnosis("COMMENT")
+    assert ValidDiagnosis.get() is ValidDiagnosis.get("VALID")
+
+
+def test_diagnosis_get_is_immutable():
+    d = CFWSDiagnosis.get("COMMENT")
+
+    with pytest.raises(AttributeError):
+        d.code = 1
+
+    assert d.code == 17
+
+
+def test_diagnosis_has_no_dict():
+    with pytest.raises(AttributeError):
+        CFWSDiagnosis("COMMENT").__dict__
+
+
+def test_diagnosis_references():
+    d = InvalidDiagnosis.get("NODOMAIN")
+
+    assert [str(r) for r in d.references] == [
+        str(Reference("addr-spec")),
+        str(Reference("mailbox")),
+    ]
+    assert d.references is d.references
+    assert ValidDiagnosis.get().references is None
+
+
+def test_diagnosis_equality_by_code():
+    assert InvalidDiagnosis("NODOMAIN") == InvalidDiagnosis.get("NODOMAIN")
+    assert InvalidDiagnosis("NODOMAIN") != InvalidDiagnosis("NOLOCALPART")
+    assert BaseDiagnosis("a") != BaseDiagnosis("b")
+    assert BaseDiagnosis("a") != "a"
+
+
+def test_diagnosis_pickle():
+    d = RFC5321Diagnosis.get("TLD")
+
+    assert pickle.loads(pickle.dumps(d)) is d
+
+    d = RFC5321Diagnosis("TLD")
+    d.code = 100
+    result = pickle.loads(pickle.dumps(d))
+
+    assert result is not d
+    assert result.code == 100
+    assert repr(result) == repr(d)
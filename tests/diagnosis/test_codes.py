@@ -0,0 +1,43 @@
+import pickle
+
+import pytest
+
+from pyisemail.diagnosis import (
+    CODES,
+    DNSDiagnosis,
+    InvalidDiagnosis,
+    RFC5322Diagnosis,
+    ValidDiagnosis,
+    from_code,
+)
+
+
+def test_codes_cover_every_diagnosis():
+    for diagnosis_class in (DNSDiagnosis, InvalidDiagnosis, RFC5322Diagnosis):
+        for diagnosis_type, code in diagnosis_class.ERROR_CODES.items():
+            assert CODES[code][:2] == (diagnosis_class, diagnosis_type)
+
+    assert CODES[0][:2] == (ValidDiagnosis, "VALID")
+
+
+def test_codes_entry():
+    diagnosis_class, diagnosis_type, message, references = CODES[131]
+
+    assert diagnosis_class is InvalidDiagnosis
+    assert diagnosis_type == "NODOMAIN"
+    assert message == InvalidDiagnosis.get("NODOMAIN").message
+    assert references == ("addr-spec", "mailbox")
+
+
+def test_codes_pickle():
+    assert pickle.loads(pickle.dumps(CODES)) == CODES
+
+
+def test_from_code():
+    assert from_code(0) is ValidDiagnosis.get()
+    assert from_code(131) is InvalidDiagnosis.get("NODOMAIN")
+
+
+def test_from_unknown_code():
+    with pytest.raises(ValueError):
+        from_code(1000)
@@ -0,0 +1,139 @@
+import itertools
+import multiprocessing
+import sys
+
+import dns.resolver
+import pytest
+
+from pyisemail import BulkValidator, is_email_many
+from tests.validators import get_scenarios
+
+scenarios = get_scenarios("tests.xml")
+
+
+TRANSPORTS = [
+    "pickle",
+    pytest.param(
+        "shared_memory",
+        marks=pytest.mark.skipif(
+            sys.version_info < (3, 8), reason="needs multiprocessing.shared_memory"
+        ),
+    ),
+]
+
+
+@pytest.fixture(scope="module", params=TRANSPORTS)
+def transport(request):
+    return request.param
+
+
+@pytest.fixture(scope="module", params=[False, True], ids=["any", "affinity"])
+def validator(request, transport):
+    with BulkValidator(
+        workers=2,
+        chunk_size=7,
+        diagnose=True,
+        transport=transport,
+        affinity=request.param,
+    ) as validator:
+        yield validator
+
+
+def test_results_are_in_order(validator):
+    addresses = [address for _, address, _ in scenarios] * 3
+
+    assert list(validator.validate(addresses)) == is_email_many(
+        addresses, diagnose=True
+    )
+
+
+def test_input_is_read_as_needed(validator):
+    taken = []
+
+    def addresses():
+        for i in itertools.count():
+            taken.append(i)
+            yield "test%d@example.com" % i
+
+    results = validator.validate(addresses())
+
+    assert len(list(itertools.islice(results, 10))) == 10
+    # At most max_pending chunks ahead, or two blocks of them
+    assert len(taken) <= 10 + 2 * 4 * 7
+    results.close()
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="workers must inherit the fake resolver",
+)
+@pytest.mark.parametrize("transport", TRANSPORTS)
+def test_affinity_looks_up_each_domain_in_one_worker(transport, tmp_path, monkeypatch):
+    log = tmp_path / "queries"
+
+    def resolve(domain, *_):
+        with open(log, "a") as f:
+            f.write(domain + "\n")
+
+        raise dns.resolver.NXDOMAIN
+
+    monkeypatch.setattr(dns.resolver, "resolve", resolve)
+    domains = ["example%d.com" % i for i in range(10)]
+    addresses = ["test%d@%s" % (i, domains[i % 10]) for i in range(200)]
+    addresses += ["test@EXAMPLE0.COM"]
+
+    with BulkValidator(
+        workers=3,
+        chunk_size=5,
+        check_dns=True,
+        as_code=True,
+        transport=transport,
+        affinity=True,
+    ) as validator:
+        assert list(validator.validate(addresses)) == [6] * len(addresses)
+
+    assert sorted(log.read_text().split()) == domains
+
+
+def test_empty_input(validator):
+    assert list(validator.validate([])) == []
+    assert len(validator.collect([])) == 0
+
+
+def test_collect(validator):
+    addresses = [address for _, address, _ in scenarios] * 3
+    results = validator.collect(iter(addresses))
+
+    assert list(results) == is_email_many(addresses, diagnose=True)
+    assert results.domain(0) == addresses[0].rpartition("@")[2].lower()
+
+    with BulkValidator(workers=1) as verdicts:
+        with pytest.raises(ValueError):
+            verdicts.collect(addresses)
+
+
+@pytest.mark.parametrize("transport", TRANSPORTS)
+def test_options(transport):
+    addresses = ["test@example.com", "test@com", b"test@", "jörg@example.com"]
+
+    with BulkValidator(
+        workers=1, as_code=True, allow_gtld=False, transport=transport
+    ) as validator:
+        assert list(validator.validate(addresses)) == [0, 2, 131, 137]
+
+    assert validator.executors is None
+
+    with BulkValidator(workers=1, smtputf8=True, transport=transport) as validator:
+        assert list(validator.validate(addresses)) == [True, True, False, True]
+
+
+def test_defaults():
+    validator = BulkValidator(workers=3)
+
+    assert (validator.chunk_size, validator.max_pending) == (1000, 6)
+    assert validator.executors is None
+
+    with pytest.raises(ValueError):
+        BulkValidator(chunk_size=0)
+    with pytest.raises(ValueError):
+        BulkValidator(transport="carrier pigeon")
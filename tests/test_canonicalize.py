@@ -0,0 +1,51 @@
+import pytest
+
+import pyisemail
+from pyisemail import canonicalize
+from pyisemail.diagnosis import BaseDiagnosis
+from tests.validators import create_diagnosis, get_scenarios
+
+scenarios = get_scenarios("tests.xml")
+
+
+@pytest.mark.parametrize("test_id,address,diagnosis", scenarios)
+def test_canonical_form_is_stable(test_id, address, diagnosis):
+    canonical = canonicalize(address)
+
+    if canonical is None:
+        assert create_diagnosis(diagnosis) > BaseDiagnosis.CATEGORIES["RFC5322"]
+    elif "[" not in canonical or canonical.endswith("]"):
+        # Except for unclosed domain literals, which the parser lets through
+        # when they end in white space
+        assert canonicalize(canonical) == canonical, "%s (%s)" % (test_id, address)
+
+
+def test_equivalent_addresses():
+    assert (
+        canonicalize('"John"@EXAMPLE.com (x)')
+        == canonicalize("(comment) John @ example . com")
+        == canonicalize(b"John@example.com")
+        == "John@example.com"
+    )
+    assert canonicalize("john@example.com") != canonicalize("John@example.com")
+
+
+def test_invalid():
+    assert canonicalize("test@") is None
+    assert canonicalize("jörg@example.com") is None
+
+
+def test_smtputf8():
+    assert canonicalize('"jörg"@Example.com', smtputf8=True) == "jörg@example.com"
+
+
+def test_parser_is_reused(monkeypatch):
+    monkeypatch.setattr(pyisemail, "_POLICIES", {})
+
+    for smtputf8 in (False, True):
+        canonicalize("test@[192.0.2.1]", smtputf8=smtputf8)
+        canonicalize("other@[192.0.2.1]", smtputf8=smtputf8)
+        options = (False, False, True, False, smtputf8)
+        cache = pyisemail._POLICIES[options].parser.literal_validator.cache
+
+        assert cache.hits == 1
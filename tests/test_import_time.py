@@ -0,0 +1,75 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import pyisemail
+import pyisemail.diagnosis
+import pyisemail.validators
+
+# Modules that `import pyisemail` must not load, because they are slow to
+# import and only some callers need them
+LAZY = (
+    "dns",
+    "pyisemail.diagnosis.codes",
+    "pyisemail.reference",
+    "pyisemail.validators.address_list_parser",
+    "pyisemail.validators.address_scanner",
+    "pyisemail.validators.incremental_parser",
+    "pyisemail.validators.table_parser",
+)
+
+
+def import_times(statement):
+    """Return the cumulative import time of each module, in microseconds."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        env=env,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    times = {}
+
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+
+        _, cumulative, module = line.split("|")
+
+        if cumulative.strip().isdigit():
+            times[module.strip()] = int(cumulative)
+
+    return times
+
+
+def test_import_is_lazy():
+    times = import_times(
+        "import pyisemail\n"
+        "from pyisemail.validators import DNSValidator\n"
+        "pyisemail.is_email('test@example.com', diagnose=True)"
+    )
+
+    assert "pyisemail" in times
+    for module in times:
+        assert not module.startswith(LAZY), "%s was imported" % module
+
+
+def test_lazy_attributes():
+    assert pyisemail.Reference.__name__ == "Reference"
+    assert pyisemail.diagnosis.CODES[0][1] == "VALID"
+    assert pyisemail.diagnosis.from_code(0).code == 0
+
+    for name in pyisemail.validators.__all__:
+        assert getattr(pyisemail.validators, name).__name__ == name
+        assert name in dir(pyisemail.validators)
+
+
+@pytest.mark.parametrize(
+    "module", [pyisemail, pyisemail.diagnosis, pyisemail.validators]
+)
+def test_unknown_attributes(module):
+    with pytest.raises(AttributeError):
+        module.Missing
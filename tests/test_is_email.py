@@ -1,7 +1,9 @@
+import itertools
+
 import dns.resolver
 import pytest
 
-from pyisemail import is_email
+from pyisemail import is_email, is_email_many, iter_validate
 from pyisemail.diagnosis import (
     BaseDiagnosis,
     DNSDiagnosis,
@@ -70,3 +72,113 @@ def test_gtld_with_diagnosis():
 def test_gtld_without_diagnosis():
     assert is_email("a@b", diagnose=True) == ValidDiagnosis()
     assert is_email("a@b", allow_gtld=False, diagnose=True) == GTLDDiagnosis("GTLD")
+
+
+@pytest.mark.parametrize("test_id,address,diagnosis", scenarios)
+def test_as_code(test_id, address, diagnosis):
+    result = is_email(address, as_code=True)
+    expected = create_diagnosis(diagnosis).code
+
+    assert result == expected, "%s (%s): Got %s, but expected %s." % (
+        test_id,
+        address,
+        result,
+        expected,
+    )
+
+
+def test_dns_as_code(monkeypatch):
+    monkeypatch.setattr(dns.resolver, "resolve", side_effect)
+
+    assert is_email("test@example.com", check_dns=True, as_code=True) == 6
+    assert is_email("a@b", allow_gtld=False, as_code=True) == 2
+
+
+def test_bytes():
+    assert is_email(b"test@example.com") == True
+    assert is_email(b"test@com", allow_gtld=False) == False
+    assert is_email(memoryview(b"test@example.com"), diagnose=True) == ValidDiagnosis()
+
+
+def test_smtputf8():
+    assert is_email("jörg@example.com") == False
+    assert is_email("jörg@example.com", smtputf8=True) == True
+    assert (
+        is_email("jörg@example.com", diagnose=True, smtputf8=True) == ValidDiagnosis()
+    )
+    assert is_email("jörg@example.com", as_code=True, smtputf8=True) == 0
+
+
+@pytest.mark.parametrize(
+    "flags",
+    [{}, {"diagnose": True}, {"as_code": True}, {"allow_gtld": False}],
+)
+def test_many(flags):
+    addresses = [address for _, address, _ in scenarios] * 2
+
+    assert is_email_many(addresses, **flags) == [
+        is_email(address, **flags) for address in addresses
+    ]
+
+
+def test_many_looks_up_each_domain_once(monkeypatch):
+    queries = []
+
+    def count(domain, *_):
+        queries.append(domain)
+        raise dns.resolver.NoAnswer
+
+    monkeypatch.setattr(dns.resolver, "resolve", count)
+    addresses = ["a@example.com", "b@example.com", "a@example.com", "c@example.org"]
+
+    assert is_email_many(addresses, check_dns=True, as_code=True) == [6, 6, 6, 6]
+    # An MX query, then an A query when there is no MX record
+    assert queries == ["example.com", "example.com", "example.org", "example.org"]
+
+
+def test_many_buffers():
+    addresses = (bytearray(b"test@example.com"), memoryview(b"test@"), "test@b.com")
+
+    assert is_email_many(addresses) == [True, False, True]
+    assert is_email_many(iter([])) == []
+
+
+def test_iter_validate():
+    addresses = [address for _, address, _ in scenarios]
+    results = iter_validate(iter(addresses), diagnose=True)
+
+    assert list(results) == [
+        (address, is_email(address, diagnose=True)) for address in addresses
+    ]
+
+
+@pytest.mark.parametrize("check_dns", [False, True])
+def test_iter_validate_is_lazy(check_dns, monkeypatch):
+    monkeypatch.setattr(dns.resolver, "resolve", side_effect)
+    taken = []
+
+    def addresses():
+        for i in itertools.count():
+            taken.append(i)
+            yield "test%d@example%d.com" % (i, i % 3)
+
+    results = iter_validate(addresses(), check_dns=check_dns, window=4)
+
+    assert [r for _, r in itertools.islice(results, 10)] == [not check_dns] * 10
+    assert len(taken) <= 10 + 4
+    results.close()
+
+
+def test_iter_validate_looks_up_each_domain_once(monkeypatch):
+    queries = []
+
+    def count(domain, *_):
+        queries.append(domain)
+        raise dns.resolver.NXDOMAIN
+
+    monkeypatch.setattr(dns.resolver, "resolve", count)
+    addresses = ["test%d@example%d.com" % (i, i % 3) for i in range(30)]
+    results = list(iter_validate(addresses, check_dns=True, as_code=True, window=8))
+
+    assert results == [(address, 6) for address in addresses]
+    assert sorted(queries) == ["example0.com", "example1.com", "example2.com"]
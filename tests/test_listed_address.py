@@ -0,0 +1,22 @@
+import pytest
+
+from pyisemail import ListedAddress, ParsedAddress
+from pyisemail.diagnosis import ValidDiagnosis
+
+
+def test_components():
+    listed = ListedAddress(
+        "test", "example.com", ValidDiagnosis(), "Test", "Team", 12, 28
+    )
+
+    assert isinstance(listed, ParsedAddress)
+    assert listed.labels == ("example", "com")
+    assert (listed.display_name, listed.group) == ("Test", "Team")
+    assert (listed.start, listed.end) == (12, 28)
+
+
+def test_slots():
+    listed = ListedAddress("test", "example.com", ValidDiagnosis(), None, None, 0, 16)
+
+    with pytest.raises(AttributeError):
+        listed.other = True
@@ -0,0 +1,69 @@
+import pytest
+
+from pyisemail import ParsedAddress
+from pyisemail.diagnosis import (
+    InvalidDiagnosis,
+    RFC5321Diagnosis,
+    ValidDiagnosis,
+)
+
+
+def test_components():
+    parsed = ParsedAddress("test", "mail.example.com", ValidDiagnosis())
+
+    assert parsed.local_part == "test"
+    assert parsed.domain == "mail.example.com"
+    assert parsed.labels == ("mail", "example", "com")
+    assert not parsed.literal
+    assert parsed.diagnosis == ValidDiagnosis()
+
+
+def test_domain_literal():
+    parsed = ParsedAddress("test", "[1.2.3.4]", RFC5321Diagnosis("ADDRESSLITERAL"))
+
+    assert parsed.literal
+    assert parsed.labels == ()
+
+
+def test_no_domain():
+    assert ParsedAddress("test", "", ValidDiagnosis()).labels == ()
+
+
+def test_slots():
+    parsed = ParsedAddress("test", "example.com", ValidDiagnosis())
+
+    with pytest.raises(AttributeError):
+        parsed.other = True
+
+
+def test_equality():
+    parsed = ParsedAddress("test", "example.com", ValidDiagnosis())
+
+    assert parsed == ParsedAddress("test", "example.com", ValidDiagnosis())
+    assert parsed != ParsedAddress("other", "example.com", ValidDiagnosis())
+    assert hash(parsed) == hash(ParsedAddress("test", "example.com", ValidDiagnosis()))
+
+
+@pytest.mark.parametrize(
+    "local_part,domain,canonical",
+    [
+        ("test", "Example.COM", "test@example.com"),
+        ('"test"', "example.com", "test@example.com"),
+        ('"te\\st"', "example.com", "test@example.com"),
+        ('"te"."st"', "example.com", "te.st@example.com"),
+        ('"te st"', "example.com", '"te st"@example.com'),
+        ('"te\\"st\\\\"', "example.com", '"te\\"st\\\\"@example.com'),
+        ('te."".st', "example.com", '"te..st"@example.com'),
+        ('""', "example.com", '""@example.com'),
+        ("Test", "[IPv6:ABCD::1]", "Test@[IPv6:ABCD::1]"),
+        ('"jörg"', "example.com", "jörg@example.com"),
+    ],
+)
+def test_canonical(local_part, domain, canonical):
+    assert ParsedAddress(local_part, domain, ValidDiagnosis()).canonical == canonical
+
+
+def test_canonical_of_error():
+    parsed = ParsedAddress("test", "", InvalidDiagnosis("NODOMAIN"))
+
+    assert parsed.canonical is None
@@ -0,0 +1,80 @@
+import pytest
+
+from pyisemail import Pipeline, Policy, Stage
+from pyisemail.diagnosis import (
+    DNSDiagnosis,
+    GTLDDiagnosis,
+    InvalidDiagnosis,
+    RFC5322Diagnosis,
+    ValidDiagnosis,
+)
+from pyisemail.validators import DNSValidator, GTLDValidator
+from tests.validators import FakeResolver, create_diagnosis, get_scenarios
+
+scenarios = get_scenarios("tests.xml")
+
+
+class Blocklist(Stage):
+    cost = 10
+    ceiling = RFC5322Diagnosis.ERROR_CODES["DOMAIN"]
+
+    def __init__(self, domains):
+        self.domains = domains
+        self.checked = []
+
+    def is_valid(self, address, diagnose=False):
+        self.checked.append(address.domain)
+
+        if address.domain in self.domains:
+            return RFC5322Diagnosis.get("DOMAIN")
+
+        return ValidDiagnosis.get()
+
+
+def test_stages_run_cheapest_first():
+    dns_validator, gtld_validator = DNSValidator(), GTLDValidator()
+    blocklist = Blocklist(())
+    pipeline = Pipeline([dns_validator, blocklist, gtld_validator])
+
+    assert pipeline.stages == [gtld_validator, blocklist, dns_validator]
+
+
+def test_verdict_skips_expensive_stages():
+    resolver = FakeResolver()
+    pipeline = Pipeline([DNSValidator(resolver), GTLDValidator()])
+
+    assert pipeline.diagnose("test@com", 1) == GTLDDiagnosis("GTLD")
+    assert resolver.queries == []
+
+    assert pipeline.diagnose("test@com") == DNSDiagnosis("NO_RECORD")
+    assert resolver.queries == ["com"]
+
+
+def test_stages_above_their_ceiling_are_skipped():
+    resolver = FakeResolver()
+    pipeline = Pipeline([DNSValidator(resolver)])
+
+    assert pipeline.diagnose("test@") == InvalidDiagnosis("NODOMAIN")
+    assert pipeline.diagnose('"test"@example.com').diagnosis_type == "QUOTEDSTRING"
+    assert resolver.queries == []
+
+
+def test_custom_stage():
+    blocklist = Blocklist(("example.net",))
+    policy = Policy(stages=[blocklist], diagnose=True)
+
+    assert policy.validate("test@example.com") == ValidDiagnosis()
+    assert policy.validate("test@example.net") == RFC5322Diagnosis("DOMAIN")
+    assert not Policy(stages=[blocklist]).validate("test@example.net")
+    assert policy.validate("test@") == InvalidDiagnosis("NODOMAIN")
+    assert blocklist.checked == ["example.com", "example.net", "example.net"]
+
+
+def test_stage_is_abstract():
+    with pytest.raises(NotImplementedError):
+        Stage().is_valid(None)
+
+
+@pytest.mark.parametrize("test_id,address,diagnosis", scenarios)
+def test_without_stages(test_id, address, diagnosis):
+    assert Pipeline().diagnose(address) == create_diagnosis(diagnosis)
@@ -0,0 +1,105 @@
+import dns.resolver
+import pytest
+
+from pyisemail import Policy, is_email
+from pyisemail.diagnosis import DNSDiagnosis, GTLDDiagnosis, ValidDiagnosis
+from pyisemail.validators import ParserValidator
+from tests.validators import FakeResolver, create_diagnosis, get_scenarios
+
+scenarios = get_scenarios("tests.xml")
+
+
+def side_effect(*_):
+    raise dns.resolver.NoAnswer
+
+
+@pytest.mark.parametrize("test_id,address,diagnosis", scenarios)
+def test_matches_is_email(test_id, address, diagnosis):
+    expected = create_diagnosis(diagnosis)
+
+    assert Policy(diagnose=True).validate(address) == expected
+    assert Policy(as_code=True).validate(address) == expected.code
+    assert Policy().validate(address) == is_email(address)
+
+
+def test_dns(monkeypatch):
+    monkeypatch.setattr(dns.resolver, "resolve", side_effect)
+    policy = Policy(check_dns=True, diagnose=True)
+
+    assert policy.validate("test@example.com") == DNSDiagnosis("NO_RECORD")
+    assert not Policy(check_dns=True).validate("test@example.com")
+
+
+def test_resolver():
+    resolver = FakeResolver()
+    policy = Policy(check_dns=True, as_code=True, resolver=resolver)
+
+    assert policy.validate("test@example.com") == 6
+    assert policy.validate("test@[127.0.0.1]") == 12  # ADDRESSLITERAL
+    assert resolver.queries == ["example.com"]
+
+
+def test_gtld():
+    assert Policy(allow_gtld=False, diagnose=True).validate("a@b") == GTLDDiagnosis(
+        "GTLD"
+    )
+    assert Policy(diagnose=True).validate("a@b") == ValidDiagnosis()
+
+
+def test_parser():
+    parser = ParserValidator(engine="table", smtputf8=True)
+    policy = Policy(parser=parser)
+
+    assert policy.parser is parser
+    assert policy.validate("jörg@example.com")
+    assert not Policy().validate("jörg@example.com")
+    assert Policy(smtputf8=True).validate("jörg@example.com")
+
+
+def test_validators_are_only_built_when_needed():
+    policy = Policy()
+
+    assert policy.dns_validator is None
+    assert policy.gtld_validator is None
+    assert Policy(check_dns=True, allow_gtld=False).dns_validator is not None
+
+
+def test_repr():
+    assert repr(Policy(diagnose=True)) == (
+        "<Policy: check_dns=False, diagnose=True, allow_gtld=True, as_code=False, "
+        "smtputf8=False>"
+    )
+
+
+def test_iter_validate_raises_failed_lookups():
+    class FlakyResolver(FakeResolver):
+        def resolve(self, domain, *args):
+            self.queries.append(domain)
+
+            if len(self.queries) == 1:
+                raise RuntimeError("network down")
+
+            raise dns.resolver.NXDOMAIN
+
+    resolver = FlakyResolver()
+    policy = Policy(check_dns=True, as_code=True, resolver=resolver)
+    results = policy.iter_validate(["a@example.com", "b@example.com"], window=1)
+
+    with pytest.raises(RuntimeError):
+        next(results)
+
+    results = policy.iter_validate(["a@example.com", "b@example.com"], window=1)
+
+    assert list(results) == [("a@example.com", 6), ("b@example.com", 6)]
+    assert resolver.queries == ["example.com", "example.com"]
+
+
+def test_dns_cache():
+    resolver = FakeResolver()
+    policy = Policy(check_dns=True, resolver=resolver, dns_cache_size=2)
+
+    for address in ["a@example.com", "b@example.com", "a@example.org"]:
+        assert not policy.validate(address)
+
+    assert list(policy.iter_validate(["c@example.com"])) == [("c@example.com", False)]
+    assert resolver.queries == ["example.com", "example.org"]
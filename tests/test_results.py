@@ -0,0 +1,83 @@
+import pytest
+
+from pyisemail import Results, is_email, is_email_many
+from pyisemail.diagnosis import InvalidDiagnosis, ValidDiagnosis
+
+ADDRESSES = [
+    "test@example.com",
+    "other@EXAMPLE.com",
+    b"test@example.org",
+    bytearray(b"test@"),
+    "test",
+    "a@b@example.org",
+]
+
+
+@pytest.fixture
+def results():
+    results = Results()
+    results.extend(ADDRESSES, is_email_many(ADDRESSES, as_code=True))
+
+    return results
+
+
+def test_diagnoses_come_from_the_codes(results):
+    assert len(results) == len(ADDRESSES)
+    assert list(results) == [is_email(a, diagnose=True) for a in ADDRESSES]
+    assert results[0] == ValidDiagnosis()
+    assert results[-2] == InvalidDiagnosis("NODOMAIN")
+    assert results[0] is results[1]
+
+
+def test_domains_are_interned(results):
+    assert results.domains == ["example.com", "example.org", ""]
+    assert list(results.domain_ids) == [0, 0, 1, 2, 2, 1]
+    assert results.domain(1) == "example.com"
+    assert results.domain(4) == ""
+
+
+def test_a_few_bytes_each(results):
+    assert results.codes.itemsize + results.domain_ids.itemsize <= 6
+    assert repr(results) == "<Results: 6 addresses at 3 domains>"
+
+
+def test_to_arrow(results):
+    pyarrow = pytest.importorskip("pyarrow")
+    table = results.to_arrow()
+
+    assert table.column_names == ["code", "domain"]
+    assert table.schema.field("code").type == pyarrow.uint16()
+    assert table.column("code").to_pylist() == list(results.codes)
+    assert table.column("domain").to_pylist() == [
+        results.domain(i) for i in range(len(results))
+    ]
+
+    # The table is a copy, so the results can still grow
+    results.append("test@example.net", 0)
+
+    assert table.num_rows == len(ADDRESSES)
+
+
+def test_write_ipc(results, tmp_path):
+    pyarrow = pytest.importorskip("pyarrow")
+    import pyarrow.ipc
+
+    path = str(tmp_path / "results.arrow")
+    results.write_ipc(path)
+
+    with pyarrow.memory_map(path) as source:
+        assert pyarrow.ipc.open_file(source).read_all().equals(results.to_arrow())
+
+
+def test_write_parquet(results, tmp_path):
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet
+
+    path = str(tmp_path / "results.parquet")
+    results.write_parquet(path, compression="zstd")
+    table = pyarrow.parquet.read_table(path)
+
+    assert table.column("code").to_pylist() == list(results.codes)
+    assert table.column("domain").to_pylist() == [
+        results.domain(i) for i in range(len(results))
+    ]
@@ -0,0 +1,34 @@
+from pyisemail.utils import LRUCache
+
+
+def test_lru_cache_get():
+    cache = LRUCache(2)
+    cache["a"] = 1
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("b", 2) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache["a"] = 1
+    cache["b"] = 2
+    cache.get("a")
+    cache["c"] = 3
+
+    assert len(cache) == 2
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+
+
+def test_lru_cache_clear():
+    cache = LRUCache(2)
+    cache["a"] = 1
+    cache.get("a")
+    cache.clear()
+
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
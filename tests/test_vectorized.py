@@ -0,0 +1,184 @@
+import dns.resolver
+import pytest
+
+from pyisemail import is_email
+from tests.validators import get_scenarios
+
+np = pytest.importorskip("numpy")
+vectorized = pytest.importorskip("pyisemail.vectorized")
+
+scenarios = get_scenarios("tests.xml")
+
+# Addresses that the prefilter settles, or almost does
+PLAIN = [
+    "test@example.com",
+    "first.last@sub.example.com",
+    "a-b@a-b.c-d",
+    "a-.b@c",
+    "test@123",
+    "test",
+    "first.last",
+    "test@",
+    "@example.com",
+    ".test@example.com",
+    "test.@example.com",
+    "te..st@example.com",
+    "test@.example.com",
+    "test@example..com",
+    "test@example.com.",
+    "test@-example.com",
+    "test@example-.com",
+    "test@example.com-",
+    "test@ex_ample.com",
+    "test@@example.com",
+    "test@example@com",
+    "te st@example.com",
+    "test@example.com\0",
+    "jörg@example.com",
+    "a" * 64 + "@example.com",
+    "a" * 65 + "@example.com",
+    "test@" + "a" * 63 + ".com",
+    "test@" + "a" * 64 + ".com",
+    "test@com." + "a" * 64,
+    "test@" + ".".join(["a" * 63] * 4),
+    "test@" + ".".join(["a" * 63] * 5),
+    "a" * 64 + "@" + ".".join(["a" * 63] * 3) + ".a" * 16,
+]
+ADDRESSES = [address for _, address, _ in scenarios] + PLAIN
+
+
+def expected(addresses, **options):
+    codes = [is_email(a, as_code=True, **options) for a in addresses]
+    valid = [is_email(a, **options) for a in addresses]
+
+    return valid, codes
+
+
+@pytest.mark.parametrize("smtputf8", [False, True])
+@pytest.mark.parametrize("allow_gtld", [True, False])
+def test_matches_is_email(allow_gtld, smtputf8):
+    valid, codes = vectorized.validate_array(
+        np.array(ADDRESSES, dtype=object),
+        allow_gtld=allow_gtld,
+        smtputf8=smtputf8,
+        block_size=7,
+    )
+
+    assert (valid.tolist(), codes.tolist()) == expected(
+        ADDRESSES, allow_gtld=allow_gtld, smtputf8=smtputf8
+    )
+    assert valid.dtype == bool
+    assert codes.dtype == np.uint16
+
+
+def test_fixed_width_arrays():
+    # Fixed-width arrays have already lost any trailing NULs
+    addresses = [a for a in ADDRESSES if not a.endswith("\0")]
+
+    for values in (np.array(addresses), np.char.encode(addresses, "utf-8")):
+        valid, codes = vectorized.validate_array(values)
+
+        assert (valid.tolist(), codes.tolist()) == expected(list(values))
+
+
+def test_object_arrays_of_bytes_and_long_values():
+    addresses = [b"test@example.com", bytearray(b"test@"), "a" * 400 + "@example"]
+    valid, codes = vectorized.validate_array(np.array(addresses, dtype=object))
+
+    assert (valid.tolist(), codes.tolist()) == expected(addresses)
+
+
+def test_only_ambiguous_rows_are_parsed(monkeypatch):
+    parsed = []
+    validate_many = vectorized.Policy.validate_many
+
+    def spy(self, addresses):
+        parsed.extend(addresses)
+        return validate_many(self, addresses)
+
+    monkeypatch.setattr(vectorized.Policy, "validate_many", spy)
+    vectorized.validate_array(
+        np.array(["test@example.com", "test", "te st@example.com", "a@b"] * 3)
+    )
+
+    assert parsed == ["te st@example.com"] * 3
+
+
+def test_dns_checks_settled_rows(monkeypatch):
+    def resolve(domain, *args):
+        raise dns.resolver.NXDOMAIN
+
+    monkeypatch.setattr(dns.resolver, "resolve", resolve)
+    addresses = ["test@example.com", "test", "test@"]
+    valid, codes = vectorized.validate_array(np.array(addresses), check_dns=True)
+
+    assert (valid.tolist(), codes.tolist()) == expected(addresses, check_dns=True)
+    assert codes[0] == 6
+
+
+def test_long_addresses_only_widen_their_block(monkeypatch):
+    widths = []
+    prefilter = vectorized._prefilter
+
+    def spy(characters, lengths):
+        widths.append(characters.shape[1])
+        return prefilter(characters, lengths)
+
+    monkeypatch.setattr(vectorized, "_prefilter", spy)
+    addresses = ["test@example.com"] * 8
+    addresses[5] = "a" * 300 + "@example.com"
+    addresses[6] = "a" * 400 + "@example.com"
+
+    for values in (np.array(addresses, dtype=object), np.array(addresses)):
+        del widths[:]
+        valid, codes = vectorized.validate_array(values, block_size=4)
+
+        assert (valid.tolist(), codes.tolist()) == expected(addresses)
+        # The longest is left to the parser, rather than widening its block
+        assert widths == [16, 312]
+
+
+def test_missing_values():
+    addresses = ["test@example.com", None, float("nan"), "test", None]
+    valid, codes = vectorized.validate_array(np.array(addresses, dtype=object))
+
+    assert valid.tolist() == [True, False, False, False, False]
+    assert codes.tolist() == [0, 131, 131, 131, 131]
+
+
+def test_empty_and_invalid_arrays():
+    valid, codes = vectorized.validate_array(np.array([], dtype=str))
+
+    assert len(valid) == len(codes) == 0
+
+    with pytest.raises(ValueError):
+        vectorized.validate_array(np.array([["test@example.com"]]))
+
+    with pytest.raises(TypeError):
+        vectorized.validate_array(np.array([1, 2]))
+
+
+def test_series_accessor():
+    pd = pytest.importorskip("pandas")
+    series = pd.Series(
+        ["test@example.com", "test", None, float("nan"), pd.NA],
+        index=["a", "b", "c", "d", "e"],
+    )
+    results = series.isemail.validate(allow_gtld=False)
+
+    assert list(results.index) == ["a", "b", "c", "d", "e"]
+    assert results["valid"].tolist() == [True, False, False, False, False]
+    assert results["code"].tolist() == [
+        is_email("test@example.com", allow_gtld=False, as_code=True),
+        is_email("test", allow_gtld=False, as_code=True),
+        131,
+        131,
+        131,
+    ]
+
+
+def test_string_dtype_series_accessor():
+    pd = pytest.importorskip("pandas")
+    series = pd.Series(["test@example.com", None], dtype="string")
+
+    assert series.isemail.validate()["valid"].tolist() == [True, False]
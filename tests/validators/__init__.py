@@ -2,6 +2,8 @@ import os
 import sys
 import xml.etree.ElementTree as ET
 
+import dns.resolver
+
 from pyisemail.diagnosis import (
     CFWSDiagnosis,
     DeprecatedDiagnosis,
@@ -12,7 +14,19 @@ from pyisemail.diagnosis import (
     ValidDiagnosis,
 )
 
-__all__ = ["create_diagnosis", "get_scenarios"]
+__all__ = ["FakeResolver", "create_diagnosis", "get_scenarios"]
+
+
+class FakeResolver(object):
+
+    """A resolver that finds no domain, and notes each one it is asked for."""
+
+    def __init__(self):
+        self.queries = []
+
+    def resolve(self, domain, *args):
+        self.queries.append(domain)
+        raise dns.resolver.NXDOMAIN
 
 
 def create_diagnosis(tag):
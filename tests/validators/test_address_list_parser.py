@@ -0,0 +1,109 @@
+import pytest
+
+from pyisemail.diagnosis import (
+    InvalidDiagnosis,
+    RFC5321Diagnosis,
+    ValidDiagnosis,
+)
+from pyisemail.validators import AddressListParser, ParserValidator
+from tests.validators import create_diagnosis, get_scenarios
+
+scenarios = get_scenarios("tests.xml")
+
+
+def parse(header, **options):
+    return list(AddressListParser(ParserValidator(**options)).parse(header))
+
+
+def test_mailboxes():
+    header = (
+        'Alice <alice@example.com>, "Bob, Jr." <bob@example.com> (home), '
+        "carol@example.com"
+    )
+    listed = parse(header)
+
+    assert [header[a.start : a.end] for a in listed] == [
+        "alice@example.com",
+        "bob@example.com",
+        "carol@example.com",
+    ]
+    assert [a.display_name for a in listed] == ["Alice", '"Bob, Jr."', None]
+    assert [a.diagnosis for a in listed] == [ValidDiagnosis()] * 3
+
+
+def test_groups():
+    header = "Team: dave@example.com, Eve <eve@[192.0.2.1]>;, frank@example.com"
+    listed = parse(header)
+
+    assert [(a.local_part, a.group) for a in listed] == [
+        ("dave", "Team"),
+        ("eve", "Team"),
+        ("frank", None),
+    ]
+    assert listed[1].diagnosis == RFC5321Diagnosis("ADDRESSLITERAL")
+    assert parse("undisclosed-recipients:;") == []
+
+
+@pytest.mark.parametrize(
+    "header,addr_specs",
+    [
+        (" , ,test@example.com,, ", ["test@example.com"]),
+        ("test (with, comma) @example.com", ["test (with, comma) @example.com"]),
+        ('"with, comma"@example.com', ['"with, comma"@example.com']),
+        (
+            "<test@example.com, other@example.com",
+            ["<test@example.com", "other@example.com"],
+        ),
+        ("<test@example.com> junk", ["test@example.com> junk"]),
+        ("<>", [""]),
+    ],
+)
+def test_addr_specs(header, addr_specs):
+    assert [header[a.start : a.end] for a in parse(header)] == addr_specs
+
+
+def test_stray_brackets_are_invalid():
+    for header in ["<test@example.com", "<test@example.com> junk", "<>"]:
+        assert parse(header)[0].diagnosis > ValidDiagnosis()
+
+
+@pytest.mark.parametrize("test_id,address,diagnosis", scenarios)
+def test_agrees_with_scenarios(test_id, address, diagnosis):
+    v = ParserValidator()
+    header = "Someone <%s>, other@example.com" % address
+    listed = parse(header)
+
+    if header[listed[0].start : listed[0].end] == address:
+        assert listed[0].diagnosis == create_diagnosis(diagnosis)
+        assert listed[0].local_part == v.parse(address).local_part
+        assert listed[-1].diagnosis == ValidDiagnosis()
+
+
+def test_smtputf8_offsets():
+    header = 'Jörg <jörg@example.com>, "用 户"@example.com'
+    listed = parse(header, smtputf8=True)
+
+    assert [header[a.start : a.end] for a in listed] == [
+        "jörg@example.com",
+        '"用 户"@example.com',
+    ]
+    assert [a.local_part for a in parse(header.encode("utf-8"), smtputf8=True)] == [
+        "jörg",
+        '"用 户"',
+    ]
+
+
+def test_max_length():
+    listed = parse("a@example.com, %s@example.com" % ("a" * 300), max_length=254)
+
+    assert listed[0].diagnosis == ValidDiagnosis()
+    assert listed[1].diagnosis == InvalidDiagnosis("INPUT_TOOLONG")
+
+
+def test_bytes():
+    listed = parse(b"Alice <alice@example.com>, bob@example.com")
+
+    assert [(a.local_part, a.domain) for a in listed] == [
+        ("alice", "example.com"),
+        ("bob", "example.com"),
+    ]
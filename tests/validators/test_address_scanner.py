@@ -0,0 +1,86 @@
+import io
+import random
+
+import pytest
+
+from pyisemail.diagnosis import (
+    InvalidDiagnosis,
+    RFC5321Diagnosis,
+    ValidDiagnosis,
+)
+from pyisemail.validators import AddressScanner, ParserValidator
+
+TEXT = (
+    b"From: Alice <alice@example.com>\n"
+    b"To: bob.smith+tag@mail.example.org, ...carol@[192.0.2.1].\n"
+    b"log user=dave@example.com; x@ @y bad..dots@example.com a@b..c\n"
+    b"\xc3\xa9l\xc3\xa8ve@example.com\n"
+)
+
+
+def test_scan():
+    assert list(AddressScanner().scan(TEXT)) == [
+        (13, "alice@example.com", ValidDiagnosis()),
+        (36, "bob.smith+tag@mail.example.org", ValidDiagnosis()),
+        (71, "carol@[192.0.2.1]", RFC5321Diagnosis("ADDRESSLITERAL")),
+        (94, "user=dave@example.com", ValidDiagnosis()),
+        (123, "bad..dots@example.com", InvalidDiagnosis("CONSECUTIVEDOTS")),
+        (145, "a@b..c", InvalidDiagnosis("CONSECUTIVEDOTS")),
+        (157, "ve@example.com", ValidDiagnosis()),
+    ]
+
+
+def test_scan_smtputf8():
+    scanner = AddressScanner(ParserValidator(smtputf8=True))
+
+    assert list(scanner.scan(TEXT))[-1] == (152, "élève@example.com", ValidDiagnosis())
+
+
+def test_overlong_local_part_is_skipped():
+    assert list(AddressScanner().scan(b"a" * 300 + b"@example.com")) == []
+
+
+def test_offset():
+    scanner = AddressScanner()
+
+    assert [r[0] for r in scanner.scan(TEXT, 1000)][0] == 1013
+
+
+def test_scan_file(tmp_path):
+    path = tmp_path / "mbox"
+    path.write_bytes(TEXT)
+    expected = list(AddressScanner().scan(TEXT))
+
+    assert list(AddressScanner().scan_file(path)) == expected
+    assert list(AddressScanner().scan_file(str(path))) == expected
+
+    with open(path, "rb") as f:
+        assert list(AddressScanner().scan_file(f)) == expected
+
+
+def test_scan_empty_file(tmp_path):
+    path = tmp_path / "mbox"
+    path.write_bytes(b"")
+
+    assert list(AddressScanner().scan_file(path)) == []
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 4096])
+def test_chunks_agree_with_whole_text(chunk_size):
+    r = random.Random(chunk_size)
+    pieces = [b"a", b"b.c", b"@", b" ", b"\n", b"x@y.com", b"..", b"[1.2.3.4]"]
+    scanner = AddressScanner(chunk_size=chunk_size)
+
+    for _ in range(50):
+        text = b"".join(r.choice(pieces) for _ in range(r.randint(0, 400)))
+
+        # BytesIO can't be memory-mapped, so it is read a chunk at a time
+        assert list(scanner.scan_file(io.BytesIO(text))) == list(scanner.scan(text))
+
+
+def test_cache():
+    scanner = AddressScanner(cache_size=16)
+    list(scanner.scan(b"test@example.com test@example.com other@example.com"))
+
+    assert (scanner.cache.hits, scanner.cache.misses) == (1, 2)
+    assert AddressScanner(cache_size=None).cache is None
@@ -5,7 +5,7 @@ import dns.resolver
 import pytest
 
 from pyisemail.diagnosis import DNSDiagnosis, RFC5321Diagnosis, ValidDiagnosis
-from pyisemail.validators import DNSValidator
+from pyisemail.validators import DNSValidator, ParserValidator
 
 is_valid = DNSValidator().is_valid
 
@@ -210,3 +210,24 @@ def test_zero_preference_mx_record_with_diagnosis(monkeypatch):
     monkeypatch.setattr(dns.resolver, "resolve", zero_preference_mx_record)
 
     assert is_valid("example.com", diagnose=True) == ValidDiagnosis()
+
+
+def test_parsed_address(monkeypatch):
+    monkeypatch.setattr(dns.resolver, "resolve", no_record_side_effect)
+
+    parsed = ParserValidator().parse("test@iana.123")
+
+    assert is_valid(parsed, diagnose=True) == RFC5321Diagnosis("TLDNUMERIC")
+
+
+def test_resolver():
+    class Resolver(object):
+        def resolve(self, domain, *args):
+            self.domain = domain
+            raise dns.resolver.NXDOMAIN
+
+    resolver = Resolver()
+    result = DNSValidator(resolver).is_valid("example.com", diagnose=True)
+
+    assert result == DNSDiagnosis("NO_RECORD")
+    assert resolver.domain == "example.com"
@@ -0,0 +1,19 @@
+from pyisemail.diagnosis import GTLDDiagnosis, ValidDiagnosis
+from pyisemail.validators import GTLDValidator, ParserValidator
+
+is_valid = GTLDValidator().is_valid
+
+
+def test_domain():
+    assert is_valid("example.com") == ValidDiagnosis()
+
+
+def test_gtld():
+    assert is_valid("com") == GTLDDiagnosis("GTLD")
+
+
+def test_parsed_address():
+    parse = ParserValidator().parse
+
+    assert is_valid(parse("test@example.com")) == ValidDiagnosis()
+    assert is_valid(parse("test@com")) == GTLDDiagnosis("GTLD")
@@ -0,0 +1,84 @@
+import pytest
+
+from pyisemail.diagnosis import BaseDiagnosis, InvalidDiagnosis, ValidDiagnosis
+from pyisemail.validators import IncrementalParser, ParserValidator
+from tests.validators import create_diagnosis, get_scenarios
+
+scenarios = get_scenarios("tests.xml")
+
+
+@pytest.mark.parametrize("test_id,address,diagnosis", scenarios)
+def test_fed_a_character_at_a_time(test_id, address, diagnosis):
+
+    p = IncrementalParser()
+    v = ParserValidator(fast_path=False, engine="table")
+
+    for i, c in enumerate(address):
+        p.feed(c)
+        assert p.final_status() == v.is_email(address[: i + 1], True)
+
+    assert p.final_status() == create_diagnosis(diagnosis)
+
+
+@pytest.mark.parametrize("test_id,address,diagnosis", scenarios)
+def test_without_diagnosis(test_id, address, diagnosis):
+
+    result = IncrementalParser(diagnose=False).feed(address).final_status()
+    expected = create_diagnosis(diagnosis)
+
+    assert (result < BaseDiagnosis.CATEGORIES["THRESHOLD"]) == (
+        expected < BaseDiagnosis.CATEGORIES["THRESHOLD"]
+    )
+
+
+def test_rewind():
+
+    p = IncrementalParser().feed('"test"')
+    checkpoint = p.checkpoint()
+
+    p.feed("(comment @example.com")
+    assert p.final_status() == InvalidDiagnosis("UNCLOSEDCOMMENT")
+
+    p.rewind(checkpoint)
+    p.feed("@example.com")
+    assert p.final_status() == ParserValidator().is_email('"test"@example.com', True)
+    assert p.text(p.local_part) == '"test"'
+    assert p.text(p.domain) == "example.com"
+
+    p.rewind(checkpoint)
+    p.feed("x@example.com")
+    assert p.final_status() == InvalidDiagnosis("ATEXT_AFTER_QS")
+
+
+def test_rewind_after_a_fatal_error():
+
+    p = IncrementalParser().feed("test")
+    checkpoint = p.checkpoint()
+
+    p.feed("..@example.com")
+    assert p.final_status() == InvalidDiagnosis("CONSECUTIVEDOTS")
+
+    p.rewind(checkpoint)
+    p.feed("@example.com")
+    assert p.final_status() == ValidDiagnosis()
+
+
+def test_trailing_cr_is_held_back():
+
+    p = IncrementalParser().feed("test@example.com\r")
+
+    assert p.position == p.length - 1
+    assert p.final_status() == InvalidDiagnosis("CR_NO_LF")
+
+    p.feed("\n")
+    assert p.final_status() == InvalidDiagnosis("FWS_CRLF_END")
+
+    p.feed(" ")
+    assert p.final_status() == ParserValidator().is_email("test@example.com\r\n ", True)
+
+
+def test_bytes():
+
+    p = IncrementalParser().feed(b"test@").feed(memoryview(b"example.com"))
+
+    assert p.final_status() == ValidDiagnosis()
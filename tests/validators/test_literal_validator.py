@@ -0,0 +1,65 @@
+import pytest
+
+from pyisemail.diagnosis import RFC5321Diagnosis, RFC5322Diagnosis
+from pyisemail.validators import LiteralValidator, ParserValidator
+
+
+@pytest.mark.parametrize(
+    "address_literal,diagnosis",
+    [
+        ("192.0.2.1", RFC5321Diagnosis("ADDRESSLITERAL")),
+        ("192.0.2.256", RFC5322Diagnosis("DOMAINLITERAL")),
+        ("example", RFC5322Diagnosis("DOMAINLITERAL")),
+        ("IPv6:2001:db8:0:0:0:0:0:1", RFC5321Diagnosis("ADDRESSLITERAL")),
+        ("IPv6:2001:db8::1", RFC5321Diagnosis("ADDRESSLITERAL")),
+        ("IPv6:::ffff:192.0.2.1", RFC5321Diagnosis("ADDRESSLITERAL")),
+        ("IPv6:2001:db8:0:0:0:0:1", RFC5322Diagnosis("IPV6_GRPCOUNT")),
+        ("IPv6:2001::db8::1", RFC5322Diagnosis("IPV6_2X2XCOLON")),
+        ("IPv6:1:2:3:4::5:6:7:8", RFC5322Diagnosis("IPV6_MAXGRPS")),
+        ("IPv6:1:2:3::4:5:6:7", RFC5321Diagnosis("IPV6DEPRECATED")),
+        ("IPv6::2001:db8::1", RFC5322Diagnosis("IPV6_COLONSTRT")),
+        ("IPv6:2001:db8::1:", RFC5322Diagnosis("IPV6_COLONEND")),
+        ("IPv6:2001:db8::g", RFC5322Diagnosis("IPV6_BADCHAR")),
+        ("IPv6:2001:db8::12345", RFC5322Diagnosis("IPV6_BADCHAR")),
+        ("IPv6:", RFC5322Diagnosis("IPV6_GRPCOUNT")),
+        ("IPv6::", RFC5322Diagnosis("IPV6_COLONSTRT")),
+    ],
+)
+def test_diagnosis(address_literal, diagnosis):
+    assert LiteralValidator().is_valid(address_literal, True) == diagnosis
+    assert LiteralValidator(None).is_valid(address_literal, True) == diagnosis
+
+
+def test_verdict():
+    v = LiteralValidator()
+
+    assert v.is_valid("IPv6:2001:db8::1")
+    assert not v.is_valid("IPv6:2001:db8::g")
+
+
+def test_parsed_address():
+    v = LiteralValidator()
+    parsed = ParserValidator().parse("test@[IPv6:2001:db8::1]")
+
+    assert v.is_valid(parsed, True) == RFC5321Diagnosis("ADDRESSLITERAL")
+
+
+def test_cache():
+    v = LiteralValidator(cache_size=2)
+
+    for address_literal in ["192.0.2.1", "192.0.2.1", "192.0.2.2", "192.0.2.3"]:
+        v.diagnoses(address_literal)
+
+    assert (v.cache.hits, v.cache.misses, len(v.cache)) == (1, 3, 2)
+
+
+@pytest.mark.parametrize("engine", ParserValidator.ENGINES)
+@pytest.mark.parametrize(
+    "address,diagnosis",
+    [
+        ("test@[IPv6:]", RFC5322Diagnosis("IPV6_GRPCOUNT")),
+        ("test@[IPv6::]", RFC5322Diagnosis("IPV6_COLONSTRT")),
+    ],
+)
+def test_short_ipv6_literal(engine, address, diagnosis):
+    assert ParserValidator(engine=engine).is_email(address, True) == diagnosis
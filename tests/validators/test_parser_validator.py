@@ -1,7 +1,12 @@
+import timeit
+
 import pytest
 
-from pyisemail.diagnosis import BaseDiagnosis
+from pyisemail.diagnosis import BaseDiagnosis, InvalidDiagnosis, ValidDiagnosis
 from pyisemail.validators import ParserValidator
+from pyisemail.validators.grammar import CONTROL_PICTURES
+from pyisemail.validators.parser_validator import fast_diagnose
+from pyisemail.validators.table_parser import TableParser
 from tests.validators import create_diagnosis, get_scenarios
 
 scenarios = get_scenarios("tests.xml")
@@ -38,3 +43,360 @@ def test_with_diagnosis(test_id, address, diagnosis):
         result,
         expected,
     )
+
+
+@pytest.mark.parametrize("test_id,address,diagnosis", scenarios)
+def test_fast_path_agrees_with_scenarios(test_id, address, diagnosis):
+
+    result = fast_diagnose(address)
+
+    if result is not None:
+        assert result == create_diagnosis(diagnosis), "%s (%s)" % (test_id, address)
+
+
+@pytest.mark.parametrize(
+    "address",
+    [
+        "test@example.com",
+        "first.last+tag@sub.example-domain.co.uk",
+        "%s@example.com" % ("a" * 64),
+        "%s@example.com" % ("a" * 65),
+        "test@%s.com" % ("a" * 63),
+        "test@%s.com" % ("a" * 64),
+        "test@example.%s" % ("a" * 64),
+        "test@%s" % ".".join(["a" * 60] * 4),
+        "test@%s" % ".".join(["a" * 63] * 4),
+        "%s@%s" % ("a" * 65, ".".join(["a" * 64] * 4)),
+        "test@-example.com",
+        "test@example-.com",
+        "test@exa_mple.com",
+        "test.@example.com",
+        "test@example.com\n",
+    ],
+)
+def test_fast_path_agrees_with_full_parser(address):
+
+    result = ParserValidator().is_email(address, True)
+    expected = ParserValidator(fast_path=False).is_email(address, True)
+
+    assert result == expected
+
+
+@pytest.mark.parametrize("test_id,address,diagnosis", scenarios)
+def test_table_engine_without_diagnosis(test_id, address, diagnosis):
+
+    v = ParserValidator(fast_path=False, engine="table")
+
+    result = v.is_email(address)
+    expected = create_diagnosis(diagnosis) < threshold
+
+    assert result == expected, "%s (%s): Got %s, but expected %s." % (
+        test_id,
+        address,
+        result,
+        expected,
+    )
+
+
+@pytest.mark.parametrize("test_id,address,diagnosis", scenarios)
+def test_table_engine_with_diagnosis(test_id, address, diagnosis):
+
+    v = ParserValidator(fast_path=False, engine="table")
+
+    result = v.is_email(address, True)
+    expected = create_diagnosis(diagnosis)
+
+    assert result == expected, "%s (%s): Got %s, but expected %s." % (
+        test_id,
+        address,
+        result,
+        expected,
+    )
+
+
+@pytest.mark.parametrize(
+    "address",
+    [
+        "test@example.com\r\n",
+        "test\r\n \r\n @example.com",
+        "test@example.com\r\n\r\n ",
+        "test@example.com\r",
+        '"te\\\rst"@example.com',
+        '"te\r\n\tst"@example.com',
+        "(com\\\r\nment)test@example.com",
+        "test@[1.2.3.4\\\r\n]",
+        "test@[\x01]",
+        "test@(comment)-example.com",
+        "test@example.com(x)y",
+        "test@[1.2.3.4]x",
+        '"test"x@example.com',
+    ],
+)
+def test_table_engine_agrees_with_state_engine(address):
+
+    result = ParserValidator(fast_path=False, engine="table").is_email(address, True)
+    expected = ParserValidator(fast_path=False).is_email(address, True)
+
+    assert result == expected
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        ParserValidator(engine="unknown")
+
+
+@pytest.mark.parametrize("engine", ParserValidator.ENGINES)
+def test_parsing_allocates_no_diagnoses(engine, monkeypatch):
+
+    v = ParserValidator(fast_path=False, engine=engine)
+    expected = [v.is_email(address, True) for _, address, _ in scenarios]
+
+    def fail(*_):
+        raise AssertionError("Constructed a diagnosis")
+
+    monkeypatch.setattr(BaseDiagnosis, "__init__", fail)
+    monkeypatch.setattr(ValidDiagnosis, "__init__", fail)
+
+    assert [v.is_email(address, True) for _, address, _ in scenarios] == expected
+
+
+@pytest.mark.parametrize(
+    "address",
+    [
+        "test.(comment)test@" + "example." * 20 + "com",
+        '"te\x01st"@' + "example." * 20 + "com",
+    ],
+)
+def test_verdict_stops_at_first_invalid_diagnosis(address):
+
+    parser = TableParser(address, diagnose=False).parse()
+
+    assert parser.position < parser.length
+    assert parser.final_status() > BaseDiagnosis.CATEGORIES["THRESHOLD"]
+    assert TableParser(address).parse().position == parser.length
+
+
+@pytest.mark.parametrize("engine", ParserValidator.ENGINES)
+@pytest.mark.parametrize("test_id,address,diagnosis", scenarios)
+def test_as_code(engine, test_id, address, diagnosis):
+
+    result = ParserValidator(engine=engine).is_email(address, as_code=True)
+    expected = create_diagnosis(diagnosis).code
+
+    assert result == expected
+
+
+@pytest.mark.parametrize("engine", ParserValidator.ENGINES)
+@pytest.mark.parametrize("fast_path", [True, False])
+@pytest.mark.parametrize("test_id,address,diagnosis", scenarios)
+def test_parse_diagnosis(engine, fast_path, test_id, address, diagnosis):
+
+    parsed = ParserValidator(fast_path, engine).parse(address)
+
+    assert parsed.diagnosis == create_diagnosis(diagnosis)
+
+
+@pytest.mark.parametrize("engine", ParserValidator.ENGINES)
+@pytest.mark.parametrize("fast_path", [True, False])
+@pytest.mark.parametrize(
+    "address,local_part,domain,labels",
+    [
+        ("test@example.com", "test", "example.com", ("example", "com")),
+        ('"te@st"@example.com', '"te@st"', "example.com", ("example", "com")),
+        (
+            "test(comment)@(comment)example.com",
+            "test",
+            "example.com",
+            ("example", "com"),
+        ),
+        ("test@[1.2.3.4]", "test", "[1.2.3.4]", ()),
+        ("test@iana", "test", "iana", ("iana",)),
+    ],
+)
+def test_parse_components(engine, fast_path, address, local_part, domain, labels):
+
+    parsed = ParserValidator(fast_path, engine).parse(address)
+
+    assert parsed.local_part == local_part
+    assert parsed.domain == domain
+    assert parsed.labels == labels
+    assert parsed.literal == domain.startswith("[")
+
+
+@pytest.mark.parametrize("test_id,address,diagnosis", scenarios)
+def test_bytes_like_addresses(test_id, address, diagnosis):
+
+    v = ParserValidator()
+    data = address.translate(CONTROL_PICTURES).encode("utf-8")
+    expected = create_diagnosis(diagnosis)
+
+    assert v.is_email(data, True) == expected
+    assert v.is_email(bytearray(data), True) == expected
+    assert v.is_email(memoryview(b"<" + data + b">")[1:-1], True) == expected
+    assert v.is_email(data) == (expected < BaseDiagnosis.CATEGORIES["THRESHOLD"])
+
+
+def test_parse_bytes():
+
+    parsed = ParserValidator().parse(memoryview(b"test@example.com"))
+
+    assert parsed.local_part == "test"
+    assert parsed.domain == "example.com"
+
+    parsed = ParserValidator().parse(b'"te st"@example.com')
+
+    assert parsed.local_part == '"te st"'
+    assert parsed.domain == "example.com"
+
+
+@pytest.mark.parametrize("engine", ParserValidator.ENGINES)
+def test_max_length(engine):
+
+    v = ParserValidator(engine=engine, max_length=254)
+    expected = InvalidDiagnosis("INPUT_TOOLONG")
+
+    assert v.is_email("test@example.com")
+    assert v.is_email("a" * 250 + "@example.com", True) == expected
+    assert not v.is_email("a" * 250 + "@example.com")
+    assert v.parse(b"a" * 250 + b"@example.com").diagnosis == expected
+
+
+@pytest.mark.parametrize("engine", ParserValidator.ENGINES)
+def test_max_depth(engine):
+
+    v = ParserValidator(engine=engine, max_depth=3)
+    expected = InvalidDiagnosis("NESTING_TOODEEP")
+
+    assert v.is_email("test(((comment)))@example.com", True) != expected
+    assert v.is_email("test@(((comment)))example.com", True) != expected
+    assert v.is_email("test((((comment))))@example.com", True) == expected
+    assert v.is_email("test@((((comment))))example.com", True) == expected
+    assert v.is_email("test(((com ment)))@example.com", True) == expected
+    assert v.is_email("test" + "(" * 100000 + "@example.com", True) == expected
+
+
+adversarial = [
+    lambda n: "test" + "(" * n + "@example.com",
+    lambda n: "test" + " " * n + "@example.com",
+    lambda n: "test" + "\r\n " * (n // 3) + "@example.com",
+    lambda n: '"' + "a" * n + '"@example.com',
+    lambda n: "test@" + "(x)" * (n // 3) + "example.com",
+    lambda n: "test@[" + "a" * n + "]",
+]
+
+
+@pytest.mark.parametrize("engine", ParserValidator.ENGINES)
+@pytest.mark.parametrize("build", adversarial)
+def test_adversarial_input_is_linear(engine, build):
+
+    v = ParserValidator(engine=engine)
+
+    def time(n):
+        address = build(n)
+        return min(timeit.repeat(lambda: v.is_email(address, True), number=1, repeat=3))
+
+    # Eight times the input should take about eight times as long; quadratic
+    # behaviour would take sixty-four times as long. Leave plenty of slack.
+    assert time(80000) < 24 * time(10000) + 0.01
+
+
+def test_domain_cache_matches_scenarios():
+
+    v = ParserValidator(engine="table", domain_cache_size=16)
+
+    for diagnose in (True, False):
+        for _, address, diagnosis in scenarios * 2:
+            expected = create_diagnosis(diagnosis)
+            if not diagnose:
+                expected = expected < BaseDiagnosis.CATEGORIES["THRESHOLD"]
+
+            assert v.is_email(address, diagnose) == expected, address
+
+    assert len(v.domain_cache) == 16
+    assert v.domain_cache.hits > 0
+
+
+@pytest.mark.parametrize(
+    "addresses",
+    [
+        ['"test"@example.com', "test(comment)@example.com", '"te\\st"@example.com'],
+        ["test@[1.2.3.4]", '"test"@[1.2.3.4]', '"te\\st"@[1.2.3.4]'],
+        ["test @(comment)example.com", "test@(comment)example.com"],
+        ["test@example.com-", '"test"@example.com-'],
+        ['"test"@example.com\r\n', '"test"@example.com\r\n '],
+        ["@example.com", '"test"@example.com', "test..@example.com"],
+    ],
+)
+def test_domain_cache_agrees_with_table_engine(addresses):
+
+    v = ParserValidator(fast_path=False, engine="table")
+    cached = ParserValidator(fast_path=False, engine="table", domain_cache_size=16)
+
+    for address in addresses * 2:
+        assert cached.is_email(address, True) == v.is_email(address, True)
+        assert cached.parse(address) == v.parse(address)
+
+
+def test_domain_cache_hits():
+
+    v = ParserValidator(engine="table", domain_cache_size=16)
+    v.is_email('"test"@example.com')
+    v.is_email('"other"@example.com')
+
+    assert (v.domain_cache.hits, v.domain_cache.misses) == (1, 1)
+
+
+def test_domain_cache_needs_table_engine():
+    with pytest.raises(ValueError):
+        ParserValidator(domain_cache_size=16)
+
+
+@pytest.mark.parametrize("engine", ParserValidator.ENGINES)
+@pytest.mark.parametrize("test_id,address,diagnosis", scenarios)
+def test_smtputf8_leaves_ascii_alone(engine, test_id, address, diagnosis):
+
+    v = ParserValidator(engine=engine, smtputf8=True)
+
+    if address.translate(CONTROL_PICTURES).isascii():
+        assert v.is_email(address, True) == create_diagnosis(diagnosis)
+
+
+@pytest.mark.parametrize("engine", ParserValidator.ENGINES)
+@pytest.mark.parametrize(
+    "address,code",
+    [
+        ("用户@example.com", 0),
+        ("jörg.müller@example.com", 0),
+        ('"用 户"@example.com', 11),
+        ("%s@example.com" % ("é" * 32), 0),
+        ("%s@example.com" % ("é" * 33), 67),
+        ("test@exämple.com", 137),
+        ('"\\ü"@example.com', 136),
+        ("(ü)test@example.com", 139),
+        ("\udc80@example.com", 137),
+    ],
+)
+def test_smtputf8(engine, address, code):
+
+    v = ParserValidator(engine=engine, smtputf8=True)
+
+    assert v.is_email(address, as_code=True) == code
+    assert v.is_email(address.encode("utf-8", "surrogatepass"), as_code=True) == code
+    assert v.parse(address).diagnosis.code == code
+
+
+def test_smtputf8_parse():
+
+    parsed = ParserValidator(smtputf8=True).parse('"jörg müller"@example.com')
+
+    assert parsed.local_part == '"jörg müller"'
+    assert parsed.domain == "example.com"
+
+
+def test_smtputf8_needs_utf8():
+
+    v = ParserValidator(smtputf8=True)
+
+    assert v.is_email("jörg@example.com".encode("utf-8"))
+    assert not v.is_email("jörg@example.com".encode("latin-1"))
+    assert not ParserValidator().is_email("jörg@example.com")